@@ -4,6 +4,16 @@ from flask_cors import CORS
 from config import config
 from db import init_db, db
 from routes.job_routes import jobs_bp
+from routes.saved_search_routes import saved_searches_bp
+import percolator  # registers the saved-search matcher on job inserts
+from migrations import init_schema_check, schema_version, upgrade, LATEST_VERSION
+from commands import register_commands
+from snapshot import init_snapshot
+from load_control import init_load_control
+from read_routing import init_read_routing, STICKY_HEADER
+from write_queue import init_write_queue
+from compression import init_compression
+from concurrent_reads import init_concurrent_reads
 import os
 
 def create_app(config_name=None):
@@ -17,23 +27,37 @@ def create_app(config_name=None):
     # Initialize extensions - Simple CORS setup for development
     CORS(app, 
          origins=["http://localhost:3000", "http://127.0.0.1:3000"],
-         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-         allow_headers=["Content-Type", "Authorization"],
+         methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+         allow_headers=["Content-Type", "Authorization", STICKY_HEADER],
+         expose_headers=[STICKY_HEADER],
          supports_credentials=False)
     
     # Initialize database
     init_db(app)
+    init_schema_check(app)
+    init_snapshot(app)
+    init_load_control(app)
+    init_read_routing(app)
+    init_write_queue(app)
+    init_compression(app)
+    init_concurrent_reads(app)
     
     # Register blueprints
     app.register_blueprint(jobs_bp)
+    app.register_blueprint(saved_searches_bp)
+    register_commands(app)
     
-    # Health check endpoint
+    # Health check endpoint - answers while the schema is behind, reporting it instead of 503
     @app.route('/api/health', methods=['GET'])
     def health_check():
+        version = schema_version(app)
+        migrated = version >= LATEST_VERSION
         return jsonify({
-            'status': 'healthy',
-            'message': 'Job Listing API is running',
-            'version': '1.0.0'
+            'status': 'healthy' if migrated else 'needs_migration',
+            'message': 'Job Listing API is running' if migrated else 'Database schema is behind - run `flask --app app migrate-db`',
+            'version': '1.0.0',
+            'schema_version': version,
+            'expected_schema_version': LATEST_VERSION
         }), 200
     
     # Error handlers
@@ -56,9 +80,9 @@ def create_app(config_name=None):
 if __name__ == '__main__':
     app = create_app('development')
     
-    # Create tables if they don't exist
+    # Apply pending migrations - deployed workers expect `flask --app app migrate-db` to have run
     with app.app_context():
-        db.create_all()
+        upgrade()
         print("Database initialized!")
     
     print("Starting Flask development server...")
@@ -0,0 +1,156 @@
+# backend/bulk_ops.py
+from sqlalchemy import select, update, delete
+from db import db
+from models.job import Job
+from date_buckets import apply_bucket_deltas, bucket_key
+from change_log import record_changes
+from locations import replace_job_locations, remove_job_locations
+from percolator import remove_job_notifications
+from query_builder import build_filter_conditions
+from datetime import datetime
+
+BULK_FIELDS = ('company', 'location', 'job_type', 'tags', 'description', 'url', 'posting_date')
+
+class BulkOperationError(Exception):
+    """A batch failed; earlier batches were already committed"""
+    def __init__(self, completed, cause):
+        super().__init__(str(cause))
+        self.completed = completed
+        self.cause = cause
+
+# REQUEST PARSING
+def parse_selection(data):
+    """Return (ids, filters) from a bulk request body; exactly one must be given"""
+    ids = data.get('ids')
+    filters = data.get('filters')
+
+    if ids is not None and filters is not None:
+        raise ValueError('Provide either ids or filters, not both')
+    if ids is not None:
+        if not isinstance(ids, list) or not ids or not all(isinstance(job_id, int) for job_id in ids):
+            raise ValueError('ids must be a non-empty list of integers')
+        return sorted(set(ids)), None
+    if isinstance(filters, dict):
+        # Same parameters as GET /api/jobs; lists are accepted for tags
+        filters = {key: ','.join(value) if isinstance(value, list) else value for key, value in filters.items()}
+        if build_filter_conditions(filters):
+            return None, filters
+    raise ValueError('Provide ids or at least one filter (job_type, location, company, tags, search, date_filter)')
+
+def parse_changes(changes):
+    """Validate bulk PATCH changes and return column values"""
+    if not isinstance(changes, dict) or not changes:
+        raise ValueError('No changes provided')
+
+    unknown = set(changes) - set(BULK_FIELDS)
+    if unknown:
+        raise ValueError(f'Fields cannot be bulk updated: {", ".join(sorted(unknown))}')
+
+    values = dict(changes)
+    if 'job_type' in values and values['job_type'] not in Job.VALID_JOB_TYPES:
+        raise ValueError(f'Job type must be one of: {", ".join(Job.VALID_JOB_TYPES)}')
+    for field in ('company', 'location'):
+        if field in values and (not isinstance(values[field], str) or not values[field].strip()):
+            raise ValueError(f'{field.capitalize()} is required')
+    if isinstance(values.get('tags'), list):
+        if not all(isinstance(tag, str) for tag in values['tags']):
+            raise ValueError('tags must be a list of strings or a comma-separated string')
+        values['tags'] = ','.join(values['tags'])
+    for field in ('tags', 'description', 'url'):
+        if field in values and values[field] is not None and not isinstance(values[field], str):
+            raise ValueError(f'{field} must be a string')
+    if 'posting_date' in values:
+        try:
+            values['posting_date'] = datetime.fromisoformat(str(values['posting_date']).replace('Z', '+00:00'))
+        except ValueError:
+            raise ValueError('posting_date must be an ISO date')
+    return values
+
+# BATCHING
+def id_batches(ids, filters, batch_size):
+    """Yield batches of matching job ids, walking the primary key so each batch is a short query"""
+    if ids is not None:
+        for start in range(0, len(ids), batch_size):
+            yield ids[start:start + batch_size]
+        return
+
+    conditions = build_filter_conditions(filters)
+    last_id = 0
+    while True:
+        batch = db.session.scalars(
+            select(Job.id).where(*conditions, Job.id > last_id).order_by(Job.id).limit(batch_size)
+        ).all()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
+
+def bucket_rows(job_ids):
+    return db.session.execute(
+        select(Job.id, Job.posting_date, Job.job_type, Job.company).where(Job.id.in_(job_ids))
+    ).all()
+
+# BULK OPERATIONS - ONE SET-BASED STATEMENT AND COMMIT PER BATCH
+def bulk_update(ids, filters, values, batch_size):
+    """Apply values to every selected job; returns the number of updated jobs"""
+    updated = 0
+    try:
+        for batch in id_batches(ids, filters, batch_size):
+            rows = bucket_rows(batch)
+            if not rows:
+                continue
+
+            deltas = {}
+            for job_id, posting_date, job_type, company in rows:
+                old_key = bucket_key(posting_date, job_type, company)
+                new_key = bucket_key(
+                    values.get('posting_date', posting_date), values.get('job_type', job_type), values.get('company', company)
+                )
+                if old_key != new_key:
+                    deltas[old_key] = deltas.get(old_key, 0) - 1
+                    deltas[new_key] = deltas.get(new_key, 0) + 1
+
+            job_ids = [row[0] for row in rows]
+            db.session.execute(
+                update(Job).where(Job.id.in_(job_ids)).values(**values, updated_at=datetime.utcnow()),
+                execution_options={'synchronize_session': False}
+            )
+            if 'location' in values or 'tags' in values:
+                replace_job_locations(db.session.connection(), db.session.execute(
+                    select(Job.id, Job.location, Job.tags).where(Job.id.in_(job_ids))
+                ).all())
+            apply_bucket_deltas(db.session, deltas)
+            record_changes(db.session, job_ids, 'update')
+            db.session.commit()
+            updated += len(job_ids)
+    except Exception as e:
+        db.session.rollback()
+        raise BulkOperationError(updated, e)
+    return updated
+
+def bulk_delete(ids, filters, batch_size):
+    """Delete every selected job; returns the number of deleted jobs"""
+    deleted = 0
+    try:
+        for batch in id_batches(ids, filters, batch_size):
+            rows = bucket_rows(batch)
+            if not rows:
+                continue
+
+            deltas = {}
+            for job_id, posting_date, job_type, company in rows:
+                key = bucket_key(posting_date, job_type, company)
+                deltas[key] = deltas.get(key, 0) - 1
+
+            job_ids = [row[0] for row in rows]
+            db.session.execute(delete(Job).where(Job.id.in_(job_ids)), execution_options={'synchronize_session': False})
+            remove_job_locations(db.session.connection(), job_ids)
+            remove_job_notifications(db.session.connection(), job_ids)
+            apply_bucket_deltas(db.session, deltas)
+            record_changes(db.session, job_ids, 'delete')
+            db.session.commit()
+            deleted += len(job_ids)
+    except Exception as e:
+        db.session.rollback()
+        raise BulkOperationError(deleted, e)
+    return deleted
@@ -0,0 +1,130 @@
+# backend/change_log.py
+import json
+from sqlalchemy import event, select, func, text, delete
+from db import db
+from models.job import Job
+from models.job_change import JobChange
+from datetime import datetime, timedelta
+
+EXPIRED_MESSAGE = 'Cursor is older than the retained change log - reload the jobs and restart from since=latest'
+
+# Advisory lock key held from a PostgreSQL transaction's first log entry until it ends
+CHANGE_LOG_LOCK_KEY = 0x6a6f6273
+
+# RECORD CHANGES
+def record_changes(session, job_ids, op):
+    """Append change log entries for jobs written with set-based statements"""
+    if job_ids:
+        now = datetime.utcnow()
+        if session.connection().dialect.name == 'postgresql':
+            # Sequence values are handed out at insert time, not at commit, so a reader could see
+            # seq 11 committed before seq 10 and move its cursor past 10 for good. Writers that
+            # log changes take turns instead, making seq order commit order as on SQLite
+            session.connection().execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': CHANGE_LOG_LOCK_KEY})
+        session.connection().execute(
+            JobChange.__table__.insert(),
+            [{'job_id': job_id, 'op': op, 'changed_at': now} for job_id in job_ids]
+        )
+
+# LOG EVERY ORM WRITE TO jobs IN THE SAME TRANSACTION
+@event.listens_for(db.session, 'after_flush')
+def track_job_changes(session, flush_context):
+    for op, objects in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        job_ids = [
+            obj.id for obj in objects
+            if isinstance(obj, Job) and (op != 'update' or session.is_modified(obj))
+        ]
+        record_changes(session, job_ids, op)
+
+class CursorExpired(Exception):
+    """Entries after the cursor were pruned from the log; the reader has to reload in full"""
+
+# READ CHANGES
+def current_seq():
+    return db.session.scalar(select(func.coalesce(func.max(JobChange.seq), 0)))
+
+def pruned_through(connection):
+    """Highest seq removed by prune_changes (one below the oldest entry kept), None for an empty log"""
+    oldest = connection.scalar(select(func.min(JobChange.seq)))
+    return oldest - 1 if oldest is not None else None
+
+def cursor_expired(connection, cursor):
+    horizon = pruned_through(connection)
+    return horizon is not None and cursor < horizon
+
+def changes_since(cursor, limit):
+    """Return (changes, next cursor, has_more) for log entries after cursor.
+
+    Entries for the same job within the batch collapse to the latest one, and
+    inserts/updates carry the job's current state. Seq order is commit order:
+    SQLite serializes writers, and on PostgreSQL record_changes holds an
+    advisory lock until the writing transaction ends. Raises CursorExpired
+    if entries after cursor have been pruned.
+    """
+    if cursor_expired(db.session, cursor):
+        raise CursorExpired()
+    entries = db.session.scalars(
+        select(JobChange).where(JobChange.seq > cursor).order_by(JobChange.seq).limit(limit + 1)
+    ).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return [], cursor, False
+
+    latest = {}
+    for entry in entries:
+        latest[entry.job_id] = entry
+
+    live_ids = [entry.job_id for entry in latest.values() if entry.op != 'delete']
+    jobs = {job.id: job for job in Job.query.filter(Job.id.in_(live_ids)).all()} if live_ids else {}
+
+    changes = []
+    for entry in sorted(latest.values(), key=lambda entry: entry.seq):
+        job = jobs.get(entry.job_id)
+        # A job gone since this entry was written is reported as a tombstone
+        op = entry.op if job is not None or entry.op == 'delete' else 'delete'
+        changes.append({
+            'seq': entry.seq,
+            'op': op,
+            'job_id': entry.job_id,
+            'changed_at': entry.changed_at.isoformat(),
+            'job': job.to_dict() if op != 'delete' else None
+        })
+
+    return changes, entries[-1].seq, has_more
+
+# PRUNE
+def prune_changes(max_age_days, batch_size=5000):
+    """Delete log entries older than max_age_days, oldest first; returns the number deleted.
+
+    Only a prefix of the log is removed, so everything at or below
+    pruned_through is gone and readers behind it can tell. The newest entry is
+    always kept: max(seq) is the position of replicas, snapshots and cursors.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+    latest = current_seq()
+    stop = db.session.scalar(select(func.min(JobChange.seq)).where(JobChange.changed_at >= cutoff))
+    stop = min(stop or latest, latest)
+    deleted = 0
+
+    while True:
+        seqs = db.session.scalars(
+            select(JobChange.seq).where(JobChange.seq < stop).order_by(JobChange.seq).limit(batch_size)
+        ).all()
+        if not seqs:
+            break
+        db.session.execute(
+            delete(JobChange).where(JobChange.seq <= seqs[-1]), execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+        deleted += len(seqs)
+
+    return deleted
+
+def format_event(change):
+    """Server-Sent Events frame for one change"""
+    return f"id: {change['seq']}\nevent: change\ndata: {json.dumps(change)}\n\n"
+
+def format_expired():
+    """Server-Sent Events frame telling the client its cursor was pruned"""
+    return f"event: expired\ndata: {json.dumps({'error': EXPIRED_MESSAGE})}\n\n"
@@ -0,0 +1,88 @@
+# backend/commands.py
+import click
+from flask import current_app
+from date_buckets import rebuild_buckets
+from retention import archive_old_jobs
+from change_log import prune_changes
+from locations import rebuild_job_locations
+from migrations import upgrade, migration_status
+from db import db
+
+def register_commands(app):
+    """Register maintenance commands on the flask CLI"""
+    
+    @app.cli.command('migrate-db')
+    @click.option('--to', 'target', type=int, help='Stop at this migration version (default: latest)')
+    def migrate_db_command(target):
+        """Apply pending schema migrations"""
+        version = upgrade(target, echo=click.echo)
+        click.echo(f'Database schema at version {version}!')
+    
+    @app.cli.command('migration-status')
+    def migration_status_command():
+        """List schema migrations and when each was applied"""
+        for version, name, applied_at in migration_status():
+            click.echo(f'{version:>3}  {applied_at.isoformat() if applied_at else "pending":<26}  {name}')
+    
+    @app.cli.command('rebuild-date-buckets')
+    def rebuild_date_buckets_command():
+        """Recompute the posting-date rollup from the jobs table"""
+        rebuild_buckets()
+        click.echo('Date buckets rebuilt!')
+    
+    @app.cli.command('rebuild-locations')
+    def rebuild_locations_command():
+        """Recompute canonical job locations from the jobs table"""
+        rebuild_job_locations()
+        click.echo('Job locations rebuilt!')
+    
+    @app.cli.command('archive-jobs')
+    @click.option('--max-age-days', type=int, help='Archive postings older than this (default RETENTION_MAX_AGE_DAYS)')
+    @click.option('--batch-size', type=int, help='Jobs moved per transaction (default RETENTION_BATCH_SIZE)')
+    @click.option('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+    def archive_jobs_command(max_age_days, batch_size, pause):
+        """Move old postings from jobs into archived_jobs"""
+        archived = archive_old_jobs(
+            max_age_days or current_app.config['RETENTION_MAX_AGE_DAYS'],
+            batch_size or current_app.config['RETENTION_BATCH_SIZE'],
+            pause
+        )
+        click.echo(f'Archived {archived} jobs!')
+    
+    @app.cli.command('prune-changes')
+    @click.option('--max-age-days', type=int, help='Delete change log entries older than this (default CHANGE_LOG_MAX_AGE_DAYS)')
+    @click.option('--batch-size', type=int, help='Entries deleted per transaction (default CHANGE_LOG_PRUNE_BATCH_SIZE)')
+    def prune_changes_command(max_age_days, batch_size):
+        """Delete old entries from the job_changes log"""
+        pruned = prune_changes(
+            max_age_days if max_age_days is not None else current_app.config['CHANGE_LOG_MAX_AGE_DAYS'],
+            batch_size or current_app.config['CHANGE_LOG_PRUNE_BATCH_SIZE']
+        )
+        click.echo(f'Pruned {pruned} change log entries!')
+    
+    @app.cli.command('build-similar-index')
+    def build_similar_index_command():
+        """Rebuild the memory-mapped vector index behind /api/jobs/<id>/similar"""
+        from similar_index import np, build_index, index_directory
+        if np is None:
+            raise click.ClickException('numpy is required for the similar jobs index')
+        
+        count = build_index(index_directory(current_app))
+        click.echo(f'Similar jobs index built for {count} jobs!')
+    
+    @app.cli.command('check-snapshot')
+    def check_snapshot_command():
+        """Compare the in-memory snapshot read engine with SQL results"""
+        from snapshot import JobSnapshot, np, parity_cases, check_parity
+        if np is None:
+            raise click.ClickException('numpy is required for the snapshot read engine')
+        
+        snapshot = JobSnapshot()
+        snapshot.load(db.session)
+        cases = parity_cases(snapshot)
+        mismatches = check_parity(snapshot, db.session, cases)
+        for mismatch in mismatches:
+            click.echo(f'MISMATCH {mismatch}')
+        if mismatches:
+            raise click.ClickException(f'{len(mismatches)} of {len(cases)} cases differ')
+        click.echo(f'Snapshot matches SQL for {len(cases)} cases!')
@@ -0,0 +1,73 @@
+# backend/compression.py
+import zlib
+import brotli
+from flask import request
+
+# Content types worth compressing - error bodies and small JSON stay under the threshold anyway
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/event-stream')
+
+def choose_encoding(accept_encodings):
+    """Best encoding the client accepts by q-value, preferring br over gzip on ties, or None"""
+    best, best_quality = None, 0
+    for encoding in ('br', 'gzip'):
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def new_compressor(encoding, config):
+    """(compress, flush, finish) functions of a fresh compression stream"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(config['COMPRESS_GZIP_LEVEL'], zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+def compress_stream(chunks, encoding, config):
+    """Compress a streamed body chunk by chunk, flushing after each so events are not held back"""
+    compress, flush, finish = new_compressor(encoding, config)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield compress(chunk) + flush()
+        yield finish()
+    finally:
+        # Replacing response.response means werkzeug no longer closes the original iterable
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def init_compression(app):
+    """Compress JSON and event-stream responses with the encoding negotiated from Accept-Encoding"""
+    if not app.config['COMPRESS_RESPONSES']:
+        return
+    config = app.config
+
+    @app.after_request
+    def compress_response(response):
+        if (response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, config)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < config['COMPRESS_MIN_BYTES']:
+                return response
+            compress, _, finish = new_compressor(encoding, config)
+            compressed = compress(body) + finish()
+            if len(compressed) >= len(body):
+                return response
+            response.set_data(compressed)
+
+        response.headers['Content-Encoding'] = encoding
+        return response
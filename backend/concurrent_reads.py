@@ -0,0 +1,38 @@
+# backend/concurrent_reads.py
+from concurrent.futures import Future, ThreadPoolExecutor
+from flask import current_app, g
+from db import db
+
+def read_engine():
+    """Engine the current request reads from - its replica when read routing chose one"""
+    read_bind = g.get('read_bind')
+    return db.engines[read_bind] if read_bind else db.engine
+
+def fetch_rows(engine, statement):
+    with engine.connect() as connection:
+        return connection.execute(statement).all()
+
+def start_reads(statements):
+    """Start each Core SELECT on its own pooled connection; returns futures of their rows in order.
+
+    The request thread can run its ORM query meanwhile, so a page query and its
+    COUNT, or the facet aggregations, overlap instead of running back to back.
+    Each statement sees its own snapshot of the data, like separate requests.
+    """
+    executor = current_app.extensions.get('read_executor')
+    engine = read_engine()
+    if executor is not None:
+        return [executor.submit(fetch_rows, engine, statement) for statement in statements]
+
+    futures = []
+    for statement in statements:
+        future = Future()
+        future.set_result(fetch_rows(engine, statement))
+        futures.append(future)
+    return futures
+
+def init_concurrent_reads(app):
+    """Thread pool shared by all requests for concurrent read queries (READ_QUERY_THREADS, 1 disables it)"""
+    threads = app.config['READ_QUERY_THREADS']
+    if threads > 1:
+        app.extensions['read_executor'] = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='read-query')
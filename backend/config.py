@@ -9,6 +9,74 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///jobs.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = True  # Set to False in production
+    
+    # Read replicas (comma-separated URLs) serve GET requests; writes always go to the primary.
+    # A replica trailing the primary's change log by more than REPLICA_MAX_LAG_SECONDS is skipped,
+    # and clients read from the primary for REPLICA_STICKY_SECONDS after a write until replicas catch up
+    REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    SQLALCHEMY_BINDS = {f'replica_{index}': url for index, url in enumerate(REPLICA_URLS)}
+    REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', 5))
+    REPLICA_CHECK_SECONDS = float(os.environ.get('REPLICA_CHECK_SECONDS', 1))
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 60))
+
+    # Threads per process running a listing's COUNT and facet queries concurrently (1 runs them in the request thread)
+    READ_QUERY_THREADS = int(os.environ.get('READ_QUERY_THREADS', 8))
+    
+    # Read engine for list/filter-options/search: 'sql' or 'snapshot' (in-memory columnar, needs numpy)
+    READ_ENGINE = os.environ.get('READ_ENGINE', 'sql')
+    SNAPSHOT_REFRESH_SECONDS = float(os.environ.get('SNAPSHOT_REFRESH_SECONDS', 2))
+    
+    # Similar jobs - hashed TF-IDF vectors memory-mapped from SIMILAR_INDEX_DIR (default instance/similar_index).
+    # Candidates come from posting lists of the query's rarer features (at most SIMILAR_MAX_POSTINGS entries),
+    # the best SIMILAR_CANDIDATES of them are scored exactly
+    SIMILAR_INDEX_DIR = os.environ.get('SIMILAR_INDEX_DIR')
+    SIMILAR_REFRESH_SECONDS = float(os.environ.get('SIMILAR_REFRESH_SECONDS', 2))
+    SIMILAR_MAX_POSTINGS = int(os.environ.get('SIMILAR_MAX_POSTINGS', 50000))
+    SIMILAR_CANDIDATES = int(os.environ.get('SIMILAR_CANDIDATES', 2000))
+    # Jobs changed since the build that are kept in memory; beyond this the endpoint asks for a rebuild
+    SIMILAR_MAX_DELTA = int(os.environ.get('SIMILAR_MAX_DELTA', 10000))
+    
+    # Admission control for expensive reads - concurrent executions per endpoint,
+    # how long a request may queue for a slot and the Retry-After sent with 429
+    ENDPOINT_CONCURRENCY_LIMITS = {
+        'stats': int(os.environ.get('STATS_CONCURRENCY', 2)),
+        'filter_options': int(os.environ.get('FILTER_OPTIONS_CONCURRENCY', 4)),
+        'search': int(os.environ.get('SEARCH_CONCURRENCY', 8))
+    }
+    ADMISSION_TIMEOUT_SECONDS = float(os.environ.get('ADMISSION_TIMEOUT_SECONDS', 2))
+    RETRY_AFTER_SECONDS = int(os.environ.get('RETRY_AFTER_SECONDS', 1))
+    
+    # Change feed live stream
+    CHANGE_STREAM_POLL_SECONDS = float(os.environ.get('CHANGE_STREAM_POLL_SECONDS', 1))
+    CHANGE_STREAM_MAX_SECONDS = float(os.environ.get('CHANGE_STREAM_MAX_SECONDS', 300))
+    
+    # Change log retention - entries older than this many days are removed by prune-changes
+    CHANGE_LOG_MAX_AGE_DAYS = int(os.environ.get('CHANGE_LOG_MAX_AGE_DAYS', 30))
+    CHANGE_LOG_PRUNE_BATCH_SIZE = int(os.environ.get('CHANGE_LOG_PRUNE_BATCH_SIZE', 5000))
+    
+    # Write-behind mode for POST /api/jobs - validated jobs are acknowledged with 202 and
+    # group-committed by a writer thread every WRITE_FLUSH_MS (up to WRITE_BATCH_SIZE per commit)
+    WRITE_BEHIND = os.environ.get('WRITE_BEHIND', 'false').lower() == 'true'
+    WRITE_FLUSH_MS = float(os.environ.get('WRITE_FLUSH_MS', 5))
+    WRITE_BATCH_SIZE = int(os.environ.get('WRITE_BATCH_SIZE', 200))
+    WRITE_QUEUE_MAX = int(os.environ.get('WRITE_QUEUE_MAX', 10000))
+    WRITE_STATUS_MAX = int(os.environ.get('WRITE_STATUS_MAX', 50000))
+    WRITE_STATUS_TTL_SECONDS = int(os.environ.get('WRITE_STATUS_TTL_SECONDS', 86400))
+    WRITE_SHUTDOWN_TIMEOUT_SECONDS = float(os.environ.get('WRITE_SHUTDOWN_TIMEOUT_SECONDS', 30))
+    
+    # Response compression - brotli or gzip, whichever the client prefers,
+    # for JSON bodies of at least COMPRESS_MIN_BYTES; event streams are compressed chunk by chunk
+    COMPRESS_RESPONSES = os.environ.get('COMPRESS_RESPONSES', 'true').lower() == 'true'
+    COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 4))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+    
+    # Rows per set-based statement for bulk PATCH/DELETE
+    BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 500))
+    
+    # Retention - postings older than this many days are moved to archived_jobs
+    RETENTION_MAX_AGE_DAYS = int(os.environ.get('RETENTION_MAX_AGE_DAYS', 180))
+    RETENTION_BATCH_SIZE = int(os.environ.get('RETENTION_BATCH_SIZE', 500))
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -17,8 +85,14 @@ class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_ECHO = False
 
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_ECHO = False
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'  # tests point this at a temporary file
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
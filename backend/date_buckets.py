@@ -0,0 +1,130 @@
+# backend/date_buckets.py
+from sqlalchemy import event, func, select
+from sqlalchemy.orm.attributes import get_history
+from db import db, dialect_insert
+from models.job import Job
+from models.job_daily_count import JobDailyCount
+from query_builder import parse_date_filter
+from datetime import datetime, timedelta
+
+PREDEFINED_DATE_FILTERS = ('today', 'last_7_days', 'last_month')
+BUCKET_FIELDS = ('posting_date', 'job_type', 'company')
+
+# BUCKET KEY HELPERS
+def bucket_key(posting_date, job_type, company):
+    return ((posting_date or datetime.utcnow()).date(), job_type or 'Full-time', company or '')
+
+def previous_value(job, field):
+    """Value of a field as last flushed to the database"""
+    history = get_history(job, field)
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(job, field)
+
+def previous_bucket_key(job):
+    return bucket_key(*[previous_value(job, field) for field in BUCKET_FIELDS])
+
+def current_bucket_key(job):
+    return bucket_key(job.posting_date, job.job_type, job.company)
+
+# APPLY COUNT CHANGES WITH ONE UPSERT (SAFE UNDER CONCURRENT WRITERS)
+def apply_bucket_deltas(session, deltas):
+    """Add each delta to its (day, job_type, company) bucket, creating or removing buckets as needed"""
+    table = JobDailyCount.__table__
+    connection = session.connection()
+    rows = [
+        {'day': day, 'job_type': job_type, 'company': company, 'count': delta}
+        for (day, job_type, company), delta in deltas.items() if delta
+    ]
+    if not rows:
+        return
+
+    # UPDATE-then-INSERT lets two PostgreSQL writers both miss a new bucket and one fail on the
+    # unique constraint; the upsert adds to whichever row wins, in a single statement
+    insert = dialect_insert(table, connection)
+    connection.execute(insert.on_conflict_do_update(
+        index_elements=['day', 'job_type', 'company'],
+        set_={'count': table.c['count'] + insert.excluded['count']}
+    ), rows)
+
+    if any(row['count'] < 0 for row in rows):
+        connection.execute(table.delete().where(table.c['count'] <= 0))
+
+# KEEP BUCKETS IN SYNC WITH EVERY ORM WRITE TO jobs
+@event.listens_for(db.session, 'before_flush')
+def track_bucket_changes(session, flush_context, instances):
+    deltas = {}
+
+    def add(key, delta):
+        deltas[key] = deltas.get(key, 0) + delta
+
+    for obj in session.new:
+        if isinstance(obj, Job):
+            add(current_bucket_key(obj), 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Job):
+            add(previous_bucket_key(obj), -1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Job) and session.is_modified(obj):
+            old_key, new_key = previous_bucket_key(obj), current_bucket_key(obj)
+            if old_key != new_key:
+                add(old_key, -1)
+                add(new_key, 1)
+
+    if deltas:
+        apply_bucket_deltas(session, deltas)
+
+def rebuild_buckets():
+    """Recompute every bucket from the jobs table"""
+    table = JobDailyCount.__table__
+    day = func.date(Job.posting_date)
+
+    db.session.execute(table.delete())
+    db.session.execute(table.insert().from_select(
+        ['day', 'job_type', 'company', 'count'],
+        select(day, Job.job_type, Job.company, func.count(Job.id)).group_by(day, Job.job_type, Job.company)
+    ))
+    db.session.commit()
+
+# READ HELPERS
+def bucket_conditions(args):
+    conditions = []
+    if args.get('job_type'):
+        conditions.append(JobDailyCount.job_type == args.get('job_type'))
+    if args.get('company'):
+        conditions.append(JobDailyCount.company.ilike(f"%{args.get('company')}%"))
+    return conditions
+
+def daily_totals(date_from, date_to, args):
+    """Return {day: count} for days in [date_from, date_to]"""
+    rows = db.session.execute(
+        select(JobDailyCount.day, func.sum(JobDailyCount.count))
+        .where(JobDailyCount.day >= date_from, JobDailyCount.day <= date_to, *bucket_conditions(args))
+        .group_by(JobDailyCount.day)
+    ).all()
+    return {row[0]: row[1] for row in rows}
+
+def date_histogram(days, args):
+    """Jobs per posting day for the last `days` days, zero-filled"""
+    today = datetime.now().date()
+    date_from = today - timedelta(days=days - 1)
+    totals = daily_totals(date_from, today, args)
+    return [
+        {'date': (date_from + timedelta(days=offset)).isoformat(), 'count': totals.get(date_from + timedelta(days=offset), 0)}
+        for offset in range(days)
+    ]
+
+def date_filter_counts(args):
+    """Job counts for each predefined date_filter, from one bucket scan"""
+    ranges = {name: parse_date_filter(name) for name in PREDEFINED_DATE_FILTERS}
+    date_from = min(start for start, end in ranges.values())
+    date_to = max(end for start, end in ranges.values())
+    totals = daily_totals(date_from, date_to, args)
+    return {
+        name: sum(count for day, count in totals.items() if start <= day <= end)
+        for name, (start, end) in ranges.items()
+    }
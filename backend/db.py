@@ -1,21 +1,35 @@
 # backend/db.py
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy.dialects import postgresql, sqlite
 from datetime import datetime
 
-db = SQLAlchemy()
+class RoutingSession(Session):
+    """Send SELECTs to the read replica picked for the request (g.read_bind), everything else to the primary"""
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and getattr(clause, 'is_select', False) and has_app_context():
+            read_bind = g.get('read_bind')
+            if read_bind:
+                return self._db.engines[read_bind]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+def dialect_insert(table, bind):
+    """INSERT construct of the bind's dialect, for ON CONFLICT clauses (SQLite and PostgreSQL)"""
+    if bind.dialect.name == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
 
 def init_db(app):
-    """Initialize database with Flask app"""
+    """Initialize database with Flask app - the schema itself is managed by `flask --app app migrate-db`"""
     db.init_app(app)
-    
-    with app.app_context():
-        # Create all tables
-        db.create_all()
-        print("Database tables created successfully!")
 
 def reset_db(app):
     """Reset database - USE WITH CAUTION"""
+    from migrations import upgrade
     with app.app_context():
         db.drop_all()
-        db.create_all()
+        upgrade()
         print("Database reset completed!")
\ No newline at end of file
@@ -0,0 +1,116 @@
+# backend/load_control.py
+import itertools
+import threading
+from functools import wraps
+from flask import current_app, request, jsonify, g
+from sqlalchemy import event
+from db import db
+
+# DATA VERSION - BUMPED AFTER EVERY COMMIT THAT WROTE SOMETHING
+_versions = itertools.count(1)
+_data_version = 0
+
+@event.listens_for(db.session, 'after_flush')
+def mark_session_written(session, flush_context):
+    session.info['wrote'] = True
+
+@event.listens_for(db.session, 'do_orm_execute')
+def mark_statement_written(orm_execute_state):
+    # Set-based INSERT/UPDATE/DELETE statements write without flushing
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['wrote'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def bump_data_version(session):
+    global _data_version
+    if session.info.pop('wrote', False):
+        _data_version = next(_versions)
+
+def data_version():
+    """Process-local write generation; a computation is only shared within one generation"""
+    return _data_version
+
+class Overloaded(Exception):
+    """Raised when no execution slot frees up within the admission timeout"""
+
+class SingleFlight:
+    """Run concurrent calls with the same key once and hand every caller the same result"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+
+        if not leader:
+            call['done'].wait()
+        else:
+            try:
+                call['result'] = fn()
+            except Exception as e:
+                call['error'] = e
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call['done'].set()
+
+        if call['error'] is not None:
+            raise call['error']
+        return call['result']
+
+class AdmissionGate:
+    """Bounded number of concurrent executions per endpoint, with a short queue wait"""
+    def __init__(self, limit, timeout):
+        self.slots = threading.BoundedSemaphore(limit)
+        self.timeout = timeout
+
+    def run(self, fn):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise Overloaded()
+        try:
+            return fn()
+        finally:
+            self.slots.release()
+
+def init_load_control(app):
+    """Create the per-endpoint gates and the shared single-flight table"""
+    app.extensions['load_control'] = {
+        'flights': SingleFlight(),
+        'gates': {
+            name: AdmissionGate(limit, app.config['ADMISSION_TIMEOUT_SECONDS'])
+            for name, limit in app.config['ENDPOINT_CONCURRENCY_LIMITS'].items()
+        }
+    }
+
+def normalized_params():
+    return tuple(sorted((key, value) for key, value in request.args.items(multi=True) if value != ''))
+
+def coalesced(name):
+    """Share in-flight results of identical requests and shed load beyond the endpoint's limit"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            control = current_app.extensions['load_control']
+            gate = control['gates'].get(name)
+            # Requests routed to different databases may see different data
+            key = (name, request.path, normalized_params(), data_version(), g.get('read_bind'))
+
+            def compute():
+                response = current_app.make_response(current_app.ensure_sync(view)(*args, **kwargs))
+                return response.get_data(), response.status_code, response.mimetype
+
+            try:
+                body, status, mimetype = control['flights'].do(
+                    key, (lambda: gate.run(compute)) if gate else compute
+                )
+            except Overloaded:
+                retry_after = current_app.config['RETRY_AFTER_SECONDS']
+                return jsonify({'error': 'Server is busy, please retry shortly'}), 429, {'Retry-After': str(retry_after)}
+
+            return current_app.response_class(body, status=status, mimetype=mimetype)
+        return wrapper
+    return decorator
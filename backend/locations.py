@@ -0,0 +1,123 @@
+# backend/locations.py
+import re
+from sqlalchemy import event, select, delete
+from sqlalchemy.orm.attributes import get_history
+from db import db, dialect_insert
+from models.job import Job
+from models.location import Location, job_locations
+
+# Scraper placeholders that are not locations
+PLACEHOLDERS = {'', 'location not specified', 'location not found'}
+
+# ALIAS (CASEFOLDED) -> CANONICAL NAME
+LOCATION_ALIASES = {
+    'nyc': 'New York NY',
+    'new york': 'New York NY',
+    'new york city': 'New York NY',
+    'sf': 'San Francisco CA',
+    'san francisco': 'San Francisco CA',
+    'la': 'Los Angeles CA',
+    'los angeles': 'Los Angeles CA',
+    'remote': 'Remote',
+    'fully remote': 'Remote',
+    'work from home': 'Remote',
+    'wfh': 'Remote',
+    'bengaluru': 'Bangalore',
+    'zurich': 'Zürich',
+    'gurugram': 'Gurgaon'
+}
+
+LEADING_SYMBOLS = re.compile(r'^[^\w(]+')
+WHITESPACE = re.compile(r'\s+')
+
+# CANONICALIZATION
+def canonical_location(name):
+    """Canonical form of a single location ('🏠 Remote' -> 'Remote', 'NYC' -> 'New York NY')"""
+    name = WHITESPACE.sub(' ', LEADING_SYMBOLS.sub('', name or '')).strip()
+    return LOCATION_ALIASES.get(name.casefold(), name)
+
+def split_locations(location, tags=None):
+    """Canonical locations of a job from its joined location string.
+
+    The scraper joins up to three card chips, which are sometimes the job's
+    tags ('London, Actuary (Fellow), Life'), so chips equal to a tag are dropped.
+    """
+    tag_names = {tag.strip().casefold() for tag in (tags or '').split(',')}
+    names = []
+    for part in (location or '').split(','):
+        if part.strip().casefold() in tag_names or part.strip().casefold() in PLACEHOLDERS:
+            continue
+        name = canonical_location(part)
+        if name.casefold() not in PLACEHOLDERS and name not in names:
+            names.append(name)
+    return names
+
+# ASSOCIATION MAINTENANCE
+def location_ids(connection, names):
+    """Return {name: id}, creating missing locations"""
+    if not names:
+        return {}
+    table = Location.__table__
+    ids = dict(connection.execute(select(table.c.name, table.c.id).where(table.c.name.in_(names))).all())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        # Another writer may add the same new name concurrently - keep its row rather than fail
+        connection.execute(
+            dialect_insert(table, connection).on_conflict_do_nothing(index_elements=['name']),
+            [{'name': name} for name in missing]
+        )
+        ids.update(connection.execute(select(table.c.name, table.c.id).where(table.c.name.in_(missing))).all())
+    return ids
+
+def remove_job_locations(connection, job_ids):
+    if job_ids:
+        connection.execute(delete(job_locations).where(job_locations.c.job_id.in_(job_ids)))
+
+def replace_job_locations(connection, jobs):
+    """Rewrite the association rows for (job_id, location, tags) tuples"""
+    if not jobs:
+        return
+    names_by_job = {job_id: split_locations(location, tags) for job_id, location, tags in jobs}
+    ids = location_ids(connection, sorted({name for names in names_by_job.values() for name in names}))
+
+    remove_job_locations(connection, list(names_by_job))
+    rows = [
+        {'job_id': job_id, 'location_id': ids[name]}
+        for job_id, names in names_by_job.items()
+        for name in names
+    ]
+    if rows:
+        connection.execute(job_locations.insert(), rows)
+
+# KEEP ASSOCIATIONS IN SYNC WITH EVERY ORM WRITE TO jobs
+@event.listens_for(db.session, 'after_flush')
+def track_location_changes(session, flush_context):
+    changed = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Job) and (
+            obj in session.new
+            or get_history(obj, 'location').has_changes()
+            or get_history(obj, 'tags').has_changes()
+        )
+    ]
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Job)]
+
+    if changed or deleted:
+        connection = session.connection()
+        replace_job_locations(connection, [(job.id, job.location, job.tags) for job in changed])
+        remove_job_locations(connection, deleted)
+
+def rebuild_job_locations(batch_size=1000):
+    """Recompute every job's canonical locations"""
+    connection = db.session.connection()
+    connection.execute(delete(job_locations))
+    last_id = 0
+    while True:
+        jobs = connection.execute(
+            select(Job.id, Job.location, Job.tags).where(Job.id > last_id).order_by(Job.id).limit(batch_size)
+        ).all()
+        if not jobs:
+            break
+        replace_job_locations(connection, jobs)
+        last_id = jobs[-1][0]
+    db.session.commit()
@@ -0,0 +1,325 @@
+# backend/migrations.py
+import time
+from flask import current_app, request, jsonify
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Text, DateTime, Date, JSON, ForeignKey, UniqueConstraint, Index,
+    select, insert, func, inspect, text
+)
+from db import db, dialect_insert
+from models.schema_migration import SchemaMigration
+from locations import split_locations
+from datetime import datetime
+
+# Endpoints still served while the schema is behind, so orchestrators can tell "needs migration" from "down"
+SCHEMA_EXEMPT_ENDPOINTS = ('health_check',)
+
+# SCHEMA AT VERSION 1 - FROZEN, LATER CHANGES GO INTO NEW MIGRATIONS, NEVER HERE
+SCHEMA_V1 = MetaData()
+
+Table(
+    'jobs', SCHEMA_V1,
+    Column('id', Integer, primary_key=True),
+    Column('title', String(200), nullable=False),
+    Column('company', String(200), nullable=False),
+    Column('location', String(200), nullable=False),
+    Column('posting_date', DateTime, nullable=False),
+    Column('job_type', String(50), nullable=False),
+    Column('tags', Text),
+    Column('description', Text),
+    Column('url', String(500)),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+    UniqueConstraint('title', 'company', 'location', name='unique_job')
+)
+
+Table(
+    'archived_jobs', SCHEMA_V1,
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('archived_at', DateTime, nullable=False),
+    Column('title', String(200), nullable=False),
+    Column('company', String(200), nullable=False),
+    Column('location', String(200), nullable=False),
+    Column('posting_date', DateTime, nullable=False, index=True),
+    Column('job_type', String(50), nullable=False),
+    Column('tags', Text),
+    Column('description', Text),
+    Column('url', String(500)),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime)
+)
+
+Table(
+    'job_changes', SCHEMA_V1,
+    Column('seq', Integer, primary_key=True),
+    Column('job_id', Integer, nullable=False, index=True),
+    Column('op', String(10), nullable=False),
+    Column('changed_at', DateTime, nullable=False),
+    sqlite_autoincrement=True
+)
+
+Table(
+    'job_daily_counts', SCHEMA_V1,
+    Column('id', Integer, primary_key=True),
+    Column('day', Date, nullable=False, index=True),
+    Column('job_type', String(50), nullable=False),
+    Column('company', String(200), nullable=False),
+    Column('count', Integer, nullable=False),
+    UniqueConstraint('day', 'job_type', 'company', name='unique_daily_bucket')
+)
+
+Table(
+    'locations', SCHEMA_V1,
+    Column('id', Integer, primary_key=True),
+    Column('name', String(200), nullable=False, unique=True)
+)
+
+Table(
+    'job_locations', SCHEMA_V1,
+    Column('job_id', Integer, ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    Column('location_id', Integer, ForeignKey('locations.id'), primary_key=True),
+    Index('ix_job_locations_location_id', 'location_id')
+)
+
+Table(
+    'saved_searches', SCHEMA_V1,
+    Column('id', Integer, primary_key=True),
+    Column('name', String(200), nullable=False),
+    Column('params', JSON, nullable=False),
+    Column('created_at', DateTime),
+    sqlite_autoincrement=True
+)
+
+Table(
+    'notifications', SCHEMA_V1,
+    Column('id', Integer, primary_key=True),
+    Column('saved_search_id', Integer, ForeignKey('saved_searches.id', ondelete='CASCADE'), nullable=False, index=True),
+    Column('job_id', Integer, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    UniqueConstraint('saved_search_id', 'job_id', name='unique_notification')
+)
+
+# MIGRATION STEPS
+# Every step must be safe to re-run: a step is recorded only after it finishes,
+# so one interrupted half-way is simply applied again by the next migrate-db.
+# Steps use their own table definitions or SQL, never the models, so their meaning does not drift;
+# location names still come from split_locations, so a backfill follows the current alias list
+def create_tables():
+    """Tables of the version 1 schema that don't exist yet"""
+    with db.engine.begin() as connection:
+        SCHEMA_V1.create_all(connection, checkfirst=True)
+
+def build_index(name, table, columns):
+    """Create an index without blocking reads (or, on PostgreSQL, writes) while it is built"""
+    columns = ', '.join(columns)
+    if db.engine.dialect.name == 'postgresql':
+        # CONCURRENTLY cannot run inside a transaction; a failed concurrent build
+        # leaves an INVALID index behind that IF NOT EXISTS would skip, so drop it first
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            invalid = connection.scalar(text(
+                'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+                'WHERE pg_class.relname = :name AND NOT pg_index.indisvalid'
+            ), {'name': name})
+            if invalid:
+                connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {name}'))
+            connection.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})'))
+    else:
+        # SQLite builds the index in one write transaction - readers keep going, writers wait on busy_timeout
+        with db.engine.begin() as connection:
+            connection.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})'))
+
+def job_indexes():
+    # posting_date: declared on the model after jobs.db was first created, so create_all never added it;
+    # updated_at: the snapshot read engine's delta refresh filters on it every few seconds
+    build_index('ix_jobs_posting_date', 'jobs', ['posting_date'])
+    build_index('ix_jobs_updated_at', 'jobs', ['updated_at'])
+
+def backfill_rollups(batch_size=5000):
+    """Fill the date rollup and canonical locations for jobs written before they existed"""
+    jobs = SCHEMA_V1.tables['jobs']
+    counts = SCHEMA_V1.tables['job_daily_counts']
+    locations = SCHEMA_V1.tables['locations']
+    job_locations = SCHEMA_V1.tables['job_locations']
+
+    with db.engine.begin() as connection:
+        if connection.scalar(select(counts.c.id).limit(1)) is None:
+            day = func.date(jobs.c.posting_date)
+            connection.execute(counts.insert().from_select(
+                ['day', 'job_type', 'company', 'count'],
+                select(day, jobs.c.job_type, jobs.c.company, func.count(jobs.c.id))
+                .group_by(day, jobs.c.job_type, jobs.c.company)
+            ))
+
+    # Jobs without associations, one committed batch at a time so readers and writers are not held up
+    last_id = 0
+    while True:
+        with db.engine.begin() as connection:
+            batch = connection.execute(
+                select(jobs.c.id, jobs.c.location, jobs.c.tags)
+                .where(jobs.c.id > last_id, ~select(job_locations.c.job_id).where(job_locations.c.job_id == jobs.c.id).exists())
+                .order_by(jobs.c.id).limit(batch_size)
+            ).all()
+            if not batch:
+                break
+            names_by_job = {job_id: split_locations(location, tags) for job_id, location, tags in batch}
+            names = sorted({name for job_names in names_by_job.values() for name in job_names})
+            if names:
+                connection.execute(
+                    dialect_insert(locations, connection).on_conflict_do_nothing(index_elements=['name']),
+                    [{'name': name} for name in names]
+                )
+                ids = dict(connection.execute(select(locations.c.name, locations.c.id).where(locations.c.name.in_(names))).all())
+                connection.execute(job_locations.insert(), [
+                    {'job_id': job_id, 'location_id': ids[name]}
+                    for job_id, job_names in names_by_job.items() for name in job_names
+                ])
+            last_id = batch[-1][0]
+
+# jobs with AUTOINCREMENT, as rebuilt by migration 4 on SQLite
+JOBS_V4_SQLITE = """
+CREATE TABLE {name} (
+    id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(200) NOT NULL,
+    company VARCHAR(200) NOT NULL,
+    location VARCHAR(200) NOT NULL,
+    posting_date DATETIME NOT NULL,
+    job_type VARCHAR(50) NOT NULL,
+    tags TEXT,
+    description TEXT,
+    url VARCHAR(500),
+    created_at DATETIME,
+    updated_at DATETIME,
+    CONSTRAINT unique_job UNIQUE (title, company, location)
+)
+"""
+JOBS_V4_COLUMNS = 'id, title, company, location, posting_date, job_type, tags, description, url, created_at, updated_at'
+
+def job_ids_never_reused():
+    """Stop handing out ids of deleted or archived jobs again.
+
+    Without AUTOINCREMENT SQLite gives a new row max(id) + 1, so the id of the
+    newest job comes back after it is deleted or archived - colliding with its
+    archived_jobs row, change log entries and notifications. The counter is
+    started above every id that was ever in use.
+    """
+    with db.engine.begin() as connection:
+        high_water = connection.scalar(text(
+            'SELECT max(id) FROM ('
+            'SELECT max(id) AS id FROM jobs UNION ALL SELECT max(id) FROM archived_jobs '
+            'UNION ALL SELECT max(job_id) FROM job_changes UNION ALL SELECT max(job_id) FROM notifications)'
+        )) or 0
+
+        if db.engine.dialect.name == 'postgresql':
+            # SERIAL never reuses ids, but ids of archived rows may sit above the sequence
+            connection.execute(text(
+                "SELECT setval(pg_get_serial_sequence('jobs', 'id'), GREATEST(:high_water, "
+                "COALESCE(pg_sequence_last_value(pg_get_serial_sequence('jobs', 'id')::regclass), 0), 1))"
+            ), {'high_water': high_water})
+            return
+
+        table_sql = connection.scalar(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs'"))
+        if 'AUTOINCREMENT' not in table_sql.upper():
+            # SQLite cannot alter a primary key - copy into a rebuilt table and swap it in
+            connection.execute(text('DROP TABLE IF EXISTS jobs_rebuild'))
+            connection.execute(text(JOBS_V4_SQLITE.format(name='jobs_rebuild')))
+            connection.execute(text(f'INSERT INTO jobs_rebuild ({JOBS_V4_COLUMNS}) SELECT {JOBS_V4_COLUMNS} FROM jobs'))
+            connection.execute(text('DROP TABLE jobs'))
+            connection.execute(text('ALTER TABLE jobs_rebuild RENAME TO jobs'))
+            connection.execute(text('CREATE INDEX ix_jobs_posting_date ON jobs (posting_date)'))
+            connection.execute(text('CREATE INDEX ix_jobs_updated_at ON jobs (updated_at)'))
+
+        connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'jobs'"))
+        connection.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('jobs', :seq)"), {'seq': high_water})
+
+def create_write_statuses():
+    """Outcomes of write-behind job creations, shared by all workers"""
+    table = Table(
+        'write_statuses', MetaData(),
+        Column('tracking_id', String(32), primary_key=True),
+        Column('status', String(20), nullable=False),
+        Column('job_id', Integer),
+        Column('error', Text),
+        Column('queued_at', DateTime, nullable=False),
+        Column('committed_at', DateTime, nullable=False, index=True)
+    )
+    with db.engine.begin() as connection:
+        table.create(connection, checkfirst=True)
+
+MIGRATIONS = [
+    (1, 'create tables', create_tables),
+    (2, 'job posting_date and updated_at indexes', job_indexes),
+    (3, 'backfill date buckets and job locations', backfill_rollups),
+    (4, 'never reuse job ids', job_ids_never_reused),
+    (5, 'write-behind statuses', create_write_statuses),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# RUNNER
+def applied_version(connection):
+    """Highest migration applied to the database, 0 before the first migrate-db"""
+    if not inspect(connection).has_table(SchemaMigration.__tablename__):
+        return 0
+    return connection.scalar(select(func.max(SchemaMigration.version))) or 0
+
+def upgrade(target=None, echo=print):
+    """Apply pending migrations up to target (default: latest) in order; returns the resulting version"""
+    target = LATEST_VERSION if target is None else target
+    with db.engine.begin() as connection:
+        SchemaMigration.__table__.create(connection, checkfirst=True)
+        version = applied_version(connection)
+
+    for number, name, migrate in MIGRATIONS:
+        if number <= version or number > target:
+            continue
+        started = time.perf_counter()
+        echo(f'Applying migration {number}: {name}...')
+        migrate()
+        with db.engine.begin() as connection:
+            connection.execute(insert(SchemaMigration).values(version=number, name=name, applied_at=datetime.utcnow()))
+        version = number
+        echo(f'Migration {number} applied in {time.perf_counter() - started:.1f}s')
+
+    schema = current_app.extensions.get('schema')
+    if schema is not None:
+        schema['version'] = version
+    return version
+
+def migration_status():
+    """(version, name, applied_at or None) for every known migration"""
+    with db.engine.connect() as connection:
+        applied = {}
+        if inspect(connection).has_table(SchemaMigration.__tablename__):
+            applied = dict(connection.execute(select(SchemaMigration.version, SchemaMigration.applied_at)).all())
+    return [(number, name, applied.get(number)) for number, name, _ in MIGRATIONS]
+
+# STARTUP VERSION CHECK
+def schema_version(app):
+    """Schema version seen at startup, looked up again while it is behind so workers recover after migrate-db"""
+    schema = app.extensions['schema']
+    if schema['version'] < LATEST_VERSION:
+        with db.engine.connect() as connection:
+            schema['version'] = applied_version(connection)
+    return schema['version']
+
+def init_schema_check(app):
+    """Read the schema version once at startup and refuse requests while the database is behind the code"""
+    with app.app_context():
+        with db.engine.connect() as connection:
+            version = applied_version(connection)
+    schema = app.extensions['schema'] = {'version': version}
+
+    if version > LATEST_VERSION:
+        app.logger.warning(f'Database schema version {version} is newer than this code ({LATEST_VERSION})')
+    elif version < LATEST_VERSION:
+        app.logger.warning(
+            f'Database schema version {version} is behind this code ({LATEST_VERSION}) - run `flask --app app migrate-db`'
+        )
+
+    @app.before_request
+    def require_current_schema():
+        if request.endpoint in SCHEMA_EXEMPT_ENDPOINTS:
+            return None
+        if schema_version(app) < LATEST_VERSION:
+            return jsonify({
+                'error': f'Database schema is at version {schema["version"]}, expected {LATEST_VERSION} - '
+                         f'run `flask --app app migrate-db`'
+            }), 503
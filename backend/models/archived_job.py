@@ -0,0 +1,18 @@
+# backend/models/archived_job.py
+from db import db
+from datetime import datetime
+from models.job import JobMixin
+
+class ArchivedJob(JobMixin, db.Model):
+    """Job moved out of the hot jobs table by the retention job (keeps its original id)"""
+    __tablename__ = 'archived_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert archived job to dictionary, flagged as archived"""
+        data = super().to_dict()
+        data['archived'] = True
+        data['archived_at'] = self.archived_at.isoformat() if self.archived_at else None
+        return data
@@ -1,16 +1,15 @@
 # backend/models/job.py
 from db import db
 from datetime import datetime
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, Index
 
-class Job(db.Model):
-    __tablename__ = 'jobs'
-    
+class JobMixin:
+    """Columns and serialization shared by live and archived jobs"""
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     company = db.Column(db.String(200), nullable=False)
     location = db.Column(db.String(200), nullable=False)
-    posting_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    posting_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     job_type = db.Column(db.String(50), nullable=False, default='Full-time')
     tags = db.Column(db.Text)  # Comma-separated tags
     description = db.Column(db.Text)  # Optional job description
@@ -18,11 +17,8 @@ class Job(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Add unique constraint to prevent exact duplicates
-    __table_args__ = (UniqueConstraint('title', 'company', 'location', name='unique_job'),)
-    
     def __repr__(self):
-        return f'<Job {self.title} at {self.company}>'
+        return f'<{type(self).__name__} {self.title} at {self.company}>'
     
     def to_dict(self):
         """Convert job object to dictionary for JSON serialization"""
@@ -39,6 +35,19 @@ class Job(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+class Job(JobMixin, db.Model):
+    __tablename__ = 'jobs'
+    
+    VALID_JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship', 'Temporary']
+    
+    # Add unique constraint to prevent exact duplicates; updated_at is indexed for recency queries.
+    # AUTOINCREMENT keeps ids of deleted and archived jobs from being handed out again
+    __table_args__ = (
+        UniqueConstraint('title', 'company', 'location', name='unique_job'),
+        Index('ix_jobs_updated_at', 'updated_at'),
+        {'sqlite_autoincrement': True}
+    )
     
     @classmethod
     def from_dict(cls, data):
@@ -79,8 +88,7 @@ class Job(db.Model):
         if not self.location or self.location.strip() == '':
             errors.append('Location is required')
         
-        valid_job_types = ['Full-time', 'Part-time', 'Contract', 'Internship', 'Temporary']
-        if self.job_type not in valid_job_types:
-            errors.append(f'Job type must be one of: {", ".join(valid_job_types)}')
+        if self.job_type not in self.VALID_JOB_TYPES:
+            errors.append(f'Job type must be one of: {", ".join(self.VALID_JOB_TYPES)}')
             
         return errors
\ No newline at end of file
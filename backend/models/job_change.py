@@ -0,0 +1,18 @@
+# backend/models/job_change.py
+from db import db
+from datetime import datetime
+
+class JobChange(db.Model):
+    """Append-only change log entry for a job (insert, update or delete tombstone)"""
+    __tablename__ = 'job_changes'
+    
+    seq = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, nullable=False, index=True)
+    op = db.Column(db.String(10), nullable=False)  # insert / update / delete
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # AUTOINCREMENT keeps seq strictly increasing on SQLite even if rows are pruned
+    __table_args__ = {'sqlite_autoincrement': True}
+    
+    def __repr__(self):
+        return f'<JobChange {self.seq} {self.op} job {self.job_id}>'
@@ -0,0 +1,19 @@
+# backend/models/job_daily_count.py
+from db import db
+from sqlalchemy import UniqueConstraint
+
+class JobDailyCount(db.Model):
+    """Rollup of jobs per posting day, job type and company"""
+    __tablename__ = 'job_daily_counts'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    company = db.Column(db.String(200), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    # One row per bucket
+    __table_args__ = (UniqueConstraint('day', 'job_type', 'company', name='unique_daily_bucket'),)
+    
+    def __repr__(self):
+        return f'<JobDailyCount {self.day} {self.job_type} {self.company}: {self.count}>'
@@ -0,0 +1,19 @@
+# backend/models/location.py
+from db import db
+
+# Job <-> canonical location association (one row per location of a job)
+job_locations = db.Table(
+    'job_locations',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('location_id', db.Integer, db.ForeignKey('locations.id'), primary_key=True, index=True)
+)
+
+class Location(db.Model):
+    """Canonical single location (e.g. 'New York NY', 'Remote')"""
+    __tablename__ = 'locations'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False, unique=True)
+    
+    def __repr__(self):
+        return f'<Location {self.name}>'
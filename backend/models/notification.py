@@ -0,0 +1,28 @@
+# backend/models/notification.py
+from db import db
+from sqlalchemy import UniqueConstraint
+from datetime import datetime
+
+class Notification(db.Model):
+    """A newly ingested job that matched a saved search"""
+    __tablename__ = 'notifications'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    saved_search_id = db.Column(db.Integer, db.ForeignKey('saved_searches.id', ondelete='CASCADE'), nullable=False, index=True)
+    job_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # A job is reported to a saved search at most once
+    __table_args__ = (UniqueConstraint('saved_search_id', 'job_id', name='unique_notification'),)
+    
+    def __repr__(self):
+        return f'<Notification search {self.saved_search_id} job {self.job_id}>'
+    
+    def to_dict(self, job=None):
+        return {
+            'id': self.id,
+            'saved_search_id': self.saved_search_id,
+            'job_id': self.job_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'job': job.to_dict() if job is not None else None
+        }
@@ -0,0 +1,29 @@
+# backend/models/saved_search.py
+from db import db
+from datetime import datetime
+
+class SavedSearch(db.Model):
+    """A stored set of get_jobs filters that is alerted on when new jobs match"""
+    __tablename__ = 'saved_searches'
+    
+    # Filters a saved search may use - same meaning as the get_jobs query parameters
+    PARAMS = ('job_type', 'location', 'company', 'tags', 'search')
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    params = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # AUTOINCREMENT so a deleted search's id is never reused by a new one
+    __table_args__ = {'sqlite_autoincrement': True}
+    
+    def __repr__(self):
+        return f'<SavedSearch {self.name}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'params': self.params,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
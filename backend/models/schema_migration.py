@@ -0,0 +1,14 @@
+# backend/models/schema_migration.py
+from db import db
+from datetime import datetime
+
+class SchemaMigration(db.Model):
+    """Migration applied to this database by `flask --app app migrate-db`"""
+    __tablename__ = 'schema_migrations'
+
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(200), nullable=False)
+    applied_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SchemaMigration {self.version} {self.name}>'
@@ -0,0 +1,27 @@
+# backend/models/write_status.py
+from db import db
+from datetime import datetime
+
+class WriteStatus(db.Model):
+    """Outcome of a write-behind job creation, readable by every worker"""
+    __tablename__ = 'write_statuses'
+    
+    tracking_id = db.Column(db.String(32), primary_key=True)
+    status = db.Column(db.String(20), nullable=False)  # created / duplicate / failed
+    job_id = db.Column(db.Integer)
+    error = db.Column(db.Text)
+    queued_at = db.Column(db.DateTime, nullable=False)
+    committed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f'<WriteStatus {self.tracking_id} {self.status}>'
+    
+    def to_dict(self):
+        return {
+            'tracking_id': self.tracking_id,
+            'status': self.status,
+            'job_id': self.job_id,
+            'error': self.error,
+            'queued_at': self.queued_at.isoformat() if self.queued_at else None,
+            'committed_at': self.committed_at.isoformat() if self.committed_at else None
+        }
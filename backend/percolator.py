@@ -0,0 +1,191 @@
+# backend/percolator.py
+import re
+import threading
+from collections import defaultdict
+from sqlalchemy import event, select, func, delete
+from db import db, dialect_insert
+from models.job import Job
+from models.saved_search import SavedSearch
+from models.notification import Notification
+from locations import canonical_location, split_locations
+from query_builder import ilike_matcher, location_matcher
+from datetime import datetime
+
+# Literal runs of an ilike term ('%' and '_' are wildcards)
+LITERAL_RUNS = re.compile(r'[^%_]+')
+
+def trigrams(text):
+    text = (text or '').lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# SEARCH SIDE - MATCHERS MIRRORING build_filter_conditions
+def search_matcher(params):
+    """Predicate over job features with the same semantics as the get_jobs filters"""
+    checks = []
+    if params.get('job_type'):
+        checks.append(lambda features, job_type=params['job_type']: features['job_type'] == job_type)
+    if params.get('company'):
+        checks.append(lambda features, matches=ilike_matcher(params['company']): matches(features['company']))
+    if params.get('location'):
+        checks.append(lambda features, matches=location_matcher(params['location']): any(
+            matches(name) for name in features['locations']
+        ))
+    if params.get('tags'):
+        tag_matchers = [ilike_matcher(tag.strip()) for tag in params['tags'].split(',')]
+        checks.append(lambda features: any(matches(features['tags']) for matches in tag_matchers))
+    if params.get('search'):
+        checks.append(lambda features, matches=ilike_matcher(params['search']): any(
+            matches(features[field]) for field in ('title', 'company', 'description')
+        ))
+    return lambda features: all(check(features) for check in checks)
+
+# JOB SIDE - FEATURES AND INDEX KEYS
+def job_features(job):
+    return {
+        'job_type': job.job_type,
+        'company': job.company,
+        'title': job.title,
+        'description': job.description,
+        'tags': job.tags,
+        'locations': split_locations(job.location, job.tags)
+    }
+
+def job_keys(features):
+    """Index keys a job can satisfy, per field"""
+    return {
+        'job_type': {features['job_type']},
+        'company': trigrams(features['company']),
+        'tags': trigrams(features['tags']),
+        'location': set().union(*[trigrams(name) for name in features['locations']]),
+        'search': trigrams(features['title']) | trigrams(features['company']) | trigrams(features['description'])
+    }
+
+class Percolator:
+    """Index of saved searches, queried with a job to find the searches it matches.
+
+    Each search is posted under the keys of one of its filters, any of which
+    a matching job must have: the job type, or a trigram of a substring term
+    (for OR filters like tags, one trigram per alternative). A job only looks
+    up its own keys, so it is checked against the few searches sharing them
+    instead of every saved search. Searches with no usable filter (e.g. only
+    terms shorter than three characters) are checked against every job.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.postings = defaultdict(set)
+        self.search_keys = {}
+        self.matchers = {}
+        self.unanchored = set()
+        self.fingerprint = None
+
+    # INDEXING
+    def term_anchor(self, field, term):
+        """Rarest trigram of the term's literal text, or None if it has none"""
+        grams = set().union(*[trigrams(run) for run in LITERAL_RUNS.findall(term or '')])
+        if not grams:
+            return None
+        return (field, min(grams, key=lambda gram: (len(self.postings.get((field, gram), ())), gram)))
+
+    def anchor_options(self, params):
+        """Alternative key sets for a search; a matching job has at least one key of each set"""
+        options = []
+        if params.get('job_type'):
+            options.append([('job_type', params['job_type'])])
+        if params.get('company'):
+            options.append([self.term_anchor('company', params['company'])])
+        if params.get('location'):
+            # Canonical name contains the term, or equals its canonical form
+            term = params['location']
+            options.append([self.term_anchor('location', term), self.term_anchor('location', canonical_location(term))])
+        if params.get('tags'):
+            options.append([self.term_anchor('tags', tag.strip()) for tag in params['tags'].split(',')])
+        if params.get('search'):
+            options.append([self.term_anchor('search', params['search'])])
+        return [keys for keys in options if None not in keys]
+
+    def add(self, search_id, params):
+        with self.lock:
+            self.remove(search_id)
+            options = self.anchor_options(params)
+            self.matchers[search_id] = search_matcher(params)
+            if not options:
+                self.unanchored.add(search_id)
+                self.search_keys[search_id] = []
+                return
+            keys = min(options, key=lambda keys: sum(len(self.postings.get(key, ())) for key in keys))
+            for key in keys:
+                self.postings[key].add(search_id)
+            self.search_keys[search_id] = keys
+
+    def remove(self, search_id):
+        with self.lock:
+            for key in self.search_keys.pop(search_id, []):
+                self.postings[key].discard(search_id)
+                if not self.postings[key]:
+                    del self.postings[key]
+            self.unanchored.discard(search_id)
+            self.matchers.pop(search_id, None)
+
+    # MATCHING
+    def candidates(self, features):
+        found = set(self.unanchored)
+        for field, keys in job_keys(features).items():
+            for key in keys:
+                found |= self.postings.get((field, key), set())
+        return found
+
+    def match(self, job):
+        """Ids of saved searches the job matches"""
+        features = job_features(job)
+        with self.lock:
+            return sorted(search_id for search_id in self.candidates(features) if self.matchers[search_id](features))
+
+    # SYNC WITH THE saved_searches TABLE
+    def sync(self, connection):
+        """Apply saved searches created or deleted since the last sync (in any process)"""
+        table = SavedSearch.__table__
+        fingerprint = tuple(connection.execute(select(
+            func.count(table.c.id), func.coalesce(func.max(table.c.id), 0), func.coalesce(func.sum(table.c.id), 0)
+        )).one())
+        with self.lock:
+            if fingerprint == self.fingerprint:
+                return
+            stored = set(connection.scalars(select(table.c.id)).all())
+            for search_id in set(self.matchers) - stored:
+                self.remove(search_id)
+            added = stored - set(self.matchers)
+            if added:
+                for search_id, params in connection.execute(select(table.c.id, table.c.params).where(table.c.id.in_(added))):
+                    self.add(search_id, params)
+            self.fingerprint = fingerprint
+
+percolator = Percolator()
+
+def remove_job_notifications(connection, job_ids):
+    """Drop notifications of deleted jobs (archived jobs keep theirs, they can still be fetched)"""
+    if job_ids:
+        table = Notification.__table__
+        connection.execute(delete(table).where(table.c.job_id.in_(job_ids)))
+
+# MATCH EVERY NEW JOB IN THE TRANSACTION THAT INSERTS IT
+@event.listens_for(db.session, 'after_flush')
+def percolate_new_jobs(session, flush_context):
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Job)]
+    if deleted:
+        remove_job_notifications(session.connection(), deleted)
+
+    jobs = [obj for obj in session.new if isinstance(obj, Job)]
+    if not jobs:
+        return
+
+    connection = session.connection()
+    percolator.sync(connection)
+    now = datetime.utcnow()
+    rows = [
+        {'saved_search_id': search_id, 'job_id': job.id, 'created_at': now}
+        for job in jobs
+        for search_id in percolator.match(job)
+    ]
+    if rows:
+        # A leftover row for the same job id must not fail the job's own insert
+        connection.execute(dialect_insert(Notification.__table__, connection).on_conflict_do_nothing(), rows)
@@ -0,0 +1,259 @@
+# backend/query_builder.py
+import math
+import re
+from sqlalchemy import select, func, or_, and_, desc, asc, literal, union_all, case
+from models.job import Job
+from models.archived_job import ArchivedJob
+from models.location import Location, job_locations
+from locations import canonical_location
+from datetime import datetime, timedelta
+
+FACET_FILTERS = ('company', 'location', 'job_type')
+
+# SORT PARAMETER -> (COLUMN NAME, DIRECTION)
+SORT_OPTIONS = {
+    'posting_date_desc': ('posting_date', desc),
+    'posting_date_asc': ('posting_date', asc),
+    'title_asc': ('title', asc),
+    'title_desc': ('title', desc),
+    'company_asc': ('company', asc),
+    'company_desc': ('company', desc)
+}
+
+# DATE FILTER PARSING HELPER FUNCTION
+def parse_date_filter(date_filter_type, custom_date_from=None, custom_date_to=None):
+    """Parse date filter and return date range"""
+    today = datetime.now().date()
+
+    if date_filter_type == 'today':
+        return today, today
+    elif date_filter_type == 'last_7_days':
+        return today - timedelta(days=7), today
+    elif date_filter_type == 'last_month':
+        return today - timedelta(days=30), today
+    elif date_filter_type == 'custom' and custom_date_from and custom_date_to:
+        try:
+            date_from = datetime.strptime(custom_date_from, '%Y-%m-%d').date()
+            date_to = datetime.strptime(custom_date_to, '%Y-%m-%d').date()
+            return date_from, date_to
+        except ValueError:
+            return None, None
+
+    return None, None
+
+# LOCATION FILTER - MATCHED AGAINST CANONICAL SINGLE LOCATIONS
+def location_name_condition(term):
+    return or_(Location.name.ilike(f'%{term}%'), Location.name == canonical_location(term))
+
+def location_condition(term, model=Job):
+    """Jobs with at least one canonical location matching term (archived jobs match the raw string)"""
+    if model is not Job:
+        return model.location.ilike(f'%{term}%')
+    return Job.id.in_(
+        select(job_locations.c.job_id)
+        .join(Location, Location.id == job_locations.c.location_id)
+        .where(location_name_condition(term))
+    )
+
+# FILTER CONDITIONS
+def build_filter_conditions(args, exclude=(), model=Job):
+    """Build WHERE conditions from request args, skipping the filters named in exclude"""
+    conditions = []
+
+    job_type = args.get('job_type')
+    location = args.get('location')
+    company = args.get('company')
+    tags = args.get('tags')
+    search = args.get('search')
+    date_filter = args.get('date_filter')
+
+    if job_type and 'job_type' not in exclude:
+        conditions.append(model.job_type == job_type)
+
+    if location and 'location' not in exclude:
+        conditions.append(location_condition(location, model))
+
+    if company and 'company' not in exclude:
+        conditions.append(model.company.ilike(f'%{company}%'))
+
+    if tags:
+        tag_list = [tag.strip() for tag in tags.split(',')]
+        conditions.append(or_(*[model.tags.ilike(f'%{tag}%') for tag in tag_list]))
+
+    if search:
+        search_term = f'%{search}%'
+        conditions.append(or_(
+            model.title.ilike(search_term),
+            model.company.ilike(search_term),
+            model.description.ilike(search_term)
+        ))
+
+    if date_filter:
+        date_from, date_to = parse_date_filter(date_filter, args.get('date_from'), args.get('date_to'))
+        if date_from and date_to:
+            conditions.append(and_(
+                model.posting_date >= datetime.combine(date_from, datetime.min.time()),
+                model.posting_date <= datetime.combine(date_to, datetime.max.time())
+            ))
+
+    return conditions
+
+def get_sort_order(args, columns=Job):
+    """Return the ORDER BY clause for the sort parameter against a model or subquery columns"""
+    name, direction = SORT_OPTIONS.get(args.get('sort', 'posting_date_desc'), SORT_OPTIONS['posting_date_desc'])
+    return direction(getattr(columns, name))
+
+def get_page_args(args):
+    """Return (page, per_page) normalized the same way as paginate(error_out=False)"""
+    page = max(args.get('page', 1, type=int), 1)
+    per_page = args.get('per_page', 50, type=int)
+    per_page = min(per_page, 100) if per_page > 0 else 20
+    return page, per_page
+
+# STATEMENTS
+def page_statement(conditions, order, page, per_page):
+    return select(Job).where(*conditions).order_by(order).limit(per_page).offset((page - 1) * per_page)
+
+def count_statement(conditions):
+    return select(func.count(Job.id)).where(*conditions)
+
+def facet_statement(column, conditions):
+    return select(column, func.count(Job.id).label('count')).where(*conditions).group_by(column).order_by(desc('count'))
+
+def location_facet_statement(conditions):
+    """Counts per canonical location, so a job listed in three cities counts once in each"""
+    return select(
+        Location.name, func.count(Job.id).label('count')
+    ).select_from(Job).join(
+        job_locations, job_locations.c.job_id == Job.id
+    ).join(
+        Location, Location.id == job_locations.c.location_id
+    ).where(*conditions).group_by(Location.name).order_by(desc('count'))
+
+def facet_statement_for(name, conditions):
+    if name == 'location':
+        return location_facet_statement(conditions)
+    return facet_statement(getattr(Job, name), conditions)
+
+def facet_groups_statement(args):
+    """Single GROUP BY over every (company, job_type, location match) combination matching the non-facet filters"""
+    location = args.get('location')
+    location_ok = case((location_condition(location), 1), else_=0) if location else literal(1)
+    return select(
+        Job.company, Job.job_type, location_ok.label('location_ok'), func.count(Job.id)
+    ).where(*build_filter_conditions(args, exclude=FACET_FILTERS)).group_by(Job.company, Job.job_type, 'location_ok')
+
+# LIVE + ARCHIVED LISTING (include_archived=true)
+def include_archived(args):
+    return args.get('include_archived', '').lower() == 'true'
+
+def combined_subquery(args):
+    """UNION ALL of matching live and archived jobs, reduced to id, archived flag and sort columns"""
+    def branch(model, archived):
+        return select(
+            model.id, literal(archived).label('archived'), model.posting_date, model.title, model.company
+        ).where(*build_filter_conditions(args, model=model))
+    return union_all(branch(Job, False), branch(ArchivedJob, True)).subquery()
+
+def combined_page_statements(args, page, per_page):
+    """Return (page keys statement, count statement) for a live + archived listing"""
+    combined = combined_subquery(args)
+    keys = select(combined.c.id, combined.c.archived).order_by(
+        get_sort_order(args, combined.c)
+    ).limit(per_page).offset((page - 1) * per_page)
+    return keys, select(func.count()).select_from(combined)
+
+def entity_statements(keys):
+    """Statements loading the live and archived jobs for (id, archived) page keys"""
+    live_ids = [job_id for job_id, archived in keys if not archived]
+    archived_ids = [job_id for job_id, archived in keys if archived]
+    return select(Job).where(Job.id.in_(live_ids)), select(ArchivedJob).where(ArchivedJob.id.in_(archived_ids))
+
+def order_by_keys(keys, jobs):
+    """Put loaded jobs back into page order"""
+    by_key = {(job.id, isinstance(job, ArchivedJob)): job for job in jobs}
+    return [by_key[(job_id, bool(archived))] for job_id, archived in keys if (job_id, bool(archived)) in by_key]
+
+# IN-PYTHON FACET EVALUATION
+def ilike_matcher(term):
+    """Return a predicate equivalent to column.ilike(f'%{term}%')"""
+    pattern = ''.join('.*' if ch == '%' else '.' if ch == '_' else re.escape(ch) for ch in term)
+    regex = re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    return lambda value: value is not None and regex.search(value) is not None
+
+def location_matcher(term):
+    """Python equivalent of location_name_condition for a single canonical location"""
+    matches = ilike_matcher(term)
+    canonical = canonical_location(term)
+    return lambda value: matches(value) or value == canonical
+
+def cascade_facets(groups, args):
+    """Compute total and the company / job type facets from facet_groups_statement rows.
+
+    Each facet ignores its own filter, matching get_filter_options. The
+    location facet is multi-valued and comes from location_facet_statement.
+    """
+    matchers = {'location': lambda value: bool(value)}
+    if args.get('job_type'):
+        selected_type = args.get('job_type')
+        matchers['job_type'] = lambda value: value == selected_type
+    if args.get('company'):
+        matchers['company'] = ilike_matcher(args.get('company'))
+
+    total = 0
+    counts = {'company': {}, 'job_type': {}}
+    for company, job_type, location_ok, count in groups:
+        values = {'company': company, 'location': location_ok, 'job_type': job_type}
+        failed = [name for name, matches in matchers.items() if not matches(values[name])]
+
+        if not failed:
+            total += count
+        # A row counts towards a facet if every *other* facet filter matches
+        for name in counts:
+            if not failed or failed == [name]:
+                counts[name][values[name]] = counts[name].get(values[name], 0) + count
+
+    def ranked(name):
+        return sorted(counts[name].items(), key=lambda item: item[1], reverse=True)
+
+    return total, {
+        'job_types': format_facet(ranked('job_type'), 'type'),
+        'companies': format_facet(ranked('company'), 'company')
+    }
+
+# RESPONSE FORMATTING
+def format_facet(rows, key):
+    """Format (value, count) rows, dropping empty values"""
+    return [
+        {key: row[0], 'count': row[1]}
+        for row in rows
+        if row[0] and row[0].strip() and row[1] > 0
+    ]
+
+def compact_profile(args):
+    """Whether the client asked for bodies without derived and duplicated keys (?profile=compact)"""
+    return args.get('profile') == 'compact'
+
+def pagination_payload(jobs, total, page, per_page, compact=False):
+    """Build the paginated jobs response body"""
+    pages = math.ceil(total / per_page) if total else 0
+    payload = {
+        'jobs': [job.to_dict() for job in jobs],
+        'total': total,
+        'page': page,
+        'pages': pages,
+        'per_page': per_page
+    }
+    if compact:
+        return payload
+    
+    # Aliases and flags the compact profile leaves for the client to derive
+    payload.update({
+        'has_next': page < pages,
+        'has_prev': page > 1,
+        'total_pages': pages,
+        'current_page': page,
+        'items_per_page': per_page,
+        'total_items': total
+    })
+    return payload
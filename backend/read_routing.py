@@ -0,0 +1,96 @@
+# backend/read_routing.py
+import itertools
+import threading
+import time
+from flask import current_app, request, g
+from sqlalchemy import select, func
+from sqlalchemy.exc import SQLAlchemyError
+from db import db
+from models.job_change import JobChange
+from datetime import datetime
+
+READ_METHODS = ('GET', 'HEAD')
+
+# Clients echo the change log position of their last write, as a cookie or a header
+STICKY_COOKIE = 'read_after_seq'
+STICKY_HEADER = 'X-Read-After-Seq'
+
+class ReplicaMonitor:
+    """Tracks how far each replica's copy of the change log trails the primary.
+
+    A replica's position is the highest job_changes.seq it has applied; its
+    lag is the age of the oldest primary change it is still missing.
+    """
+    def __init__(self, bind_keys, max_lag, check_interval):
+        self.bind_keys = bind_keys
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.rotation = itertools.cycle(bind_keys)
+        self.status = {}
+
+    def check(self, bind_key):
+        """Return (seq, healthy) measured against the primary"""
+        try:
+            with db.engines[bind_key].connect() as connection:
+                seq = connection.scalar(select(func.coalesce(func.max(JobChange.seq), 0)))
+            with db.engine.connect() as connection:
+                missing_since = connection.scalar(
+                    select(JobChange.changed_at).where(JobChange.seq > seq).order_by(JobChange.seq).limit(1)
+                )
+        except SQLAlchemyError as e:
+            current_app.logger.warning(f'Replica {bind_key} check failed: {str(e)}')
+            return 0, False
+
+        lag = (datetime.utcnow() - missing_since).total_seconds() if missing_since else 0.0
+        return seq, lag <= self.max_lag
+
+    def state(self, bind_key):
+        checked_at, seq, healthy = self.status.get(bind_key, (None, 0, False))
+        if checked_at is None or time.monotonic() - checked_at >= self.check_interval:
+            seq, healthy = self.check(bind_key)
+            self.status[bind_key] = (time.monotonic(), seq, healthy)
+        return seq, healthy
+
+    def choose(self, min_seq):
+        """Next healthy replica that has applied min_seq, or None for the primary"""
+        for _ in range(len(self.bind_keys)):
+            with self.lock:
+                bind_key = next(self.rotation)
+            seq, healthy = self.state(bind_key)
+            if healthy and seq >= min_seq:
+                return bind_key
+        return None
+
+def required_seq():
+    """Change log position the client must be able to see (its last write)"""
+    value = request.cookies.get(STICKY_COOKIE) or request.headers.get(STICKY_HEADER)
+    try:
+        return int(value) if value else 0
+    except ValueError:
+        return 0
+
+def init_read_routing(app):
+    """Route GET requests to read replicas when SQLALCHEMY_BINDS configures any"""
+    bind_keys = [key for key in app.config.get('SQLALCHEMY_BINDS', {}) if key.startswith('replica_')]
+    if not bind_keys:
+        return
+
+    app.extensions['replica_monitor'] = ReplicaMonitor(
+        bind_keys, app.config['REPLICA_MAX_LAG_SECONDS'], app.config['REPLICA_CHECK_SECONDS']
+    )
+
+    @app.before_request
+    def choose_read_bind():
+        if request.method in READ_METHODS:
+            g.read_bind = app.extensions['replica_monitor'].choose(required_seq())
+
+    @app.after_request
+    def stick_to_primary_after_write(response):
+        # Reads see this client's write once a replica has applied its change log entry
+        if request.method not in READ_METHODS and request.method != 'OPTIONS' and response.status_code < 400:
+            with db.engine.connect() as connection:
+                seq = connection.scalar(select(func.coalesce(func.max(JobChange.seq), 0)))
+            response.set_cookie(STICKY_COOKIE, str(seq), max_age=app.config['REPLICA_STICKY_SECONDS'], samesite='Lax')
+            response.headers[STICKY_HEADER] = str(seq)
+        return response
@@ -0,0 +1,61 @@
+# backend/retention.py
+import time
+from sqlalchemy import select, insert, delete, literal
+from db import db
+from models.job import Job
+from models.archived_job import ArchivedJob
+from date_buckets import apply_bucket_deltas, bucket_key
+from change_log import record_changes
+from locations import remove_job_locations
+from datetime import datetime, timedelta
+
+# COLUMNS COPIED FROM jobs INTO archived_jobs
+ARCHIVE_COLUMNS = [
+    'id', 'title', 'company', 'location', 'posting_date', 'job_type',
+    'tags', 'description', 'url', 'created_at', 'updated_at'
+]
+
+def archive_batch(job_ids, archived_at):
+    """Move one batch of jobs into archived_jobs in a single short transaction"""
+    # Archived jobs leave the hot table, so take them out of the date rollup too
+    deltas = {}
+    rows = db.session.execute(
+        select(Job.posting_date, Job.job_type, Job.company).where(Job.id.in_(job_ids))
+    ).all()
+    for row in rows:
+        key = bucket_key(*row)
+        deltas[key] = deltas.get(key, 0) - 1
+
+    db.session.execute(insert(ArchivedJob).from_select(
+        ARCHIVE_COLUMNS + ['archived_at'],
+        select(*[getattr(Job, column) for column in ARCHIVE_COLUMNS], literal(archived_at)).where(Job.id.in_(job_ids))
+    ))
+    db.session.execute(delete(Job).where(Job.id.in_(job_ids)))
+    remove_job_locations(db.session.connection(), job_ids)
+    apply_bucket_deltas(db.session, deltas)
+    # Archived jobs leave the live dataset, so followers of the change feed see tombstones
+    record_changes(db.session, job_ids, 'delete')
+    db.session.commit()
+    return len(rows)
+
+def archive_old_jobs(max_age_days, batch_size=500, pause=0.0):
+    """Archive jobs whose posting_date is older than max_age_days, batch by batch.
+
+    Each batch commits on its own so writers are never locked out for long.
+    Returns the number of archived jobs.
+    """
+    cutoff = datetime.now() - timedelta(days=max_age_days)
+    archived = 0
+
+    while True:
+        job_ids = db.session.scalars(
+            select(Job.id).where(Job.posting_date < cutoff).order_by(Job.posting_date).limit(batch_size)
+        ).all()
+        if not job_ids:
+            break
+
+        archived += archive_batch(job_ids, datetime.utcnow())
+        if pause:
+            time.sleep(pause)
+
+    return archived
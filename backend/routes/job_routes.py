@@ -1,255 +1,229 @@
 # backend/routes/job_routes.py
-from flask import Blueprint, request, jsonify
+import time
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from models.job import Job
+from models.archived_job import ArchivedJob
 from db import db
-from sqlalchemy import or_, desc, asc, and_
-from datetime import datetime, timedelta
+from load_control import coalesced
+from sqlalchemy import desc
+from datetime import datetime
+from date_buckets import date_histogram, date_filter_counts
+from snapshot import get_snapshot, load_page_jobs
+from similar_index import get_similar_index, IndexNotBuilt, IndexOutOfDate
+from change_log import changes_since, current_seq, cursor_expired, format_event, format_expired, CursorExpired, EXPIRED_MESSAGE
+from write_queue import QueueFull, lookup_status
+from concurrent_reads import start_reads
+from bulk_ops import parse_selection, parse_changes, bulk_update, bulk_delete, BulkOperationError
+from sqlalchemy.exc import IntegrityError
+from query_builder import (
+    build_filter_conditions, get_sort_order, get_page_args,
+    page_statement, count_statement, facet_statement, location_facet_statement, facet_groups_statement, cascade_facets,
+    format_facet, pagination_payload, compact_profile, include_archived, combined_page_statements,
+    entity_statements, order_by_keys
+)
 
 jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
 
-# DATE FILTER PARSING HELPER FUNCTION
-def parse_date_filter(date_filter_type, custom_date_from=None, custom_date_to=None):
-    """Parse date filter and return date range"""
-    today = datetime.now().date()
-    
-    if date_filter_type == 'today':
-        return today, today
-    elif date_filter_type == 'last_7_days':
-        return today - timedelta(days=7), today
-    elif date_filter_type == 'last_month':
-        return today - timedelta(days=30), today
-    elif date_filter_type == 'custom' and custom_date_from and custom_date_to:
-        try:
-            date_from = datetime.strptime(custom_date_from, '%Y-%m-%d').date()
-            date_to = datetime.strptime(custom_date_to, '%Y-%m-%d').date()
-            return date_from, date_to
-        except ValueError:
-            return None, None
-    
-    return None, None
-
 # API ENDPOINT - GET ALL JOBS WITH FILTERING AND PAGINATION
 @jobs_bp.route('/', methods=['GET'])
 def get_jobs():
     """Get all jobs with optional filtering and sorting"""
     try:
-        # BASE QUERY SETUP
-        query = Job.query
-        
-        # EXTRACT FILTER PARAMETERS
-        job_type = request.args.get('job_type')
-        location = request.args.get('location')
-        company = request.args.get('company')
-        tags = request.args.get('tags')
-        search = request.args.get('search')
-        
-        # DATE FILTERING PARAMETERS
-        date_filter = request.args.get('date_filter')
-        custom_date_from = request.args.get('date_from')
-        custom_date_to = request.args.get('date_to')
-        
-        # APPLY FILTERS TO QUERY
-        if job_type:
-            query = query.filter(Job.job_type == job_type)
-            
-        if location:
-            query = query.filter(Job.location.ilike(f'%{location}%'))
-            
-        if company:
-            query = query.filter(Job.company.ilike(f'%{company}%'))
-            
-        if tags:
-            tag_list = [tag.strip() for tag in tags.split(',')]
-            tag_conditions = [Job.tags.ilike(f'%{tag}%') for tag in tag_list]
-            query = query.filter(or_(*tag_conditions))
-            
-        if search:
-            search_term = f'%{search}%'
-            query = query.filter(
-                or_(
-                    Job.title.ilike(search_term),
-                    Job.company.ilike(search_term),
-                    Job.description.ilike(search_term)
-                )
-            )
-        
-        # APPLY DATE FILTERING
-        if date_filter:
-            date_from, date_to = parse_date_filter(date_filter, custom_date_from, custom_date_to)
-            if date_from and date_to:
-                date_from_dt = datetime.combine(date_from, datetime.min.time())
-                date_to_dt = datetime.combine(date_to, datetime.max.time())
-                query = query.filter(and_(
-                    Job.posting_date >= date_from_dt,
-                    Job.posting_date <= date_to_dt
-                ))
-        
-        # APPLY SORTING
-        sort = request.args.get('sort', 'posting_date_desc')
-        
-        if sort == 'posting_date_desc':
-            query = query.order_by(desc(Job.posting_date))
-        elif sort == 'posting_date_asc':
-            query = query.order_by(asc(Job.posting_date))
-        elif sort == 'title_asc':
-            query = query.order_by(asc(Job.title))
-        elif sort == 'title_desc':
-            query = query.order_by(desc(Job.title))
-        elif sort == 'company_asc':
-            query = query.order_by(asc(Job.company))
-        elif sort == 'company_desc':
-            query = query.order_by(desc(Job.company))
-        else:
-            query = query.order_by(desc(Job.posting_date))
-        
-        # PAGINATION SETUP
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
-        per_page = min(per_page, 100)
-        
-        jobs = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
+        page, per_page = get_page_args(request.args)
+        
+        # LIVE + ARCHIVED LISTING
+        if include_archived(request.args):
+            keys_stmt, count_stmt = combined_page_statements(request.args, page, per_page)
+            keys = db.session.execute(keys_stmt).all()
+            live_stmt, archived_stmt = entity_statements(keys)
+            jobs = db.session.scalars(live_stmt).all() + db.session.scalars(archived_stmt).all()
+            total = db.session.scalar(count_stmt)
+            return jsonify(pagination_payload(order_by_keys(keys, jobs), total, page, per_page, compact_profile(request.args))), 200
+        
+        # IN-MEMORY SNAPSHOT READ ENGINE
+        snapshot = get_snapshot()
+        result = snapshot.page(request.args, page, per_page) if snapshot else None
+        if result is not None:
+            job_ids, total = result
+            return jsonify(pagination_payload(load_page_jobs(job_ids), total, page, per_page, compact_profile(request.args))), 200
+        
+        # COUNT RUNS ON ITS OWN CONNECTION WHILE THE PAGE IS LOADED
+        conditions = build_filter_conditions(request.args)
+        count, = start_reads([count_statement(conditions)])
+        jobs = db.session.scalars(page_statement(conditions, get_sort_order(request.args), page, per_page)).all()
+        total = count.result()[0][0]
         
         # RETURN PAGINATED RESULTS
-        return jsonify({
-            'jobs': [job.to_dict() for job in jobs.items],
-            'total': jobs.total,
-            'page': jobs.page,
-            'pages': jobs.pages,
-            'per_page': jobs.per_page,
-            'has_next': jobs.has_next,
-            'has_prev': jobs.has_prev,
-            'total_pages': jobs.pages,
-            'current_page': jobs.page,
-            'items_per_page': jobs.per_page,
-            'total_items': jobs.total
-        }), 200
+        return jsonify(pagination_payload(jobs, total, page, per_page, compact_profile(request.args))), 200
         
     except Exception as e:
         return jsonify({'error': f'Failed to fetch jobs: {str(e)}'}), 500
 
 # API ENDPOINT - GET DYNAMIC FILTER OPTIONS
 @jobs_bp.route('/filter-options', methods=['GET'])
+@coalesced('filter_options')
 def get_filter_options():
     """Get available filter options based on current filters (dynamic cascading filters)"""
     try:
-        # EXTRACT CURRENT FILTER PARAMETERS
-        job_type = request.args.get('job_type')
-        location = request.args.get('location')
-        company = request.args.get('company')
-        tags = request.args.get('tags')
-        search = request.args.get('search')
-        
-        # DATE FILTER PARAMETERS
-        date_filter = request.args.get('date_filter')
-        custom_date_from = request.args.get('date_from')
-        custom_date_to = request.args.get('date_to')
-        
-        # BASE QUERY SETUP
-        base_query = Job.query
-        
-        # APPLY COMMON FILTERS TO BASE QUERY
-        if search:
-            search_term = f'%{search}%'
-            base_query = base_query.filter(
-                or_(
-                    Job.title.ilike(search_term),
-                    Job.company.ilike(search_term),
-                    Job.description.ilike(search_term)
-                )
-            )
-        
-        if tags:
-            tag_list = [tag.strip() for tag in tags.split(',')]
-            tag_conditions = [Job.tags.ilike(f'%{tag}%') for tag in tag_list]
-            base_query = base_query.filter(or_(*tag_conditions))
-        
-        # APPLY DATE FILTER TO BASE QUERY
-        if date_filter:
-            date_from, date_to = parse_date_filter(date_filter, custom_date_from, custom_date_to)
-            if date_from and date_to:
-                date_from_dt = datetime.combine(date_from, datetime.min.time())
-                date_to_dt = datetime.combine(date_to, datetime.max.time())
-                base_query = base_query.filter(and_(
-                    Job.posting_date >= date_from_dt,
-                    Job.posting_date <= date_to_dt
-                ))
-        
-        # BUILD SEPARATE QUERIES FOR EACH FILTER TYPE
-        # COMPANIES QUERY - EXCLUDE COMPANY FILTER
-        company_base_query = base_query
-        if location:
-            company_base_query = company_base_query.filter(Job.location.ilike(f'%{location}%'))
-        if job_type:
-            company_base_query = company_base_query.filter(Job.job_type == job_type)
-        
-        # LOCATIONS QUERY - EXCLUDE LOCATION FILTER
-        location_base_query = base_query
-        if company:
-            location_base_query = location_base_query.filter(Job.company.ilike(f'%{company}%'))
-        if job_type:
-            location_base_query = location_base_query.filter(Job.job_type == job_type)
-        
-        # JOB TYPES QUERY - EXCLUDE JOB TYPE FILTER
-        job_type_base_query = base_query
-        if company:
-            job_type_base_query = job_type_base_query.filter(Job.company.ilike(f'%{company}%'))
-        if location:
-            job_type_base_query = job_type_base_query.filter(Job.location.ilike(f'%{location}%'))
-        
-        # GET FILTER OPTIONS WITH COUNTS
-        companies_data = db.session.query(
-            Job.company,
-            db.func.count(Job.id).label('count')
-        ).filter(Job.id.in_(company_base_query.with_entities(Job.id))).group_by(Job.company).order_by(desc('count')).all()
+        # IN-MEMORY SNAPSHOT READ ENGINE
+        snapshot = get_snapshot()
+        options = snapshot.filter_options(request.args) if snapshot else None
+        if options is not None:
+            return jsonify(options), 200
+        
+        # EACH FACET EXCLUDES ITS OWN FILTER - THE THREE AGGREGATIONS RUN CONCURRENTLY
+        companies, locations, job_types = start_reads([
+            facet_statement(Job.company, build_filter_conditions(request.args, exclude=('company',))),
+            location_facet_statement(build_filter_conditions(request.args, exclude=('location',))),
+            facet_statement(Job.job_type, build_filter_conditions(request.args, exclude=('job_type',)))
+        ])
         
-        locations_data = db.session.query(
-            Job.location,
-            db.func.count(Job.id).label('count')
-        ).filter(Job.id.in_(location_base_query.with_entities(Job.id))).group_by(Job.location).order_by(desc('count')).all()
+        return jsonify({
+            'job_types': format_facet(job_types.result(), 'type'),
+            'companies': format_facet(companies.result(), 'company'),
+            'locations': format_facet(locations.result(), 'location')
+        }), 200
         
-        job_types_data = db.session.query(
-            Job.job_type,
-            db.func.count(Job.id).label('count')
-        ).filter(Job.id.in_(job_type_base_query.with_entities(Job.id))).group_by(Job.job_type).order_by(desc('count')).all()
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch filter options: {str(e)}'}), 500
+
+# API ENDPOINT - COMBINED SEARCH PAGE (RESULTS + TOTAL + FILTER OPTIONS)
+@jobs_bp.route('/search', methods=['GET'])
+@coalesced('search')
+def search_jobs():
+    """Get a page of jobs, the total and the cascading filter options in one round-trip"""
+    try:
+        page, per_page = get_page_args(request.args)
+        
+        # IN-MEMORY SNAPSHOT READ ENGINE
+        snapshot = get_snapshot()
+        result = snapshot.page(request.args, page, per_page) if snapshot else None
+        if result is not None:
+            job_ids, total = result
+            payload = pagination_payload(load_page_jobs(job_ids), total, page, per_page, compact_profile(request.args))
+            payload['filter_options'] = snapshot.filter_options(request.args)
+            return jsonify(payload), 200
+        
+        # ONE GROUP BY SCAN YIELDS THE TOTAL, COMPANY AND JOB TYPE FACETS
+        groups = db.session.execute(facet_groups_statement(request.args)).all()
+        total, filter_options = cascade_facets(groups, request.args)
+        filter_options['locations'] = format_facet(db.session.execute(location_facet_statement(
+            build_filter_conditions(request.args, exclude=('location',))
+        )).all(), 'location')
+        
+        jobs = []
+        if total:
+            jobs = db.session.scalars(page_statement(
+                build_filter_conditions(request.args), get_sort_order(request.args), page, per_page
+            )).all()
+        
+        payload = pagination_payload(jobs, total, page, per_page, compact_profile(request.args))
+        payload['filter_options'] = filter_options
+        return jsonify(payload), 200
         
-        # FORMAT RESULTS
-        filtered_companies = [
-            {'company': comp[0], 'count': comp[1]} 
-            for comp in companies_data 
-            if comp[0] and comp[0].strip() and comp[1] > 0
-        ]
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch search page: {str(e)}'}), 500
+
+# API ENDPOINT - JOBS PER POSTING DAY
+@jobs_bp.route('/date-histogram', methods=['GET'])
+def get_date_histogram():
+    """Get jobs per posting day from the daily rollup (optional job_type/company filters)"""
+    try:
+        days = request.args.get('days', 90, type=int)
+        days = max(1, min(days, 365))
         
-        filtered_locations = [
-            {'location': loc[0], 'count': loc[1]} 
-            for loc in locations_data 
-            if loc[0] and loc[0].strip() and loc[1] > 0
-        ]
+        buckets = date_histogram(days, request.args)
         
-        filtered_job_types = [
-            {'type': jt[0], 'count': jt[1]} 
-            for jt in job_types_data 
-            if jt[0] and jt[0].strip() and jt[1] > 0
-        ]
+        return jsonify({
+            'days': days,
+            'buckets': buckets,
+            'total': sum(bucket['count'] for bucket in buckets)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch date histogram: {str(e)}'}), 500
+
+# API ENDPOINT - COUNTS FOR PREDEFINED DATE FILTERS
+@jobs_bp.route('/date-counts', methods=['GET'])
+def get_date_counts():
+    """Get job counts for today / last_7_days / last_month from the daily rollup"""
+    try:
+        return jsonify(date_filter_counts(request.args)), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch date counts: {str(e)}'}), 500
+
+# API ENDPOINT - CHANGE FEED (DELTA SYNC)
+@jobs_bp.route('/changes', methods=['GET'])
+def get_changes():
+    """Get inserts, updates and delete tombstones after the `since` cursor (`since=latest` to start following)"""
+    try:
+        limit = max(1, min(request.args.get('limit', 500, type=int), 1000))
+        latest = current_seq()
+        
+        if request.args.get('since') == 'latest':
+            changes, cursor, has_more = [], latest, False
+        else:
+            changes, cursor, has_more = changes_since(request.args.get('since', 0, type=int), limit)
         
         return jsonify({
-            'job_types': filtered_job_types,
-            'companies': filtered_companies,
-            'locations': filtered_locations
+            'changes': changes,
+            'cursor': cursor,
+            'has_more': has_more,
+            'latest_seq': latest
         }), 200
         
+    except CursorExpired:
+        return jsonify({'error': EXPIRED_MESSAGE}), 410
     except Exception as e:
-        return jsonify({'error': f'Failed to fetch filter options: {str(e)}'}), 500
+        return jsonify({'error': f'Failed to fetch changes: {str(e)}'}), 500
+
+# API ENDPOINT - LIVE CHANGE STREAM (SERVER-SENT EVENTS)
+@jobs_bp.route('/changes/stream', methods=['GET'])
+def stream_changes():
+    """Push change feed entries as Server-Sent Events, resuming from Last-Event-ID or `since`"""
+    cursor = request.headers.get('Last-Event-ID', type=int)
+    if cursor is None:
+        cursor = request.args.get('since', type=int)
+    if cursor is None:
+        cursor = current_seq()
+    if cursor_expired(db.session, cursor):
+        return jsonify({'error': EXPIRED_MESSAGE}), 410
+    
+    poll_seconds = current_app.config['CHANGE_STREAM_POLL_SECONDS']
+    deadline = time.monotonic() + current_app.config['CHANGE_STREAM_MAX_SECONDS']
+    
+    def generate(cursor):
+        yield 'retry: 3000\n\n'
+        while time.monotonic() < deadline:
+            try:
+                changes, cursor, has_more = changes_since(cursor, 500)
+            except CursorExpired:
+                # Reconnecting would get a 410, so tell the client before ending the stream
+                yield format_expired()
+                return
+            # End the read transaction so the next poll sees new commits
+            db.session.rollback()
+            for change in changes:
+                yield format_event(change)
+            if not has_more:
+                yield ': keep-alive\n\n'
+                time.sleep(poll_seconds)
+    
+    # Streams end after CHANGE_STREAM_MAX_SECONDS; EventSource reconnects with Last-Event-ID
+    return Response(
+        stream_with_context(generate(cursor)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 # API ENDPOINT - GET SINGLE JOB BY ID
 @jobs_bp.route('/<int:job_id>', methods=['GET'])
 def get_job(job_id):
     """Get a single job by ID"""
     try:
-        job = Job.query.get(job_id)
+        # FALL BACK TO THE ARCHIVE FOR RETIRED POSTINGS
+        job = Job.query.get(job_id) or ArchivedJob.query.get(job_id)
         if not job:
             return jsonify({'error': 'Job not found'}), 404
             
@@ -258,6 +232,37 @@ def get_job(job_id):
     except Exception as e:
         return jsonify({'error': f'Failed to fetch job: {str(e)}'}), 500
 
+# API ENDPOINT - SIMILAR JOBS
+@jobs_bp.route('/<int:job_id>/similar', methods=['GET'])
+def get_similar_jobs(job_id):
+    """Jobs most similar to this one by title, tags, company and location (cosine over TF-IDF vectors)"""
+    try:
+        job = Job.query.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        try:
+            index = get_similar_index()
+        except IndexNotBuilt:
+            return jsonify({'error': 'Similar jobs index has not been built - run `flask --app app build-similar-index`'}), 503
+        except IndexOutOfDate:
+            return jsonify({'error': 'Similar jobs index is too far behind - run `flask --app app build-similar-index`'}), 503
+        if index is None:
+            return jsonify({'error': 'Similar jobs require numpy'}), 503
+        
+        limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+        matches = index.similar((job.title, job.company, job.location, job.tags), limit, exclude_id=job.id)
+        scores = dict(matches)
+        jobs = load_page_jobs([match_id for match_id, _ in matches])
+        
+        return jsonify({
+            'job_id': job.id,
+            'similar': [{**similar.to_dict(), 'similarity': round(scores[similar.id], 4)} for similar in jobs]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch similar jobs: {str(e)}'}), 500
+
 # API ENDPOINT - CREATE NEW JOB
 @jobs_bp.route('/', methods=['POST'])
 def create_job():
@@ -293,6 +298,17 @@ def create_job():
                 'existing_job_id': existing_job.id
             }), 409
         
+        # WRITE-BEHIND MODE - HAND THE JOB TO THE GROUP-COMMIT WRITER
+        write_queue = current_app.extensions.get('write_queue')
+        if write_queue is not None:
+            tracking_id = write_queue.submit(data)
+            status_url = f'{jobs_bp.url_prefix}/writes/{tracking_id}'
+            return jsonify({
+                'message': 'Job queued for creation',
+                'tracking_id': tracking_id,
+                'status_url': status_url
+            }), 202, {'Location': status_url}
+        
         # SAVE TO DATABASE
         db.session.add(job)
         db.session.commit()
@@ -302,10 +318,26 @@ def create_job():
             'job': job.to_dict()
         }), 201
         
+    except QueueFull:
+        retry_after = current_app.config['RETRY_AFTER_SECONDS']
+        return jsonify({'error': 'Write queue is full, please retry shortly'}), 429, {'Retry-After': str(retry_after)}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Failed to create job: {str(e)}'}), 500
 
+# API ENDPOINT - STATUS OF A QUEUED (WRITE-BEHIND) JOB CREATION
+@jobs_bp.route('/writes/<tracking_id>', methods=['GET'])
+def get_write_status(tracking_id):
+    """Report whether a queued job was created, was a duplicate or failed"""
+    try:
+        status = lookup_status(tracking_id)
+        if status is None:
+            # Jobs still queued on another worker are only known there until their batch commits
+            return jsonify({'error': 'Unknown tracking id'}), 404
+        return jsonify(status)
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch write status: {str(e)}'}), 500
+
 # API ENDPOINT - UPDATE EXISTING JOB
 @jobs_bp.route('/<int:job_id>', methods=['PUT'])
 def update_job(job_id):
@@ -382,8 +414,51 @@ def delete_job(job_id):
         db.session.rollback()
         return jsonify({'error': f'Failed to delete job: {str(e)}'}), 500
 
+# API ENDPOINT - BULK UPDATE BY IDS OR FILTERS
+@jobs_bp.route('/bulk', methods=['PATCH'])
+def bulk_update_jobs():
+    """Update many jobs at once: {"ids": [...]} or {"filters": {...}}, plus {"changes": {...}}"""
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    try:
+        ids, filters = parse_selection(data)
+        values = parse_changes(data.get('changes'))
+    except ValueError as e:
+        return jsonify({'error': 'Validation failed', 'details': [str(e)]}), 400
+    
+    try:
+        updated = bulk_update(ids, filters, values, current_app.config['BULK_BATCH_SIZE'])
+        return jsonify({'message': 'Jobs updated successfully', 'updated': updated}), 200
+        
+    except BulkOperationError as e:
+        status = 409 if isinstance(e.cause, IntegrityError) else 500
+        return jsonify({'error': f'Failed to update jobs: {str(e.cause)}', 'updated': e.completed}), status
+
+# API ENDPOINT - BULK DELETE BY IDS OR FILTERS
+@jobs_bp.route('/bulk', methods=['DELETE'])
+def bulk_delete_jobs():
+    """Delete many jobs at once: {"ids": [...]} or {"filters": {...}}"""
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    try:
+        ids, filters = parse_selection(data)
+    except ValueError as e:
+        return jsonify({'error': 'Validation failed', 'details': [str(e)]}), 400
+    
+    try:
+        deleted = bulk_delete(ids, filters, current_app.config['BULK_BATCH_SIZE'])
+        return jsonify({'message': 'Jobs deleted successfully', 'deleted': deleted}), 200
+        
+    except BulkOperationError as e:
+        return jsonify({'error': f'Failed to delete jobs: {str(e.cause)}', 'deleted': e.completed}), 500
+
 # API ENDPOINT - GET JOB STATISTICS
 @jobs_bp.route('/stats', methods=['GET'])
+@coalesced('stats')
 def get_job_stats():
     """Get job statistics for dashboard and initial filter dropdowns"""
     try:
@@ -396,10 +471,9 @@ def get_job_stats():
         ).group_by(Job.job_type).order_by(desc('count')).all()
         
         # GET ALL LOCATIONS WITH COUNTS
-        all_locations_with_counts = db.session.query(
-            Job.location,
-            db.func.count(Job.id).label('count')
-        ).group_by(Job.location).order_by(desc('count'), Job.location).all()
+        all_locations_with_counts = db.session.execute(
+            location_facet_statement([]).order_by(None).order_by(desc('count'), 'location')
+        ).all()
         
         # GET ALL COMPANIES WITH COUNTS
         all_companies_with_counts = db.session.query(
@@ -434,18 +508,25 @@ def get_job_stats():
         total_companies = len(filtered_companies)
         total_locations = len(filtered_locations)
         
-        return jsonify({
+        stats = {
             'total_jobs': total_jobs,
             'total_companies': total_companies,
             'total_locations': total_locations,
             'all_companies_with_counts': filtered_companies,
             'all_locations_with_counts': filtered_locations,
-            'job_types': filtered_job_types,
-            'top_locations': top_locations,
-            'top_companies': top_companies,
-            'all_companies': [comp['company'] for comp in filtered_companies],
-            'all_locations': [loc['location'] for loc in filtered_locations]
-        }), 200
+            'job_types': filtered_job_types
+        }
+        
+        # COMPACT PROFILE - TOP LISTS AND NAME-ONLY LISTS ARE SLICES OF THE COUNTED LISTS
+        if not compact_profile(request.args):
+            stats.update({
+                'top_locations': top_locations,
+                'top_companies': top_companies,
+                'all_companies': [comp['company'] for comp in filtered_companies],
+                'all_locations': [loc['location'] for loc in filtered_locations]
+            })
+        
+        return jsonify(stats), 200
         
     except Exception as e:
         return jsonify({'error': f'Failed to fetch stats: {str(e)}'}), 500
\ No newline at end of file
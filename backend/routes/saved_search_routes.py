@@ -0,0 +1,104 @@
+# backend/routes/saved_search_routes.py
+from flask import Blueprint, request, jsonify
+from models.job import Job
+from models.archived_job import ArchivedJob
+from models.saved_search import SavedSearch
+from models.notification import Notification
+from db import db
+
+saved_searches_bp = Blueprint('saved_searches', __name__, url_prefix='/api/saved-searches')
+
+# API ENDPOINT - LIST SAVED SEARCHES
+@saved_searches_bp.route('/', methods=['GET'])
+def get_saved_searches():
+    """List saved searches, newest first"""
+    try:
+        searches = SavedSearch.query.order_by(SavedSearch.id.desc()).all()
+        return jsonify({'saved_searches': [search.to_dict() for search in searches]}), 200
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch saved searches: {str(e)}'}), 500
+
+# API ENDPOINT - CREATE SAVED SEARCH
+@saved_searches_bp.route('/', methods=['POST'])
+def create_saved_search():
+    """Save get_jobs filters ({"name": ..., "params": {"job_type", "location", "company", "tags", "search"}})"""
+    try:
+        data = request.get_json(silent=True) or {}
+        params = {
+            key: str(value).strip()
+            for key, value in (data.get('params') or {}).items()
+            if key in SavedSearch.PARAMS and value is not None and str(value).strip()
+        }
+
+        errors = []
+        if not data.get('name'):
+            errors.append('Name is required')
+        if not params:
+            errors.append(f'At least one of {", ".join(SavedSearch.PARAMS)} is required')
+        if params.get('job_type') and params['job_type'] not in Job.VALID_JOB_TYPES:
+            errors.append(f'Job type must be one of: {", ".join(Job.VALID_JOB_TYPES)}')
+        if errors:
+            return jsonify({'error': 'Validation failed', 'details': errors}), 400
+
+        search = SavedSearch(name=data['name'], params=params)
+        db.session.add(search)
+        db.session.commit()
+
+        return jsonify({
+            'message': 'Saved search created successfully',
+            'saved_search': search.to_dict()
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to create saved search: {str(e)}'}), 500
+
+# API ENDPOINT - DELETE SAVED SEARCH
+@saved_searches_bp.route('/<int:search_id>', methods=['DELETE'])
+def delete_saved_search(search_id):
+    """Delete a saved search and its notifications"""
+    try:
+        search = SavedSearch.query.get(search_id)
+        if not search:
+            return jsonify({'error': 'Saved search not found'}), 404
+
+        # SQLite does not enforce the cascade unless foreign keys are switched on
+        Notification.query.filter_by(saved_search_id=search_id).delete()
+        db.session.delete(search)
+        db.session.commit()
+
+        return jsonify({'message': 'Saved search deleted successfully'}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to delete saved search: {str(e)}'}), 500
+
+# API ENDPOINT - NOTIFICATIONS FOR A SAVED SEARCH
+@saved_searches_bp.route('/<int:search_id>/notifications', methods=['GET'])
+def get_notifications(search_id):
+    """New jobs that matched the saved search after the `since` notification id"""
+    try:
+        if not SavedSearch.query.get(search_id):
+            return jsonify({'error': 'Saved search not found'}), 404
+
+        since = request.args.get('since', 0, type=int)
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        notifications = Notification.query.filter(
+            Notification.saved_search_id == search_id,
+            Notification.id > since
+        ).order_by(Notification.id).limit(limit).all()
+
+        # Archived jobs keep their notifications, so look them up like GET /api/jobs/<id> does
+        job_ids = [notification.job_id for notification in notifications]
+        jobs = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids)).all()} if job_ids else {}
+        archived_ids = [job_id for job_id in job_ids if job_id not in jobs]
+        if archived_ids:
+            jobs.update({job.id: job for job in ArchivedJob.query.filter(ArchivedJob.id.in_(archived_ids)).all()})
+
+        return jsonify({
+            'notifications': [notification.to_dict(jobs.get(notification.job_id)) for notification in notifications],
+            'cursor': notifications[-1].id if notifications else since
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch notifications: {str(e)}'}), 500
@@ -0,0 +1,340 @@
+# backend/similar_index.py
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import zlib
+from flask import current_app
+from sqlalchemy import select, func
+from db import db
+from models.job import Job
+from models.job_change import JobChange
+from locations import split_locations
+from change_log import cursor_expired
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the similar jobs endpoint
+    np = None
+
+# Hashed feature space and per-field weights of the job vectors
+DIMENSIONS = 2 ** 18
+FIELD_WEIGHTS = {'title': 1.0, 'tag': 1.0, 'company': 0.8, 'location': 0.5}
+TOKEN = re.compile(r'[^\W_]+')
+
+class IndexNotBuilt(Exception):
+    """No index version has been built yet - `flask --app app build-similar-index` builds one"""
+
+class IndexOutOfDate(Exception):
+    """The index is too far behind the change log (delta over its cap, or replay entries pruned) - it needs a rebuild"""
+
+ARRAYS = ('ids', 'indptr', 'indices', 'data', 'postings_indptr', 'postings_rows', 'postings_data', 'idf')
+
+# FEATURES
+def job_terms(title, company, location, tags):
+    """{term: field weight} for a job; tokens are prefixed with their field"""
+    terms = {}
+    for token in TOKEN.findall((title or '').lower()):
+        terms[f'title:{token}'] = FIELD_WEIGHTS['title']
+    for tag in (tags or '').split(','):
+        if tag.strip():
+            terms[f'tag:{tag.strip().lower()}'] = FIELD_WEIGHTS['tag']
+    if company:
+        terms[f'company:{company.strip().lower()}'] = FIELD_WEIGHTS['company']
+    for name in split_locations(location, tags):
+        terms[f'location:{name.lower()}'] = FIELD_WEIGHTS['location']
+    return terms
+
+def hashed_features(terms):
+    """(feature indices, raw weights) with colliding terms summed; crc32 is stable across processes"""
+    weights = {}
+    for term, weight in terms.items():
+        feature = zlib.crc32(term.encode('utf-8')) % DIMENSIONS
+        weights[feature] = weights.get(feature, 0.0) + weight
+    features = sorted(weights)
+    return np.array(features, dtype=np.int32), np.array([weights[f] for f in features], dtype=np.float32)
+
+def vectorize(row, idf):
+    """L2-normalized TF-IDF vector of a (title, company, location, tags) row"""
+    features, weights = hashed_features(job_terms(*row))
+    weights = weights * idf[features]
+    norm = float(np.sqrt(np.dot(weights, weights)))
+    return features, (weights / norm if norm else weights)
+
+def sparse_dots(query_features, query_weights, indptr, indices, data, rows):
+    """Dot products of a sorted sparse query vector with the given CSR rows"""
+    starts, ends = indptr[rows], indptr[rows + 1]
+    lengths = (ends - starts).astype(np.int64)
+    total = int(lengths.sum())
+    if not total:
+        return np.zeros(len(rows), dtype=np.float32)
+
+    # Positions of every entry of the selected rows, row after row
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+    features, weights = indices[offsets], data[offsets]
+    positions = np.searchsorted(query_features, features).clip(max=len(query_features) - 1)
+    contributions = np.where(query_features[positions] == features, query_weights[positions] * weights, 0)
+    return np.bincount(np.repeat(np.arange(len(rows)), lengths), weights=contributions, minlength=len(rows))
+
+# BUILD
+def build_index(directory, batch_size=5000):
+    """Vectorize every job into a new index version under directory and make it current.
+
+    Rows are stored in id order as CSR (for exact scoring) and CSC (posting
+    lists per feature, for candidate generation), each array in its own .npy
+    file so processes can memory-map them. Returns the number of jobs indexed.
+    """
+    built_seq = db.session.scalar(select(func.coalesce(func.max(JobChange.seq), 0)))
+    ids, lengths, features, weights = [], [], [], []
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(Job.id, Job.title, Job.company, Job.location, Job.tags)
+            .where(Job.id > last_id).order_by(Job.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            row_features, row_weights = hashed_features(job_terms(*row[1:]))
+            ids.append(row[0])
+            lengths.append(len(row_features))
+            features.append(row_features)
+            weights.append(row_weights)
+        last_id = rows[-1][0]
+
+    count = len(ids)
+    indices = np.concatenate(features) if features else np.zeros(0, dtype=np.int32)
+    data = np.concatenate(weights) if weights else np.zeros(0, dtype=np.float32)
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+
+    # Smoothed IDF; features first seen after the build get the highest weight
+    df = np.bincount(indices, minlength=DIMENSIONS)
+    idf = (np.log((1 + count) / (1 + df)) + 1).astype(np.float32)
+    data = data * idf[indices]
+    row_of_entry = np.repeat(np.arange(count, dtype=np.int32), lengths)
+    norms = np.sqrt(np.bincount(row_of_entry, weights=data * data, minlength=count))
+    data = (data / np.where(norms > 0, norms, 1)[row_of_entry]).astype(np.float32)
+
+    order = np.argsort(indices, kind='stable')
+    postings_indptr = np.zeros(DIMENSIONS + 1, dtype=np.int64)
+    np.cumsum(df, out=postings_indptr[1:])
+
+    arrays = {
+        'ids': np.array(ids, dtype=np.int64),
+        'indptr': indptr,
+        'indices': indices,
+        'data': data,
+        'postings_indptr': postings_indptr,
+        'postings_rows': row_of_entry[order],
+        'postings_data': data[order],
+        'idf': idf
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    version = f'v{built_seq}-{int(time.time() * 1000)}'
+    path = os.path.join(directory, version)
+    os.makedirs(path)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f'{name}.npy'), array)
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump({'built_seq': built_seq, 'count': count, 'dimensions': DIMENSIONS, 'built_at': datetime.utcnow().isoformat()}, f)
+
+    # Swap the CURRENT pointer atomically; mapped files of older versions stay valid until unmapped
+    pointer = os.path.join(directory, 'CURRENT')
+    previous = read_version(directory)
+    with open(f'{pointer}.{version}.tmp', 'w') as f:
+        f.write(version)
+    os.replace(f'{pointer}.{version}.tmp', pointer)
+
+    # Keep the version just replaced: a worker may have read CURRENT before the swap and not opened it yet
+    if previous is not None:
+        for name in os.listdir(directory):
+            if name.startswith('v') and name not in (version, previous) and built_at(name) < built_at(previous):
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+    return count
+
+def built_at(version):
+    """Build time in milliseconds from a version name (v<seq>-<ms>)"""
+    return int(version.rsplit('-', 1)[-1])
+
+def read_version(directory):
+    """Version CURRENT points to, or None before the first build"""
+    try:
+        with open(os.path.join(directory, 'CURRENT')) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+# QUERY
+class SimilarIndex:
+    """Memory-mapped job vectors plus an in-memory delta of jobs changed since the build.
+
+    Writes are picked up from the job_changes log, so every process applies
+    the same changes to its delta without touching the shared files.
+    """
+    def __init__(self, directory, max_postings, candidates, max_delta):
+        self.directory = directory
+        self.max_postings = max_postings
+        self.candidates = candidates
+        self.max_delta = max_delta
+        self.lock = threading.RLock()
+        self.last_checked = 0.0
+        self.version = None
+        self.arrays = None
+
+    def open(self, version):
+        path = os.path.join(self.directory, version)
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        self.arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in ARRAYS}
+        self.version = version
+        self.seq = meta['built_seq']
+        self.delta = {}
+        self.superseded = set()
+        self.stale_rows = np.zeros(0, dtype=np.int64)
+        self.delta_arrays = None
+
+    def refresh(self, session):
+        """Reopen a newer build and apply changes logged since the one in use.
+
+        Requests never build the index themselves: building takes a full scan of
+        the jobs table, so it is left to `flask --app app build-similar-index`.
+        """
+        with self.lock:
+            version = read_version(self.directory)
+            if version is None:
+                raise IndexNotBuilt()
+            if version != self.version:
+                try:
+                    self.open(version)
+                except FileNotFoundError:
+                    # Two builds in a row replaced and removed it since CURRENT was read
+                    self.open(read_version(self.directory))
+
+            # Every delta row is scored on every request, so past max_delta changed jobs a rebuild is required;
+            # replay starts at the build's seq and stops early instead of reading the whole backlog
+            if cursor_expired(session, self.seq):
+                # Changes since the build were pruned from the log, so only a rebuild can catch up
+                raise IndexOutOfDate()
+            pending = session.scalars(
+                select(JobChange.job_id).where(JobChange.seq > self.seq).distinct().limit(self.max_delta + 1)
+            ).all()
+            if len(self.superseded.union(pending)) > self.max_delta:
+                raise IndexOutOfDate()
+
+            changed = {}
+            for seq, job_id, op in session.execute(
+                select(JobChange.seq, JobChange.job_id, JobChange.op).where(JobChange.seq > self.seq).order_by(JobChange.seq)
+            ):
+                changed[job_id] = op
+                self.seq = seq
+            if not changed:
+                return
+
+            live_ids = [job_id for job_id, op in changed.items() if op != 'delete']
+            rows = session.execute(
+                select(Job.id, Job.title, Job.company, Job.location, Job.tags).where(Job.id.in_(live_ids))
+            ).all() if live_ids else []
+            self.superseded.update(changed)
+            for job_id in changed:
+                self.delta.pop(job_id, None)
+            for row in rows:
+                self.delta[row[0]] = vectorize(row[1:], self.arrays['idf'])
+
+            # Base rows of changed or deleted jobs are superseded by the delta
+            ids = self.arrays['ids']
+            superseded = np.array(sorted(changed), dtype=np.int64)
+            positions = np.searchsorted(ids, superseded).clip(max=max(len(ids) - 1, 0))
+            found = positions[ids[positions] == superseded] if len(ids) else positions[:0]
+            self.stale_rows = np.union1d(self.stale_rows, found)
+            self.delta_arrays = None
+
+    def refresh_if_stale(self, session, interval):
+        if self.version is None or time.monotonic() - self.last_checked >= interval:
+            self.refresh(session)
+            self.last_checked = time.monotonic()
+
+    def delta_matrix(self):
+        """Delta vectors as (ids, CSR arrays), rebuilt after the delta changes"""
+        if self.delta_arrays is None:
+            ids = np.array(list(self.delta), dtype=np.int64)
+            vectors = list(self.delta.values())
+            indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+            np.cumsum([len(features) for features, _ in vectors], out=indptr[1:])
+            indices = np.concatenate([features for features, _ in vectors]) if vectors else np.zeros(0, dtype=np.int32)
+            data = np.concatenate([weights for _, weights in vectors]) if vectors else np.zeros(0, dtype=np.float32)
+            self.delta_arrays = (ids, indptr, indices, data)
+        return self.delta_arrays
+
+    def base_candidates(self, query_features, query_weights):
+        """Rows sharing the query's rarer features, ranked by their partial score"""
+        postings_indptr = self.arrays['postings_indptr']
+        starts, ends = postings_indptr[query_features], postings_indptr[query_features + 1]
+
+        # Common features add little to the cosine but cost the most to scan
+        rows, weights, budget = [], [], self.max_postings
+        for i in np.argsort(ends - starts, kind='stable'):
+            size = int(ends[i] - starts[i])
+            if not size or (rows and size > budget):
+                continue
+            rows.append(self.arrays['postings_rows'][starts[i]:ends[i]])
+            weights.append(self.arrays['postings_data'][starts[i]:ends[i]] * query_weights[i])
+            budget -= size
+        if not rows:
+            return np.zeros(0, dtype=np.int64)
+
+        unique_rows, inverse = np.unique(np.concatenate(rows), return_inverse=True)
+        partial = np.bincount(inverse, weights=np.concatenate(weights))
+        if len(self.stale_rows):
+            partial[np.isin(unique_rows, self.stale_rows)] = 0
+        if len(unique_rows) > self.candidates:
+            top = np.argpartition(-partial, self.candidates)[:self.candidates]
+            unique_rows, partial = unique_rows[top], partial[top]
+        return unique_rows[partial > 0].astype(np.int64)
+
+    def similar(self, row, limit, exclude_id=None):
+        """Top (job id, cosine) pairs for a (title, company, location, tags) row"""
+        with self.lock:
+            query_features, query_weights = vectorize(row, self.arrays['idf'])
+            if not len(query_features):
+                return []
+
+            rows = self.base_candidates(query_features, query_weights)
+            arrays = self.arrays
+            base_scores = sparse_dots(query_features, query_weights, arrays['indptr'], arrays['indices'], arrays['data'], rows)
+            delta_ids, indptr, indices, data = self.delta_matrix()
+            delta_scores = sparse_dots(query_features, query_weights, indptr, indices, data, np.arange(len(delta_ids)))
+
+            ids = np.concatenate([arrays['ids'][rows], delta_ids])
+            scores = np.concatenate([base_scores, delta_scores])
+            keep = (scores > 0) & (ids != (exclude_id if exclude_id is not None else -1))
+            ids, scores = ids[keep], scores[keep]
+
+            if len(ids) > limit:
+                top = np.argpartition(-scores, limit)[:limit]
+                ids, scores = ids[top], scores[top]
+            order = np.lexsort((ids, -scores))
+            return [(int(ids[i]), float(scores[i])) for i in order]
+
+# APP INTEGRATION
+def index_directory(app):
+    return app.config['SIMILAR_INDEX_DIR'] or os.path.join(app.instance_path, 'similar_index')
+
+def get_similar_index():
+    """Return the refreshed index for the current app, or None without numpy; raises IndexNotBuilt or IndexOutOfDate"""
+    if np is None:
+        return None
+    index = current_app.extensions.get('similar_index')
+    if index is None:
+        index = current_app.extensions.setdefault('similar_index', SimilarIndex(
+            index_directory(current_app),
+            current_app.config['SIMILAR_MAX_POSTINGS'],
+            current_app.config['SIMILAR_CANDIDATES'],
+            current_app.config['SIMILAR_MAX_DELTA']
+        ))
+    index.refresh_if_stale(db.session, current_app.config['SIMILAR_REFRESH_SECONDS'])
+    return index
@@ -0,0 +1,384 @@
+# backend/snapshot.py
+import threading
+import time
+from flask import current_app
+from sqlalchemy import select, func, desc
+from db import db
+from models.job import Job
+from models.job_change import JobChange
+from query_builder import (
+    FACET_FILTERS, SORT_OPTIONS, parse_date_filter, ilike_matcher, location_matcher, include_archived, format_facet
+)
+from locations import split_locations
+from change_log import cursor_expired
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed when READ_ENGINE=snapshot
+    np = None
+
+SNAPSHOT_COLUMNS = (
+    Job.id, Job.title, Job.company, Job.location, Job.job_type, Job.posting_date, Job.tags
+)
+# Facets with one value per job; location is multi-valued
+SINGLE_FACETS = ('company', 'job_type')
+FACET_KEYS = {'company': 'company', 'location': 'location', 'job_type': 'type'}
+FACET_RESPONSE_KEYS = {'company': 'companies', 'location': 'locations', 'job_type': 'job_types'}
+
+class Dictionary:
+    """Dictionary encoding: each distinct string gets a small integer code"""
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def matching(self, predicate):
+        """Boolean lookup table over codes, so rows can be matched with a single gather"""
+        table = np.zeros(max(len(self.values), 1), dtype=bool)
+        for code, value in enumerate(self.values):
+            table[code] = predicate(value)
+        return table
+
+class JobSnapshot:
+    """Columnar in-memory copy of the jobs table for filtering and faceting.
+
+    company and job_type are dictionary-encoded int32 columns, canonical
+    locations are per-slot code tuples flattened into (slot, code) pairs on
+    demand, tags are one packed bitset per distinct tag and posting_date is a
+    datetime64 column with a cached sort order. Rows live in fixed slots;
+    updates overwrite their slot and deletes clear the alive bit.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.last_checked = 0.0
+        self.reset()
+
+    def reset(self):
+        self.size = 0
+        self.capacity = 0
+        self.slots = {}
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.posting = np.zeros(0, dtype='datetime64[us]')
+        self.codes = {name: np.zeros(0, dtype=np.int32) for name in SINGLE_FACETS}
+        self.dictionaries = {name: Dictionary() for name in SINGLE_FACETS}
+        self.locations = Dictionary()
+        self.slot_locations = []
+        self.location_pairs = None
+        self.titles = []
+        self.tags = Dictionary()
+        self.tag_bits = []
+        self.slot_tags = []
+        self.orders = {}
+        self.loaded = False
+        self.change_seq = 0
+
+    # STORAGE
+    def grow(self, needed):
+        if needed <= self.capacity:
+            return
+        capacity = max(1024, self.capacity * 2)
+        while capacity < needed:
+            capacity *= 2
+
+        def resized(array, length):
+            grown = np.zeros(length, dtype=array.dtype)
+            grown[:len(array)] = array
+            return grown
+
+        self.ids = resized(self.ids, capacity)
+        self.alive = resized(self.alive, capacity)
+        self.posting = resized(self.posting, capacity)
+        self.codes = {name: resized(codes, capacity) for name, codes in self.codes.items()}
+        self.tag_bits = [resized(bits, capacity // 8) for bits in self.tag_bits]
+        self.capacity = capacity
+
+    def set_tag_bit(self, tag_code, slot, value):
+        byte, mask = slot >> 3, 0x80 >> (slot & 7)
+        if value:
+            self.tag_bits[tag_code][byte] |= mask
+        else:
+            self.tag_bits[tag_code][byte] &= ~mask & 0xFF
+
+    def store(self, row):
+        job_id, title, company, location, job_type, posting_date, tags = row
+        slot = self.slots.get(job_id)
+        if slot is None:
+            slot = self.slots[job_id] = self.size
+            self.size += 1
+            self.grow(self.size)
+            self.titles.append(title)
+            self.slot_tags.append(())
+            self.slot_locations.append(())
+        else:
+            self.titles[slot] = title
+
+        self.ids[slot] = job_id
+        self.alive[slot] = True
+        self.posting[slot] = np.datetime64(posting_date, 'us')
+        for name, value in (('company', company), ('job_type', job_type)):
+            self.codes[name][slot] = self.dictionaries[name].encode(value)
+        # Same split as the job_locations table, so no extra query is needed
+        self.slot_locations[slot] = tuple(self.locations.encode(name) for name in split_locations(location, tags))
+        self.location_pairs = None
+
+        # Tags match like the SQL ilike over the comma-joined string, so keep raw pieces
+        for tag_code in self.slot_tags[slot]:
+            self.set_tag_bit(tag_code, slot, False)
+        tag_codes = tuple({self.tags.encode(tag) for tag in tags.split(',')}) if tags is not None else ()
+        while len(self.tag_bits) < len(self.tags.values):
+            self.tag_bits.append(np.zeros(self.capacity // 8, dtype=np.uint8))
+        for tag_code in tag_codes:
+            self.set_tag_bit(tag_code, slot, True)
+        self.slot_tags[slot] = tag_codes
+
+    def pairs(self):
+        """Flattened (slots, location codes) arrays, rebuilt after rows change"""
+        if self.location_pairs is None:
+            slots = [slot for slot, codes in enumerate(self.slot_locations) for _ in codes]
+            codes = [code for codes in self.slot_locations for code in codes]
+            self.location_pairs = (np.array(slots, dtype=np.int64), np.array(codes, dtype=np.int32))
+        return self.location_pairs
+
+    # REFRESH
+    # Both take a session or connection; the app passes a primary connection so a lagging
+    # replica can never move change_seq past changes the snapshot has not seen
+    def latest_seq(self, connection):
+        return connection.scalar(select(func.coalesce(func.max(JobChange.seq), 0)))
+
+    def load(self, connection):
+        """Rebuild the snapshot from scratch"""
+        self.reset()
+        # Read the log position first, so changes committed while loading are applied by the next refresh
+        change_seq = self.latest_seq(connection)
+        for row in connection.execute(select(*SNAPSHOT_COLUMNS)):
+            self.store(row)
+        self.change_seq = change_seq
+        self.loaded = True
+        self.orders = {}
+
+    def remove(self, job_id):
+        slot = self.slots.get(job_id)
+        if slot is not None:
+            self.alive[slot] = False
+
+    def refresh(self, connection, batch_size=5000):
+        """Apply every job_changes entry logged since the last refresh.
+
+        The log is read by seq, which is commit order (see changes_since), so a
+        write is never skipped however late it commits. Inserted and updated
+        jobs are re-read; deleted, archived or since-vanished jobs are dropped.
+        """
+        with self.lock:
+            # Entries it has not applied were pruned from the log (flask prune-changes)
+            if not self.loaded or cursor_expired(connection, self.change_seq):
+                self.load(connection)
+                return
+
+            change_seq = self.latest_seq(connection)
+            if change_seq <= self.change_seq:
+                return
+            latest = dict(connection.execute(
+                select(JobChange.job_id, JobChange.op)
+                .where(JobChange.seq > self.change_seq, JobChange.seq <= change_seq).order_by(JobChange.seq)
+            ).all())
+
+            live_ids = [job_id for job_id, op in latest.items() if op != 'delete']
+            found = set()
+            for start in range(0, len(live_ids), batch_size):
+                for row in connection.execute(select(*SNAPSHOT_COLUMNS).where(Job.id.in_(live_ids[start:start + batch_size]))):
+                    self.store(row)
+                    found.add(row[0])
+            for job_id in latest:
+                if job_id not in found:
+                    self.remove(job_id)
+
+            self.change_seq = change_seq
+            self.orders = {}
+
+    def refresh_if_stale(self, engine, interval):
+        if time.monotonic() - self.last_checked >= interval:
+            with engine.connect() as connection:
+                self.refresh(connection)
+            self.last_checked = time.monotonic()
+
+    # FILTER EVALUATION
+    def supports(self, args):
+        """Full-text search and archived rows are not held in the snapshot"""
+        return not args.get('search') and not include_archived(args)
+
+    def facet_mask(self, name, value):
+        if name == 'location':
+            slots, codes = self.pairs()
+            mask = np.zeros(self.size, dtype=bool)
+            mask[slots[self.locations.matching(location_matcher(value))[codes]]] = True
+            return mask
+        codes = self.codes[name][:self.size]
+        if name == 'job_type':
+            code = self.dictionaries[name].codes.get(value)
+            return codes == code if code is not None else np.zeros(self.size, dtype=bool)
+        return self.dictionaries[name].matching(ilike_matcher(value))[codes]
+
+    def base_mask(self, args):
+        """Mask for every filter except the three facet filters"""
+        mask = self.alive[:self.size].copy()
+
+        tags = args.get('tags')
+        if tags:
+            matchers = [ilike_matcher(tag.strip()) for tag in tags.split(',')]
+            packed = np.zeros(self.capacity // 8, dtype=np.uint8)
+            for tag_code, tag in enumerate(self.tags.values):
+                if any(matches(tag) for matches in matchers):
+                    packed |= self.tag_bits[tag_code]
+            mask &= np.unpackbits(packed)[:self.size].astype(bool)
+
+        date_filter = args.get('date_filter')
+        if date_filter:
+            date_from, date_to = parse_date_filter(date_filter, args.get('date_from'), args.get('date_to'))
+            if date_from and date_to:
+                posting = self.posting[:self.size]
+                mask &= posting >= np.datetime64(datetime.combine(date_from, datetime.min.time()), 'us')
+                mask &= posting <= np.datetime64(datetime.combine(date_to, datetime.max.time()), 'us')
+
+        return mask
+
+    def facet_masks(self, args):
+        return {name: self.facet_mask(name, args.get(name)) for name in FACET_FILTERS if args.get(name)}
+
+    def order(self, name):
+        """Cached ascending slot order for a sort column"""
+        if name not in self.orders:
+            if name == 'posting_date':
+                self.orders[name] = np.argsort(self.posting[:self.size], kind='stable')
+            elif name == 'title':
+                self.orders[name] = np.array(sorted(range(self.size), key=self.titles.__getitem__), dtype=np.int64)
+            else:
+                values = self.dictionaries[name].values
+                ranks = np.zeros(max(len(values), 1), dtype=np.int64)
+                ranks[sorted(range(len(values)), key=values.__getitem__)] = np.arange(len(values))
+                self.orders[name] = np.argsort(ranks[self.codes[name][:self.size]], kind='stable')
+        return self.orders[name]
+
+    # QUERIES
+    def page(self, args, page, per_page):
+        """Return (job ids for the page, total) or None if the filters are not supported"""
+        if not self.supports(args):
+            return None
+        with self.lock:
+            mask = self.base_mask(args)
+            for facet in self.facet_masks(args).values():
+                mask &= facet
+
+            name, direction = SORT_OPTIONS.get(args.get('sort', 'posting_date_desc'), SORT_OPTIONS['posting_date_desc'])
+            order = self.order(name)
+            selected = order[mask[order]]
+            if direction is desc:
+                selected = selected[::-1]
+
+            start = (page - 1) * per_page
+            return self.ids[selected[start:start + per_page]].tolist(), int(len(selected))
+
+    def filter_options(self, args):
+        """Cascading facet counts, each facet ignoring its own filter"""
+        if not self.supports(args):
+            return None
+        with self.lock:
+            base = self.base_mask(args)
+            masks = self.facet_masks(args)
+            options = {}
+            for name in FACET_FILTERS:
+                mask = base.copy()
+                for other, facet in masks.items():
+                    if other != name:
+                        mask &= facet
+                if name == 'location':
+                    values = self.locations.values
+                    slots, codes = self.pairs()
+                    counts = np.bincount(codes[mask[slots]], minlength=len(values))
+                else:
+                    values = self.dictionaries[name].values
+                    counts = np.bincount(self.codes[name][:self.size][mask], minlength=len(values))
+                ranked = sorted(zip(values, counts.tolist()), key=lambda item: item[1], reverse=True)
+                options[FACET_RESPONSE_KEYS[name]] = format_facet(ranked, FACET_KEYS[name])
+            return options
+
+# PARITY CHECK AGAINST THE SQL PATH
+def parity_cases(snapshot):
+    """Filter combinations built from values actually present in the snapshot"""
+    companies = [value for value in snapshot.dictionaries['company'].values if value][:5]
+    locations = [value for value in snapshot.locations.values if value][:5]
+    job_types = snapshot.dictionaries['job_type'].values[:3]
+    tags = [value.strip() for value in snapshot.tags.values if value.strip()][:5]
+
+    cases = [{}, {'date_filter': 'last_month'}, {'date_filter': 'custom', 'date_from': '2020-01-01', 'date_to': '2030-12-31'}]
+    cases += [{'company': value[:4].lower()} for value in companies]
+    cases += [{'location': value[:5]} for value in locations]
+    cases += [{'location': alias} for alias in ('nyc', 'remote')]
+    cases += [{'job_type': value} for value in job_types + ['Nonexistent']]
+    cases += [{'tags': ','.join(tags[i:i + 2])} for i in range(0, len(tags), 2)]
+    for sort in SORT_OPTIONS:
+        for company, location, job_type, tag in zip(companies, locations, job_types, tags):
+            cases.append({'company': company[:3], 'location': location[:3], 'job_type': job_type, 'tags': tag, 'sort': sort})
+            cases.append({'location': location[:2], 'tags': tag[:2], 'sort': sort})
+    return cases
+
+def check_parity(snapshot, session, cases):
+    """Compare snapshot results with the SQL path, returning a list of mismatch descriptions"""
+    from werkzeug.datastructures import MultiDict
+    from query_builder import build_filter_conditions, get_sort_order, facet_statement_for
+
+    mismatches = []
+    for case in cases:
+        args = MultiDict(case)
+        conditions = build_filter_conditions(args)
+        name = SORT_OPTIONS.get(args.get('sort', 'posting_date_desc'), SORT_OPTIONS['posting_date_desc'])[0]
+
+        # Ties make row order ambiguous, so compare the sort key sequence and the id set
+        sql_rows = session.execute(
+            select(Job.id, getattr(Job, name)).where(*conditions).order_by(get_sort_order(args))
+        ).all()
+        job_ids, total = snapshot.page(args, 1, max(len(sql_rows), 1))
+        keys = dict(session.execute(select(Job.id, getattr(Job, name)).where(Job.id.in_(job_ids))).all())
+        if total != len(sql_rows) or set(job_ids) != {row[0] for row in sql_rows}:
+            mismatches.append(f'{case}: rows differ ({total} vs {len(sql_rows)})')
+        elif [keys[job_id] for job_id in job_ids] != [row[1] for row in sql_rows]:
+            mismatches.append(f'{case}: order differs')
+
+        options = snapshot.filter_options(args)
+        for facet in FACET_FILTERS:
+            rows = session.execute(facet_statement_for(facet, build_filter_conditions(args, exclude=(facet,)))).all()
+            expected = {(item[FACET_KEYS[facet]], item['count']) for item in format_facet(rows, FACET_KEYS[facet])}
+            actual = {(item[FACET_KEYS[facet]], item['count']) for item in options[FACET_RESPONSE_KEYS[facet]]}
+            if expected != actual:
+                mismatches.append(f'{case}: {facet} facet differs')
+
+    return mismatches
+
+# APP INTEGRATION
+def init_snapshot(app):
+    """Enable the snapshot read engine when READ_ENGINE=snapshot and numpy is installed"""
+    if app.config['READ_ENGINE'] != 'snapshot':
+        return
+    if np is None:
+        app.logger.warning('READ_ENGINE=snapshot requires numpy - falling back to SQL reads')
+        return
+    app.extensions['job_snapshot'] = JobSnapshot()
+
+def get_snapshot():
+    """Return the refreshed snapshot, or None when reads should go to SQL"""
+    snapshot = current_app.extensions.get('job_snapshot')
+    if snapshot is not None:
+        snapshot.refresh_if_stale(db.engine, current_app.config['SNAPSHOT_REFRESH_SECONDS'])
+    return snapshot
+
+def load_page_jobs(job_ids):
+    """Load full Job rows for a page of ids, keeping the snapshot's order"""
+    jobs = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids)).all()}
+    return [jobs[job_id] for job_id in job_ids if job_id in jobs]
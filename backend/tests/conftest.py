@@ -0,0 +1,46 @@
+# backend/tests/conftest.py
+import pytest
+import percolator
+from config import config
+from app import create_app
+from migrations import upgrade
+
+def quiet(message):
+    pass
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Factory for apps on a fresh SQLite file in tmp_path, migrated unless migrate=False"""
+    monkeypatch.setattr(config['testing'], 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "jobs.db"}')
+    monkeypatch.setattr(config['testing'], 'SIMILAR_INDEX_DIR', str(tmp_path / 'similar_index'))
+    # The percolator index is process-wide; start each test from an empty one
+    monkeypatch.setattr(percolator, 'percolator', percolator.Percolator())
+
+    def make(migrate=True, **settings):
+        for name, value in settings.items():
+            monkeypatch.setattr(config['testing'], name, value)
+        app = create_app('testing')
+        if migrate:
+            with app.app_context():
+                upgrade(echo=quiet)
+        return app
+    return make
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def job_payload(**fields):
+    """Valid POST /api/jobs body"""
+    return {
+        'title': 'Actuarial Analyst',
+        'company': 'Acme Insurance',
+        'location': 'New York NY',
+        'job_type': 'Full-time',
+        'tags': 'life,pricing',
+        **fields
+    }
@@ -0,0 +1,78 @@
+# backend/tests/test_bulk_ops.py
+import pytest
+from sqlalchemy import select
+from db import db
+from models.job_change import JobChange
+from models.job_daily_count import JobDailyCount
+from date_buckets import rebuild_buckets
+from conftest import job_payload
+
+@pytest.fixture
+def bulk_app(make_app):
+    # Small batches so every operation spans several commits
+    return make_app(BULK_BATCH_SIZE=2)
+
+@pytest.fixture
+def bulk_client(bulk_app):
+    client = bulk_app.test_client()
+    for number in range(5):
+        client.post('/api/jobs/', json=job_payload(
+            title=f'Analyst {number}', company=('Globex', 'Initech')[number % 2], tags='life,pricing'
+        ))
+    return client
+
+def buckets_match_rebuild(app):
+    with app.app_context():
+        rows = lambda: sorted(tuple(row) for row in db.session.execute(
+            select(JobDailyCount.day, JobDailyCount.job_type, JobDailyCount.company, JobDailyCount.count)
+        ))
+        incremental = rows()
+        rebuild_buckets()
+        return incremental == rows()
+
+def logged(app, op):
+    with app.app_context():
+        return sorted(db.session.scalars(select(JobChange.job_id).where(JobChange.op == op)).all())
+
+@pytest.mark.parametrize('changes, detail', [
+    ({'tags': {'a': 1}}, 'tags must be a string'),
+    ({'tags': ['life', 3]}, 'tags must be a list of strings'),
+    ({'description': 42}, 'description must be a string'),
+    ({'url': ['x']}, 'url must be a string'),
+    ({'job_type': 'Gig'}, 'Job type must be one of'),
+    ({'company': ' '}, 'Company is required'),
+    ({'posting_date': 'soon'}, 'posting_date must be an ISO date'),
+    ({'title': 'New'}, 'Fields cannot be bulk updated: title'),
+])
+def test_invalid_changes_are_rejected(bulk_client, changes, detail):
+    response = bulk_client.patch('/api/jobs/bulk', json={'ids': [1], 'changes': changes})
+    assert response.status_code == 400
+    assert detail in response.get_json()['details'][0]
+
+@pytest.mark.parametrize('body', [
+    {'ids': [1], 'filters': {'company': 'Globex'}, 'changes': {'url': 'x'}},
+    {'ids': [], 'changes': {'url': 'x'}},
+    {'filters': {'sort': 'title_asc'}, 'changes': {'url': 'x'}},
+])
+def test_invalid_selection_is_rejected(bulk_client, body):
+    assert bulk_client.patch('/api/jobs/bulk', json=body).status_code == 400
+
+def test_bulk_update_by_filters(bulk_app, bulk_client):
+    response = bulk_client.patch('/api/jobs/bulk', json={
+        'filters': {'company': 'Globex'}, 'changes': {'job_type': 'Contract', 'tags': ['life', 'ml'], 'location': 'London'}
+    })
+    assert response.status_code == 200 and response.get_json()['updated'] == 3
+
+    jobs = bulk_client.get('/api/jobs/?company=Globex').get_json()['jobs']
+    assert {(job['job_type'], tuple(job['tags'])) for job in jobs} == {('Contract', ('life', 'ml'))}
+    assert bulk_client.get('/api/jobs/?location=london').get_json()['total'] == 3
+    assert logged(bulk_app, 'update') == [1, 3, 5]
+    assert buckets_match_rebuild(bulk_app)
+
+def test_bulk_delete_by_ids_and_filters(bulk_app, bulk_client):
+    assert bulk_client.delete('/api/jobs/bulk', json={'ids': [1, 2, 99]}).get_json()['deleted'] == 2
+    assert bulk_client.delete('/api/jobs/bulk', json={'filters': {'company': 'Initech'}}).get_json()['deleted'] == 1
+
+    assert [job['id'] for job in bulk_client.get('/api/jobs/?sort=title_asc').get_json()['jobs']] == [3, 5]
+    assert logged(bulk_app, 'delete') == [1, 2, 4]
+    assert buckets_match_rebuild(bulk_app)
@@ -0,0 +1,169 @@
+# backend/tests/test_change_log.py
+import json
+import pytest
+from sqlalchemy import select, update
+from datetime import datetime, timedelta
+from db import db
+from models.job_change import JobChange
+from change_log import prune_changes, pruned_through, current_seq
+from conftest import job_payload
+
+@pytest.fixture
+def stream_app(make_app):
+    return make_app(CHANGE_STREAM_POLL_SECONDS=0.05, CHANGE_STREAM_MAX_SECONDS=0.3)
+
+def post_jobs(client, count):
+    return [client.post('/api/jobs/', json=job_payload(title=f'Analyst {number}')).get_json()['job']['id'] for number in range(count)]
+
+def age_changes(app, days, through=None):
+    with app.app_context():
+        statement = update(JobChange).values(changed_at=datetime.utcnow() - timedelta(days=days))
+        if through is not None:
+            statement = statement.where(JobChange.seq <= through)
+        db.session.execute(statement)
+        db.session.commit()
+
+def parse_events(body):
+    """(event, id, data) for every SSE frame, skipping retry and comment frames"""
+    events = []
+    for frame in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in frame.split('\n') if line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], fields.get('id'), json.loads(fields['data'])))
+    return events
+
+# CURSOR PAGING
+def test_pages_follow_the_cursor_until_has_more_is_false(client):
+    ids = post_jobs(client, 5)
+    seen, cursor, pages = [], 0, 0
+    while True:
+        body = client.get(f'/api/jobs/changes?since={cursor}&limit=2').get_json()
+        seen += [change['job_id'] for change in body['changes']]
+        assert [change['op'] for change in body['changes']] == ['insert'] * len(body['changes'])
+        cursor, pages = body['cursor'], pages + 1
+        if not body['has_more']:
+            break
+        assert len(body['changes']) == 2
+
+    assert seen == ids and pages == 3
+    assert cursor == body['latest_seq']
+    assert client.get(f'/api/jobs/changes?since={cursor}').get_json()['changes'] == []
+
+def test_since_latest_starts_at_the_current_seq(client):
+    post_jobs(client, 2)
+    body = client.get('/api/jobs/changes?since=latest').get_json()
+    assert body['changes'] == [] and body['cursor'] == body['latest_seq'] > 0
+
+def test_changes_to_one_job_collapse_to_the_latest(client):
+    job_id, other = post_jobs(client, 2)
+    client.put(f'/api/jobs/{job_id}', json={'company': 'Globex'})
+    client.put(f'/api/jobs/{job_id}', json={'company': 'Initech'})
+
+    body = client.get('/api/jobs/changes?since=0').get_json()
+    assert [(change['job_id'], change['op']) for change in body['changes']] == [(other, 'insert'), (job_id, 'update')]
+    assert body['changes'][-1]['seq'] == body['cursor']
+    assert body['changes'][-1]['job']['company'] == 'Initech'
+
+def test_deleted_jobs_are_tombstones(client):
+    kept, deleted = post_jobs(client, 2)
+    client.delete(f'/api/jobs/{deleted}')
+
+    changes = client.get('/api/jobs/changes?since=0').get_json()['changes']
+    assert [(change['job_id'], change['op']) for change in changes] == [(kept, 'insert'), (deleted, 'delete')]
+    assert changes[-1]['job'] is None
+
+    # The insert entry alone already reports the job as gone
+    first = client.get('/api/jobs/changes?since=0&limit=2').get_json()['changes']
+    assert first[-1] == {**first[-1], 'job_id': deleted, 'op': 'delete', 'job': None}
+
+# SERVER-SENT EVENTS
+def test_stream_frames_changes_as_events(stream_app):
+    client = stream_app.test_client()
+    ids = post_jobs(client, 3)
+
+    response = client.get('/api/jobs/changes/stream?since=0')
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    body = response.get_data(as_text=True)
+
+    assert body.startswith('retry: 3000\n\n')
+    assert ': keep-alive\n\n' in body
+    events = parse_events(body)
+    assert [(event, data['job_id']) for event, _, data in events] == [('change', job_id) for job_id in ids]
+    assert [int(seq) for _, seq, _ in events] == [data['seq'] for _, _, data in events]
+
+def test_stream_resumes_after_last_event_id(stream_app):
+    client = stream_app.test_client()
+    ids = post_jobs(client, 3)
+    first = parse_events(client.get('/api/jobs/changes/stream?since=0').get_data(as_text=True))
+
+    # Last-Event-ID wins over since, as when EventSource reconnects
+    resumed = client.get('/api/jobs/changes/stream?since=0', headers={'Last-Event-ID': first[0][1]})
+    assert [data['job_id'] for _, _, data in parse_events(resumed.get_data(as_text=True))] == ids[1:]
+
+def test_stream_without_cursor_starts_at_latest(stream_app):
+    client = stream_app.test_client()
+    post_jobs(client, 2)
+    assert parse_events(client.get('/api/jobs/changes/stream').get_data(as_text=True)) == []
+
+# PRUNING
+def test_prune_removes_old_entries_but_keeps_the_newest(app, client):
+    post_jobs(client, 4)
+    with app.app_context():
+        latest = current_seq()
+    age_changes(app, 60, through=latest - 2)
+
+    with app.app_context():
+        assert prune_changes(30, batch_size=1) == latest - 2
+        assert pruned_through(db.session) == latest - 2
+        assert db.session.scalars(select(JobChange.seq)).all() == [latest - 1, latest]
+
+    age_changes(app, 60)
+    with app.app_context():
+        assert prune_changes(30) == 1
+        assert db.session.scalars(select(JobChange.seq)).all() == [latest]
+        assert current_seq() == latest
+
+def test_prune_only_removes_a_prefix(app, client):
+    post_jobs(client, 3)
+    with app.app_context():
+        seqs = db.session.scalars(select(JobChange.seq).order_by(JobChange.seq)).all()
+        db.session.execute(update(JobChange).where(JobChange.seq == seqs[1]).values(changed_at=datetime.utcnow() - timedelta(days=60)))
+        db.session.commit()
+        # The middle entry is old, but the one before it is not
+        assert prune_changes(30) == 0
+
+def test_expired_cursors_get_410(app, client):
+    post_jobs(client, 3)
+    age_changes(app, 60)
+    with app.app_context():
+        prune_changes(30)
+        horizon = pruned_through(db.session)
+
+    expired = client.get('/api/jobs/changes?since=0')
+    assert expired.status_code == 410 and 'since=latest' in expired.get_json()['error']
+    assert client.get('/api/jobs/changes/stream', headers={'Last-Event-ID': '1'}).status_code == 410
+
+    body = client.get(f'/api/jobs/changes?since={horizon}').get_json()
+    assert len(body['changes']) == 1
+    assert client.get('/api/jobs/changes?since=latest').status_code == 200
+
+def test_open_stream_reports_an_expired_cursor(stream_app, monkeypatch):
+    import change_log
+    client = stream_app.test_client()
+    post_jobs(client, 2)
+    monkeypatch.setattr(change_log, 'cursor_expired', lambda connection, cursor: cursor > 0)
+
+    body = client.get('/api/jobs/changes/stream?since=0').get_data(as_text=True)
+    events = parse_events(body)
+    assert [event for event, _, _ in events] == ['change', 'change', 'expired']
+    assert 'since=latest' in events[-1][2]['error']
+
+def test_prune_command(app, client):
+    post_jobs(client, 3)
+    age_changes(app, 10)
+
+    result = app.test_cli_runner().invoke(args=['prune-changes', '--max-age-days', '30'])
+    assert 'Pruned 0 change log entries!' in result.output
+    result = app.test_cli_runner().invoke(args=['prune-changes', '--max-age-days', '5', '--batch-size', '1'])
+    assert 'Pruned 2 change log entries!' in result.output
@@ -0,0 +1,91 @@
+# backend/tests/test_compression.py
+import gzip
+import json
+import zlib
+import brotli
+import pytest
+from werkzeug.http import parse_accept_header
+from compression import choose_encoding
+from conftest import job_payload
+
+DECOMPRESS = {'br': brotli.decompress, 'gzip': gzip.decompress}
+
+def stream_decompressor(encoding):
+    if encoding == 'br':
+        return brotli.Decompressor().process
+    return zlib.decompressobj(31).decompress
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate, br', 'br'),
+    ('br;q=0.5, gzip', 'gzip'),
+    ('gzip;q=0.2, br;q=0.8', 'br'),
+    ('gzip', 'gzip'),
+    ('br', 'br'),
+    ('*', 'br'),
+    ('deflate, identity', None),
+    ('br;q=0, gzip;q=0', None),
+    ('', None)
+])
+def test_choose_encoding_by_quality(header, expected):
+    assert choose_encoding(parse_accept_header(header)) == expected
+
+@pytest.fixture
+def listing_client(client):
+    for number in range(10):
+        client.post('/api/jobs/', json=job_payload(title=f'Analyst {number}', description='Pricing and reserving ' * 10))
+    return client
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip'])
+def test_large_json_is_compressed(listing_client, encoding):
+    plain = listing_client.get('/api/jobs/')
+    assert 'Content-Encoding' not in plain.headers
+    assert len(plain.get_data()) >= 1024
+
+    response = listing_client.get('/api/jobs/', headers={'Accept-Encoding': encoding})
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(response.get_data()) < len(plain.get_data())
+    assert json.loads(DECOMPRESS[encoding](response.get_data())) == plain.get_json()
+
+def test_small_json_is_sent_as_is(client):
+    response = client.get('/api/jobs/', headers={'Accept-Encoding': 'br, gzip'})
+    assert len(response.get_data()) < 1024
+    assert 'Content-Encoding' not in response.headers
+    # The body would be compressed once large enough, so caches must still key on the header
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.get_json()['total'] == 0
+
+def test_threshold_is_configurable(make_app):
+    client = make_app(COMPRESS_MIN_BYTES=10).test_client()
+    assert client.get('/api/jobs/', headers={'Accept-Encoding': 'gzip'}).headers['Content-Encoding'] == 'gzip'
+
+def test_compression_can_be_turned_off(make_app):
+    client = make_app(COMPRESS_RESPONSES=False, COMPRESS_MIN_BYTES=10).test_client()
+    response = client.get('/api/jobs/', headers={'Accept-Encoding': 'br, gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' not in response.headers.get('Vary', '')
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip'])
+def test_event_stream_is_flushed_per_event(make_app, encoding):
+    app = make_app(CHANGE_STREAM_POLL_SECONDS=0.05, CHANGE_STREAM_MAX_SECONDS=0.2)
+    client = app.test_client()
+    for number in range(3):
+        client.post('/api/jobs/', json=job_payload(title=f'Analyst {number}'))
+
+    response = client.get('/api/jobs/changes/stream?since=0', headers={'Accept-Encoding': encoding}, buffered=False)
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Content-Length' not in response.headers
+
+    decompress = stream_decompressor(encoding)
+    texts = [decompress(chunk).decode('utf-8') for chunk in response.response]
+    response.close()
+
+    # Every chunk decompresses on its own to whole frames - nothing is held back until the stream ends
+    assert all(text.endswith('\n\n') for text in texts[:-1])
+    assert texts[-1] == ''
+    frames = [frame for text in texts for frame in text.split('\n\n') if frame]
+
+    assert frames[0] == 'retry: 3000'
+    assert [frame.split('\n')[0] for frame in frames if frame.startswith('id: ')] == [
+        f'id: {seq}' for seq in range(1, 4)
+    ]
@@ -0,0 +1,53 @@
+# backend/tests/test_concurrent_reads.py
+import threading
+import time
+import pytest
+from sqlalchemy import event
+from db import db
+from conftest import job_payload
+
+@pytest.fixture
+def slow_queries(app, client):
+    """Record (start, end) of every aggregate query, each held for 0.2 s"""
+    for number in range(3):
+        client.post('/api/jobs/', json=job_payload(title=f'Analyst {number}', company=f'Company {number % 2}'))
+
+    intervals, lock = [], threading.Lock()
+    with app.app_context():
+        engine = db.engine
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context.slow_started = time.monotonic()
+        if 'count(' in statement.lower():
+            time.sleep(0.2)
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        if 'count(' in statement.lower() or 'LIMIT' in statement:
+            with lock:
+                intervals.append((context.slow_started, time.monotonic()))
+
+    event.listen(engine, 'before_cursor_execute', before)
+    event.listen(engine, 'after_cursor_execute', after)
+    yield intervals
+    event.remove(engine, 'before_cursor_execute', before)
+    event.remove(engine, 'after_cursor_execute', after)
+
+def overlap(intervals):
+    return max(start for start, _ in intervals) < min(end for _, end in intervals)
+
+def test_facet_queries_run_concurrently(client, slow_queries):
+    response = client.get('/api/jobs/filter-options?job_type=Full-time')
+    assert response.status_code == 200
+    assert {item['company'] for item in response.get_json()['companies']} == {'Company 0', 'Company 1'}
+    assert len(slow_queries) == 3 and overlap(slow_queries)
+
+def test_count_runs_alongside_page_query(client, slow_queries):
+    response = client.get('/api/jobs/?per_page=2')
+    assert response.status_code == 200
+    assert response.get_json()['total'] == 3 and len(response.get_json()['jobs']) == 2
+    assert len(slow_queries) == 2 and overlap(slow_queries)
+
+def test_single_thread_setting_runs_in_request(make_app):
+    app = make_app(READ_QUERY_THREADS=1)
+    assert 'read_executor' not in app.extensions
+    assert app.test_client().get('/api/jobs/filter-options').status_code == 200
@@ -0,0 +1,34 @@
+# backend/tests/test_date_buckets.py
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from db import db
+from models.job import Job
+from models.job_daily_count import JobDailyCount
+from bulk_ops import bulk_update, bulk_delete
+from date_buckets import rebuild_buckets
+
+def bucket_counts():
+    rows = db.session.execute(select(JobDailyCount.day, JobDailyCount.job_type, JobDailyCount.company, JobDailyCount.count))
+    return sorted(tuple(row) for row in rows)
+
+def test_incremental_buckets_match_rebuild(app):
+    today = datetime.utcnow()
+    with app.app_context():
+        db.session.add_all([
+            Job(title=f'Analyst {number}', company=('Globex', 'Initech')[number % 2], location='Remote',
+                job_type=('Full-time', 'Contract')[number % 3 == 0], posting_date=today - timedelta(days=number % 4))
+            for number in range(30)
+        ])
+        db.session.commit()
+
+        ids = db.session.scalars(select(Job.id).order_by(Job.id)).all()
+        db.session.delete(db.session.get(Job, ids[0]))
+        db.session.get(Job, ids[1]).company = 'Umbrella'
+        db.session.commit()
+        bulk_update(ids[2:8], None, {'job_type': 'Internship'}, batch_size=4)
+        bulk_delete(ids[8:20], None, batch_size=5)
+
+        incremental = bucket_counts()
+        assert all(row[3] > 0 for row in incremental)
+        rebuild_buckets()
+        assert incremental == bucket_counts()
@@ -0,0 +1,177 @@
+# backend/tests/test_load_control.py
+import shutil
+import threading
+import time
+import pytest
+from sqlalchemy import event
+from db import db
+from load_control import SingleFlight, AdmissionGate, Overloaded, data_version
+from read_routing import STICKY_HEADER
+from conftest import job_payload
+
+def test_single_flight_runs_concurrent_calls_once():
+    flights, release = SingleFlight(), threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'result'
+
+    threads = [threading.Thread(target=lambda: results.append(flights.do('key', compute))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ['result'] * 5
+    assert flights.calls == {}
+
+def test_single_flight_shares_errors_and_forgets_the_call():
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        flights.do('key', fail)
+    assert flights.do('key', lambda: 'next') == 'next'
+
+def test_admission_gate_times_out_when_full():
+    gate, release = AdmissionGate(1, 0.05), threading.Event()
+    holder = threading.Thread(target=lambda: gate.run(lambda: release.wait(5)))
+    holder.start()
+    time.sleep(0.1)
+    with pytest.raises(Overloaded):
+        gate.run(lambda: None)
+    release.set()
+    holder.join(5)
+    assert gate.run(lambda: 'free') == 'free'
+
+def test_data_version_changes_on_writes_only(client):
+    before = data_version()
+    client.get('/api/jobs/')
+    assert data_version() == before
+    client.post('/api/jobs/', json=job_payload())
+    assert data_version() > before
+
+@pytest.fixture
+def blocked_facets(make_app):
+    """App whose first company facet query waits until released"""
+    app = make_app(
+        READ_QUERY_THREADS=1,
+        ENDPOINT_CONCURRENCY_LIMITS={'filter_options': 1},
+        ADMISSION_TIMEOUT_SECONDS=0.1
+    )
+    app.test_client().post('/api/jobs/', json=job_payload(company='Globex'))
+    with app.app_context():
+        engine = db.engine
+
+    state = {'queries': 0, 'started': threading.Event(), 'release': threading.Event()}
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if 'GROUP BY jobs.company' in statement:
+            state['queries'] += 1
+            if state['queries'] == 1:
+                state['started'].set()
+                state['release'].wait(5)
+
+    event.listen(engine, 'before_cursor_execute', before)
+    yield app, state
+    state['release'].set()
+    event.remove(engine, 'before_cursor_execute', before)
+
+def get_in_thread(app, url, responses):
+    thread = threading.Thread(target=lambda: responses.append(app.test_client().get(url)))
+    thread.start()
+    return thread
+
+def test_identical_requests_share_one_execution(blocked_facets):
+    app, state = blocked_facets
+    responses = []
+    leader = get_in_thread(app, '/api/jobs/filter-options?job_type=Full-time', responses)
+    assert state['started'].wait(5)
+    followers = [get_in_thread(app, '/api/jobs/filter-options?job_type=Full-time', responses) for _ in range(3)]
+    time.sleep(0.2)
+    state['release'].set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert state['queries'] == 1
+    assert [response.status_code for response in responses] == [200] * 4
+    assert len({response.get_data() for response in responses}) == 1
+
+def test_over_limit_requests_get_429(blocked_facets):
+    app, state = blocked_facets
+    responses = []
+    leader = get_in_thread(app, '/api/jobs/filter-options?job_type=Full-time', responses)
+    assert state['started'].wait(5)
+
+    # Different parameters cannot join the running call and find no free slot
+    busy = app.test_client().get('/api/jobs/filter-options?job_type=Contract')
+    assert busy.status_code == 429
+    assert busy.headers['Retry-After'] == str(app.config['RETRY_AFTER_SECONDS'])
+
+    state['release'].set()
+    leader.join(5)
+    assert responses[0].status_code == 200
+    assert app.test_client().get('/api/jobs/filter-options?job_type=Contract').status_code == 200
+
+def test_write_starts_a_new_flight(blocked_facets):
+    app, state = blocked_facets
+    app.extensions['load_control']['gates'] = {'filter_options': AdmissionGate(2, 0.1)}
+    stale = []
+    leader = get_in_thread(app, '/api/jobs/filter-options', stale)
+    assert state['started'].wait(5)
+
+    app.test_client().post('/api/jobs/', json=job_payload(company='Initech'))
+    # The same request after the write must not be handed the in-flight pre-write result
+    fresh = app.test_client().get('/api/jobs/filter-options')
+    state['release'].set()
+    leader.join(5)
+
+    assert state['queries'] == 2
+    assert {item['company'] for item in fresh.get_json()['companies']} == {'Globex', 'Initech'}
+    assert stale[0].status_code == 200
+
+def test_requests_on_different_databases_do_not_share(make_app, tmp_path):
+    replica = tmp_path / 'replica.db'
+    app = make_app(
+        SQLALCHEMY_BINDS={'replica_0': f'sqlite:///{replica}'},
+        REPLICA_MAX_LAG_SECONDS=3600,
+        REPLICA_CHECK_SECONDS=0,
+        READ_QUERY_THREADS=1
+    )
+    with app.app_context():
+        db.engine.dispose()
+        engines = [db.engine, db.engines['replica_0']]
+    shutil.copy(tmp_path / 'jobs.db', replica)
+    seq = app.test_client(use_cookies=False).post('/api/jobs/', json=job_payload(company='Globex')).headers[STICKY_HEADER]
+
+    started, release = threading.Event(), threading.Event()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if 'GROUP BY jobs.company' in statement and conn.engine is engines[1]:
+            started.set()
+            release.wait(5)
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before)
+    try:
+        lagging = []
+        leader = get_in_thread(app, '/api/jobs/filter-options', lagging)
+        assert started.wait(5)
+        # Pinned to the primary, so it must not be handed the replica's result
+        pinned = app.test_client(use_cookies=False).get('/api/jobs/filter-options', headers={STICKY_HEADER: seq})
+        release.set()
+        leader.join(5)
+    finally:
+        release.set()
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', before)
+
+    assert [item['company'] for item in pinned.get_json()['companies']] == ['Globex']
+    assert lagging[0].get_json()['companies'] == []
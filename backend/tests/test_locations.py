@@ -0,0 +1,63 @@
+# backend/tests/test_locations.py
+from sqlalchemy import select
+from db import db
+from models.location import Location
+from locations import canonical_location, split_locations, location_ids
+from conftest import job_payload
+
+def test_canonical_location():
+    assert canonical_location('🏠 Remote') == 'Remote'
+    assert canonical_location('NYC') == 'New York NY'
+    assert canonical_location('  san   francisco ') == 'San Francisco CA'
+    assert canonical_location('Boston MA') == 'Boston MA'
+    assert canonical_location(None) == ''
+
+def test_split_locations_drops_tags_placeholders_and_duplicates():
+    assert split_locations('London, Actuary (Fellow), Life', 'Actuary (Fellow),Life') == ['London']
+    assert split_locations('NYC, New York, WFH') == ['New York NY', 'Remote']
+    assert split_locations('Location not specified') == []
+    assert split_locations(None) == []
+
+class MissesFirstLookup:
+    """Connection whose first SELECT sees no rows, as when another writer inserts the name meanwhile"""
+    def __init__(self, connection):
+        self.connection = connection
+        self.dialect = connection.dialect
+        self.lookups = 0
+
+    def execute(self, statement, *args):
+        if getattr(statement, 'is_select', False):
+            self.lookups += 1
+            if self.lookups == 1:
+                return self.connection.execute(statement.where(False), *args)
+        return self.connection.execute(statement, *args)
+
+def test_location_ids_keeps_concurrently_created_rows(app):
+    with app.app_context():
+        db.session.add(Location(name='Remote'))
+        db.session.commit()
+        existing = db.session.scalar(select(Location.id).where(Location.name == 'Remote'))
+
+        ids = location_ids(MissesFirstLookup(db.session.connection()), ['Remote', 'London'])
+        db.session.commit()
+        assert ids['Remote'] == existing
+        assert set(db.session.scalars(select(Location.name)).all()) == {'Remote', 'London'}
+
+def test_location_filter_and_facet_use_canonical_locations(client):
+    client.post('/api/jobs/', json=job_payload(title='A', location='NYC, London'))
+    client.post('/api/jobs/', json=job_payload(title='B', location='New York'))
+    job_id = client.post('/api/jobs/', json=job_payload(title='C', location='🏠 Remote')).get_json()['job']['id']
+
+    titles = lambda query: sorted(job['title'] for job in client.get(f'/api/jobs/?{query}').get_json()['jobs'])
+    assert titles('location=nyc') == ['A', 'B']
+    assert titles('location=London') == ['A']
+    assert titles('location=remote') == ['C']
+
+    facet = lambda: {item['location']: item['count'] for item in client.get('/api/jobs/filter-options').get_json()['locations']}
+    assert facet() == {'New York NY': 2, 'London': 1, 'Remote': 1}
+
+    # Updates and deletes keep job_locations in sync
+    client.put(f'/api/jobs/{job_id}', json={'location': 'London'})
+    assert facet() == {'New York NY': 2, 'London': 2}
+    client.delete(f'/api/jobs/{job_id}')
+    assert facet() == {'New York NY': 2, 'London': 1}
@@ -0,0 +1,67 @@
+# backend/tests/test_migrations.py
+from sqlalchemy import inspect, text
+from db import db
+from migrations import upgrade, LATEST_VERSION, MIGRATIONS
+from conftest import quiet
+
+def test_migrated_schema_matches_models(app):
+    with app.app_context():
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            columns = {column['name'] for column in inspector.get_columns(table.name)}
+            assert columns == {column.name for column in table.columns}, table.name
+            indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            assert {index.name for index in table.indexes} <= indexes, table.name
+
+def test_upgrade_is_idempotent(app):
+    with app.app_context():
+        assert upgrade(echo=quiet) == LATEST_VERSION
+        assert upgrade(echo=quiet) == LATEST_VERSION
+
+def test_requests_wait_for_migration_but_health_answers(make_app):
+    app = make_app(migrate=False)
+    client = app.test_client()
+
+    assert client.get('/api/jobs/').status_code == 503
+    health = client.get('/api/health')
+    assert health.status_code == 200
+    assert health.get_json()['status'] == 'needs_migration'
+    assert health.get_json()['schema_version'] == 0
+
+    with app.app_context():
+        upgrade(echo=quiet)
+    assert client.get('/api/jobs/').status_code == 200
+    assert client.get('/api/health').get_json()['status'] == 'healthy'
+
+def test_partial_upgrade_stops_at_target(make_app):
+    app = make_app(migrate=False)
+    with app.app_context():
+        assert upgrade(1, echo=quiet) == 1
+        assert upgrade(echo=quiet) == MIGRATIONS[-1][0]
+
+def test_backfill_fills_rollups_for_existing_jobs(make_app):
+    app = make_app(migrate=False)
+    with app.app_context():
+        upgrade(2, echo=quiet)
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO jobs (title, company, location, posting_date, job_type, tags) VALUES "
+                "('A', 'Globex', 'NYC, London', '2024-05-01 10:00:00', 'Full-time', 'life'), "
+                "('B', 'Globex', '🏠 Remote', '2024-05-01 12:00:00', 'Full-time', NULL), "
+                "('C', 'Initech', 'London, Life', '2024-05-02 09:00:00', 'Contract', 'Life')"
+            ))
+        upgrade(echo=quiet)
+
+        with db.engine.connect() as connection:
+            buckets = connection.execute(text('SELECT day, job_type, company, count FROM job_daily_counts ORDER BY day')).all()
+            locations = connection.execute(text(
+                'SELECT jobs.title, locations.name FROM job_locations '
+                'JOIN jobs ON jobs.id = job_locations.job_id JOIN locations ON locations.id = job_locations.location_id '
+                'ORDER BY jobs.title, locations.name'
+            )).all()
+    assert [tuple(row) for row in buckets] == [
+        ('2024-05-01', 'Full-time', 'Globex', 2), ('2024-05-02', 'Contract', 'Initech', 1)
+    ]
+    assert [tuple(row) for row in locations] == [
+        ('A', 'London'), ('A', 'New York NY'), ('B', 'Remote'), ('C', 'London')
+    ]
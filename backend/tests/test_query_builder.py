@@ -0,0 +1,75 @@
+# backend/tests/test_query_builder.py
+import pytest
+from db import db
+from models.job import Job
+from query_builder import (
+    build_filter_conditions, count_statement, facet_statement, facet_groups_statement, cascade_facets, format_facet
+)
+from conftest import job_payload
+
+JOBS = [
+    ('Globex', 'NYC, London', 'Full-time', 'life,pricing'),
+    ('Globex', 'Remote', 'Contract', 'health'),
+    ('Globex Re', 'London', 'Full-time', 'life'),
+    ('Initech', 'London, Life', 'Part-time', 'Life'),
+    ('Initech', 'San Francisco', 'Full-time', 'pricing'),
+    ('Initech', '🏠 Remote', 'Contract', 'life'),
+    ('Acme Insurance', 'New York NY', 'Internship', 'health,pricing'),
+    ('acme insurance', 'Boston MA', 'Full-time', 'life')
+]
+
+ARGS = [
+    {},
+    {'company': 'globex'},
+    {'job_type': 'Full-time'},
+    {'location': 'London'},
+    {'location': 'nyc', 'company': 'Acme'},
+    {'location': 'Remote', 'job_type': 'Contract'},
+    {'company': 'Initech', 'job_type': 'Full-time', 'location': 'san'},
+    {'company': 'in', 'tags': 'life'},
+    {'search': 'Globex', 'job_type': 'Part-time'},
+    {'company': 'nobody'}
+]
+
+@pytest.fixture
+def facet_app(app):
+    client = app.test_client()
+    for company, location, job_type, tags in JOBS:
+        response = client.post('/api/jobs/', json=job_payload(
+            company=company, location=location, job_type=job_type, tags=tags
+        ))
+        assert response.status_code == 201
+    return app
+
+def per_facet(args):
+    """Total and company / job type facets from the separate per-facet queries"""
+    total = db.session.scalar(count_statement(build_filter_conditions(args)))
+    companies = db.session.execute(facet_statement(Job.company, build_filter_conditions(args, exclude=('company',)))).all()
+    job_types = db.session.execute(facet_statement(Job.job_type, build_filter_conditions(args, exclude=('job_type',)))).all()
+    return total, {'job_types': format_facet(job_types, 'type'), 'companies': format_facet(companies, 'company')}
+
+def unordered(options):
+    # Facets are ranked by count; ties may come back in any order
+    return {name: sorted(tuple(item.values()) for item in items) for name, items in options.items()}
+
+@pytest.mark.parametrize('args', ARGS)
+def test_grouped_facets_match_per_facet_queries(facet_app, args):
+    with facet_app.app_context():
+        groups = db.session.execute(facet_groups_statement(args)).all()
+        total, options = cascade_facets(groups, args)
+        expected_total, expected_options = per_facet(args)
+
+    assert total == expected_total
+    assert unordered(options) == unordered(expected_options)
+    for items in options.values():
+        assert [item['count'] for item in items] == sorted((item['count'] for item in items), reverse=True)
+
+def test_search_filter_options_match_filter_options_endpoint(facet_app):
+    client = facet_app.test_client()
+    for args in ARGS:
+        search = client.get('/api/jobs/search', query_string=args).get_json()
+        options = client.get('/api/jobs/filter-options', query_string=args).get_json()
+        listing = client.get('/api/jobs/', query_string=args).get_json()
+
+        assert search['total'] == listing['total'], args
+        assert unordered(search['filter_options']) == unordered(options), args
@@ -0,0 +1,46 @@
+# backend/tests/test_read_routing.py
+import shutil
+import pytest
+from db import db
+from read_routing import STICKY_HEADER
+from conftest import job_payload
+
+ORIGIN = 'http://localhost:3000'
+
+@pytest.fixture
+def lagging_app(make_app, tmp_path):
+    """App whose only replica is a copy of the primary taken before any job was written"""
+    replica = tmp_path / 'replica.db'
+    app = make_app(
+        SQLALCHEMY_BINDS={'replica_0': f'sqlite:///{replica}'},
+        REPLICA_MAX_LAG_SECONDS=3600,
+        REPLICA_CHECK_SECONDS=0
+    )
+    with app.app_context():
+        db.engine.dispose()
+    shutil.copy(tmp_path / 'jobs.db', replica)
+    return app
+
+def test_write_returns_exposed_header(lagging_app):
+    client = lagging_app.test_client(use_cookies=False)
+    response = client.post('/api/jobs/', json=job_payload(), headers={'Origin': ORIGIN})
+    assert response.status_code == 201
+    assert int(response.headers[STICKY_HEADER]) > 0
+    assert STICKY_HEADER in response.headers['Access-Control-Expose-Headers']
+
+def test_preflight_allows_header(lagging_app):
+    response = lagging_app.test_client().options('/api/jobs/1', headers={
+        'Origin': ORIGIN,
+        'Access-Control-Request-Method': 'GET',
+        'Access-Control-Request-Headers': STICKY_HEADER.lower()
+    })
+    assert STICKY_HEADER.lower() in response.headers['Access-Control-Allow-Headers'].lower()
+
+def test_header_reads_own_write_without_cookies(lagging_app):
+    client = lagging_app.test_client(use_cookies=False)
+    response = client.post('/api/jobs/', json=job_payload())
+    job_id, seq = response.get_json()['job']['id'], response.headers[STICKY_HEADER]
+
+    # Without the header the read goes to the replica, which has not seen the job yet
+    assert client.get(f'/api/jobs/{job_id}').status_code == 404
+    assert client.get(f'/api/jobs/{job_id}', headers={STICKY_HEADER: seq}).status_code == 200
@@ -0,0 +1,35 @@
+# backend/tests/test_retention.py
+from datetime import datetime, timedelta
+from retention import archive_old_jobs
+from conftest import job_payload
+
+OLD = (datetime.utcnow() - timedelta(days=400)).isoformat()
+
+def create_job(client, **fields):
+    response = client.post('/api/jobs/', json=job_payload(**fields))
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['job']['id']
+
+def test_archive_create_archive_keeps_ids_apart(app, client):
+    first = create_job(client, title='First', posting_date=OLD)
+    with app.app_context():
+        assert archive_old_jobs(180) == 1
+
+    # The newest job's id must not be handed out again once it left the jobs table
+    second = create_job(client, title='Second', posting_date=OLD)
+    assert second > first
+
+    archived = client.get(f'/api/jobs/{first}').get_json()
+    assert archived['title'] == 'First' and archived['archived'] is True
+
+    with app.app_context():
+        assert archive_old_jobs(180) == 1
+
+    listing = client.get('/api/jobs/?include_archived=true&per_page=10').get_json()
+    assert sorted(job['id'] for job in listing['jobs']) == [first, second]
+    assert client.get(f'/api/jobs/{second}').get_json()['title'] == 'Second'
+
+def test_deleted_job_id_is_not_reused(client):
+    first = create_job(client, title='Deleted')
+    assert client.delete(f'/api/jobs/{first}').status_code == 200
+    assert create_job(client, title='Next') > first
@@ -0,0 +1,80 @@
+# backend/tests/test_similar.py
+import os
+import pytest
+from sqlalchemy import update
+from datetime import datetime, timedelta
+from db import db
+from models.job_change import JobChange
+from change_log import prune_changes
+from conftest import job_payload
+
+pytest.importorskip('numpy')
+from similar_index import build_index, index_directory
+
+def test_similar_needs_a_built_index(app, client):
+    first = client.post('/api/jobs/', json=job_payload()).get_json()['job']['id']
+    client.post('/api/jobs/', json=job_payload(title='Actuarial Associate'))
+
+    response = client.get(f'/api/jobs/{first}/similar')
+    assert response.status_code == 503
+    assert 'build-similar-index' in response.get_json()['error']
+    assert not os.path.exists(index_directory(app))
+
+    with app.app_context():
+        build_index(index_directory(app))
+    response = client.get(f'/api/jobs/{first}/similar')
+    assert response.status_code == 200
+    assert [job['title'] for job in response.get_json()['similar']] == ['Actuarial Associate']
+
+def test_build_keeps_current_and_previous_versions(app):
+    directory = index_directory(app)
+    with app.app_context():
+        for _ in range(4):
+            build_index(directory)
+    versions = sorted(name for name in os.listdir(directory) if name.startswith('v'))
+    with open(os.path.join(directory, 'CURRENT')) as f:
+        current = f.read().strip()
+    assert len(versions) == 2 and current == max(versions, key=lambda name: int(name.rsplit('-', 1)[-1]))
+
+def test_delta_past_the_cap_requires_a_rebuild(make_app):
+    app = make_app(SIMILAR_MAX_DELTA=2, SIMILAR_REFRESH_SECONDS=0)
+    client = app.test_client()
+    first = client.post('/api/jobs/', json=job_payload()).get_json()['job']['id']
+    with app.app_context():
+        build_index(index_directory(app))
+
+    client.post('/api/jobs/', json=job_payload(title='Actuarial Associate'))
+    client.put(f'/api/jobs/{first}', json={'tags': 'life,health'})
+    assert client.get(f'/api/jobs/{first}/similar').status_code == 200
+    assert len(app.extensions['similar_index'].delta) == 2
+
+    client.post('/api/jobs/', json=job_payload(title='Actuarial Manager'))
+    response = client.get(f'/api/jobs/{first}/similar')
+    assert response.status_code == 503 and 'too far behind' in response.get_json()['error']
+
+    with app.app_context():
+        build_index(index_directory(app))
+    response = client.get(f'/api/jobs/{first}/similar')
+    assert response.status_code == 200
+    assert app.extensions['similar_index'].delta == {}
+    assert {job['title'] for job in response.get_json()['similar']} == {'Actuarial Associate', 'Actuarial Manager'}
+
+def test_pruned_replay_requires_a_rebuild(make_app):
+    app = make_app(SIMILAR_REFRESH_SECONDS=0)
+    client = app.test_client()
+    first = client.post('/api/jobs/', json=job_payload()).get_json()['job']['id']
+    with app.app_context():
+        build_index(index_directory(app))
+
+    client.post('/api/jobs/', json=job_payload(title='Actuarial Associate'))
+    client.post('/api/jobs/', json=job_payload(title='Actuarial Manager'))
+    with app.app_context():
+        db.session.execute(update(JobChange).values(changed_at=datetime.utcnow() - timedelta(days=60)))
+        db.session.commit()
+        prune_changes(30)
+    response = client.get(f'/api/jobs/{first}/similar')
+    assert response.status_code == 503 and 'too far behind' in response.get_json()['error']
+
+    with app.app_context():
+        build_index(index_directory(app))
+    assert client.get(f'/api/jobs/{first}/similar').status_code == 200
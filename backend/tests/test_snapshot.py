@@ -0,0 +1,120 @@
+# backend/tests/test_snapshot.py
+import random
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import func, update
+from db import db
+from models.job import Job
+from models.job_change import JobChange
+from bulk_ops import bulk_update, bulk_delete
+from retention import archive_old_jobs
+from change_log import prune_changes
+
+pytest.importorskip('numpy')
+from snapshot import JobSnapshot, parity_cases, check_parity
+
+COMPANIES = ['Acme Insurance', 'Globex', 'Initech', 'Umbrella Health', 'Stark Industries', 'Wayne Enterprises']
+LOCATIONS = ['New York, NY', 'NYC', 'Remote', 'San Francisco, CA', 'Austin, TX', 'Remote - US', 'London']
+TAGS = ['python', 'sql', 'pricing', 'react', 'life', 'excel', 'ml']
+
+def fixture_jobs(count, seed):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        Job(
+            title=f'{rng.choice(["Analyst", "Engineer", "Actuary", "Manager"])} {number}',
+            company=rng.choice(COMPANIES),
+            location=rng.choice(LOCATIONS),
+            job_type=rng.choice(Job.VALID_JOB_TYPES),
+            posting_date=now - timedelta(days=rng.choice([0, 3, 20, 60, 400]), hours=rng.randrange(24)),
+            tags=','.join(rng.sample(TAGS, rng.randrange(4))) or None,
+            description=f'Posting {number}'
+        )
+        for number in range(count)
+    ]
+
+@pytest.fixture
+def snapshot_app(app):
+    with app.app_context():
+        db.session.add_all(fixture_jobs(200, seed=7))
+        db.session.commit()
+        yield app
+
+def test_loaded_snapshot_matches_sql(snapshot_app):
+    snapshot = JobSnapshot()
+    snapshot.load(db.session)
+    assert check_parity(snapshot, db.session, parity_cases(snapshot)) == []
+
+def test_refresh_applies_writes_without_reloading(snapshot_app, monkeypatch):
+    snapshot = JobSnapshot()
+    snapshot.load(db.session)
+    loads = []
+    monkeypatch.setattr(snapshot, 'load', lambda session: loads.append(session))
+
+    ids = db.session.scalars(db.select(Job.id).order_by(Job.id)).all()
+    for job in Job.query.filter(Job.id.in_(ids[:5])).all():
+        db.session.delete(job)
+    for job in Job.query.filter(Job.id.in_(ids[5:10])).all():
+        job.company, job.location, job.tags = 'Globex', 'Remote', 'sql,ml'
+    db.session.add_all(fixture_jobs(20, seed=8)[:10])
+    db.session.add(Job(title='Late', company='Initech', location='Austin, TX', job_type='Contract',
+                       posting_date=datetime.utcnow()))
+    db.session.commit()
+
+    bulk_delete(ids[10:15], None, batch_size=2)
+    bulk_update(ids[15:20], None, {'job_type': 'Internship'}, batch_size=2)
+    archive_old_jobs(180)
+
+    snapshot.refresh(db.session)
+    assert loads == []
+    assert check_parity(snapshot, db.session, parity_cases(snapshot)) == []
+
+def test_refresh_picks_up_late_commits(snapshot_app):
+    snapshot = JobSnapshot()
+    snapshot.load(db.session)
+
+    # Stamped long before the snapshot was loaded, committed after it
+    job = Job(title='Late commit', company='Globex', location='Remote', job_type='Contract',
+              posting_date=datetime.utcnow(), updated_at=datetime(2000, 1, 1), created_at=datetime(2000, 1, 1))
+    db.session.add(job)
+    db.session.commit()
+
+    snapshot.refresh(db.session)
+    assert job.id in snapshot.slots and snapshot.alive[snapshot.slots[job.id]]
+    assert check_parity(snapshot, db.session, parity_cases(snapshot)) == []
+
+def test_app_refreshes_from_the_primary(make_app, tmp_path):
+    import shutil
+    from conftest import job_payload
+    replica = tmp_path / 'replica.db'
+    app = make_app(
+        READ_ENGINE='snapshot', SNAPSHOT_REFRESH_SECONDS=0,
+        SQLALCHEMY_BINDS={'replica_0': f'sqlite:///{replica}'}, REPLICA_MAX_LAG_SECONDS=3600, REPLICA_CHECK_SECONDS=0
+    )
+    with app.app_context():
+        db.engine.dispose()
+    shutil.copy(tmp_path / 'jobs.db', replica)
+
+    client = app.test_client(use_cookies=False)
+    job_id = client.post('/api/jobs/', json=job_payload()).get_json()['job']['id']
+    # Served by the lagging replica, but the snapshot must follow the primary's log
+    assert client.get('/api/jobs/').get_json()['total'] == 1
+    assert job_id in app.extensions['job_snapshot'].slots
+
+def test_refresh_reloads_when_changes_were_pruned(snapshot_app):
+    snapshot = JobSnapshot()
+    snapshot.load(db.session)
+
+    gone = db.session.get(Job, db.session.scalar(db.select(func.min(Job.id))))
+    gone_id = gone.id
+    db.session.delete(gone)
+    db.session.add(fixture_jobs(1, seed=9)[0])
+    db.session.commit()
+    # The delete entry is pruned before the snapshot could apply it
+    db.session.execute(update(JobChange).values(changed_at=datetime.utcnow() - timedelta(days=60)))
+    db.session.commit()
+    assert prune_changes(30) > 0
+
+    snapshot.refresh(db.session)
+    assert gone_id not in snapshot.slots or not snapshot.alive[snapshot.slots[gone_id]]
+    assert check_parity(snapshot, db.session, parity_cases(snapshot)) == []
@@ -0,0 +1,49 @@
+# backend/tests/test_write_queue.py
+import threading
+import time
+from write_queue import WriteBehindQueue
+from conftest import job_payload
+
+def wait_for_status(client, tracking_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get(f'/api/jobs/writes/{tracking_id}')
+        if response.status_code == 200 and response.get_json()['status'] != 'queued':
+            return response.get_json()
+        time.sleep(0.01)
+    raise AssertionError(f'{tracking_id} was not committed in time')
+
+def test_statuses_are_visible_to_other_workers(make_app):
+    app = make_app(WRITE_BEHIND=True, WRITE_FLUSH_MS=1)
+    other_worker = make_app(WRITE_BEHIND=True).test_client()
+    client = app.test_client()
+
+    created = client.post('/api/jobs/', json=job_payload())
+    duplicate = client.post('/api/jobs/', json=job_payload())
+    assert created.status_code == duplicate.status_code == 202
+
+    assert wait_for_status(client, created.get_json()['tracking_id'])['status'] == 'created'
+    status = wait_for_status(other_worker, created.get_json()['tracking_id'])
+    assert status['status'] == 'created' and status['job_id'] is not None
+    assert wait_for_status(other_worker, duplicate.get_json()['tracking_id'])['status'] == 'duplicate'
+    assert other_worker.get('/api/jobs/writes/unknown').status_code == 404
+
+def test_close_does_not_block_on_a_full_queue(app):
+    write_queue = WriteBehindQueue(app, batch_size=1, flush_interval=0, max_pending=1, max_statuses=10, status_ttl=60)
+    release = threading.Event()
+    committed = []
+    write_queue.commit_batch = lambda batch: (release.wait(), committed.extend(batch))
+
+    write_queue.submit(job_payload(title='Taken by the writer'))
+    time.sleep(0.05)
+    write_queue.submit(job_payload(title='Waiting in the queue'))
+
+    started = time.monotonic()
+    write_queue.close(timeout=0.2)
+    assert time.monotonic() - started < 1
+
+    # Once unblocked, the writer drains the queue and stops
+    release.set()
+    write_queue.thread.join(2)
+    assert not write_queue.thread.is_alive()
+    assert len(committed) == 2
@@ -0,0 +1,231 @@
+# backend/write_queue.py
+import atexit
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError, OperationalError
+from db import db
+from models.job import Job
+from models.write_status import WriteStatus
+from datetime import datetime, timedelta
+
+# Retries for a batch whose commit failed on a busy database ('database is locked')
+COMMIT_ATTEMPTS = 5
+# How often the writer deletes persisted statuses older than the TTL
+PRUNE_INTERVAL_SECONDS = 60
+
+class QueueFull(Exception):
+    """Raised when the write-behind queue cannot take more jobs"""
+
+class WriteBehindQueue:
+    """Acknowledge validated job creations at once and group-commit them from one writer thread.
+
+    The writer takes whatever arrived within flush_interval (up to batch_size
+    jobs) and commits it in one transaction, so concurrent POSTs share a
+    single fsync instead of queueing on SQLite's write lock. Outcomes are
+    written to write_statuses in that same transaction, so any worker can
+    answer for them; 'queued' is only known to the accepting process.
+    """
+    def __init__(self, app, batch_size, flush_interval, max_pending, max_statuses, status_ttl):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_statuses = max_statuses
+        self.status_ttl = status_ttl
+        self.items = queue.Queue(maxsize=max_pending)
+        self.statuses = OrderedDict()
+        self.lock = threading.Lock()
+        self.closed = False
+        self.draining = threading.Event()
+        self.last_pruned = 0.0
+        self.thread = threading.Thread(target=self.run, name='job-write-behind', daemon=True)
+        self.thread.start()
+
+    # STATUS TRACKING
+    def set_status(self, tracking_id, **status):
+        with self.lock:
+            self.statuses[tracking_id] = {**self.statuses.get(tracking_id, {}), **status, 'tracking_id': tracking_id}
+            self.statuses.move_to_end(tracking_id)
+            while len(self.statuses) > self.max_statuses:
+                self.statuses.popitem(last=False)
+
+    def status(self, tracking_id):
+        with self.lock:
+            status = self.statuses.get(tracking_id)
+            return dict(status) if status is not None else None
+
+    def persist(self, outcomes):
+        """Add write_statuses rows for {tracking_id: status} to the session's transaction"""
+        now = datetime.utcnow()
+        for tracking_id, outcome in outcomes.items():
+            status = self.status(tracking_id) or {}
+            queued_at = datetime.fromisoformat(status['queued_at']) if status.get('queued_at') else now
+            db.session.add(WriteStatus(
+                tracking_id=tracking_id, status=outcome['status'], job_id=outcome.get('job_id'),
+                error=outcome.get('error'), queued_at=queued_at, committed_at=now
+            ))
+
+    # PRODUCER SIDE
+    def submit(self, data):
+        """Queue a validated job payload and return its tracking id"""
+        if self.closed:
+            raise QueueFull()
+        tracking_id = uuid.uuid4().hex
+        self.set_status(tracking_id, status='queued', job_id=None, error=None, queued_at=datetime.utcnow().isoformat())
+        try:
+            self.items.put_nowait((tracking_id, data))
+        except queue.Full:
+            with self.lock:
+                self.statuses.pop(tracking_id, None)
+            raise QueueFull()
+        return tracking_id
+
+    def close(self, timeout=None):
+        """Stop accepting jobs and wait up to timeout until everything queued is committed"""
+        if self.closed:
+            return
+        self.closed = True
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        try:
+            self.items.put(None, timeout=timeout)
+        except queue.Full:
+            # No room for the marker - the writer stops once it has emptied the queue
+            self.draining.set()
+        self.thread.join(max(deadline - time.monotonic(), 0) if deadline is not None else None)
+
+    # WRITER THREAD
+    def next_batch(self):
+        """Block for the first job, then collect more until the flush interval ends.
+
+        Returns (batch, stop) where stop means the shutdown marker was reached.
+        """
+        item = self.items.get()
+        if item is None:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.items.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def run(self):
+        while True:
+            batch, stop = self.next_batch()
+            if batch:
+                with self.app.app_context():
+                    self.commit_batch(batch)
+                    self.prune_if_due()
+            if stop or (self.draining.is_set() and self.items.empty()):
+                break
+
+    def add_jobs(self, batch):
+        """Add the batch to the session; returns ({tracking_id: Job}, {tracking_id: duplicate status})"""
+        added, duplicates = {}, {}
+        for tracking_id, data in batch:
+            job = Job.from_dict(data)
+            # The query autoflushes, so duplicates within the batch are caught too
+            existing = Job.query.filter_by(title=job.title, company=job.company, location=job.location).first()
+            if existing:
+                duplicates[tracking_id] = {'status': 'duplicate', 'job_id': existing.id, 'error': 'Job already exists'}
+                continue
+            db.session.add(job)
+            added[tracking_id] = job
+        return added, duplicates
+
+    def commit_batch(self, batch):
+        for attempt in range(COMMIT_ATTEMPTS):
+            try:
+                added, duplicates = self.add_jobs(batch)
+                db.session.flush()
+                outcomes = {
+                    **duplicates,
+                    **{tracking_id: {'status': 'created', 'job_id': job.id} for tracking_id, job in added.items()}
+                }
+                self.persist(outcomes)
+                db.session.commit()
+            except IntegrityError as e:
+                # One bad row must not fail the whole group - commit the jobs one by one
+                db.session.rollback()
+                if len(batch) == 1:
+                    return self.fail(batch, e.orig)
+                for item in batch:
+                    self.commit_batch([item])
+                return
+            except OperationalError as e:
+                db.session.rollback()
+                if attempt + 1 == COMMIT_ATTEMPTS:
+                    return self.fail(batch, e)
+                time.sleep(0.05 * 2 ** attempt)
+                continue
+            except Exception as e:
+                db.session.rollback()
+                return self.fail(batch, e)
+
+            committed_at = datetime.utcnow().isoformat()
+            for tracking_id, outcome in outcomes.items():
+                self.set_status(tracking_id, **outcome, committed_at=committed_at)
+            return
+
+    def fail(self, batch, error):
+        outcomes = {tracking_id: {'status': 'failed', 'error': f'Failed to create job: {str(error)}'} for tracking_id, _ in batch}
+        try:
+            self.persist(outcomes)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self.app.logger.warning(f'Failed to persist write statuses: {str(e)}')
+        committed_at = datetime.utcnow().isoformat()
+        for tracking_id, outcome in outcomes.items():
+            self.set_status(tracking_id, **outcome, committed_at=committed_at)
+
+    def prune_if_due(self):
+        """Delete persisted statuses older than the TTL, at most once per PRUNE_INTERVAL_SECONDS"""
+        if time.monotonic() - self.last_pruned < PRUNE_INTERVAL_SECONDS:
+            return
+        self.last_pruned = time.monotonic()
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.status_ttl)
+            db.session.execute(delete(WriteStatus).where(WriteStatus.committed_at < cutoff))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self.app.logger.warning(f'Failed to prune write statuses: {str(e)}')
+
+def lookup_status(tracking_id):
+    """Status of a write-behind job creation from this worker's memory, then from write_statuses"""
+    write_queue = current_app.extensions.get('write_queue')
+    status = write_queue.status(tracking_id) if write_queue is not None else None
+    if status is None:
+        stored = db.session.get(WriteStatus, tracking_id)
+        status = stored.to_dict() if stored is not None else None
+    return status
+
+def init_write_queue(app):
+    """Start the write-behind writer when WRITE_BEHIND is enabled"""
+    if not app.config['WRITE_BEHIND']:
+        return
+    write_queue = WriteBehindQueue(
+        app,
+        app.config['WRITE_BATCH_SIZE'],
+        app.config['WRITE_FLUSH_MS'] / 1000,
+        app.config['WRITE_QUEUE_MAX'],
+        app.config['WRITE_STATUS_MAX'],
+        app.config['WRITE_STATUS_TTL_SECONDS']
+    )
+    app.extensions['write_queue'] = write_queue
+    # Flush whatever is still queued before the process exits
+    atexit.register(write_queue.close, app.config['WRITE_SHUTDOWN_TIMEOUT_SECONDS'])
@@ -51,7 +51,6 @@ function App() {
   // LOAD JOBS WHEN FILTERS OR PAGINATION CHANGE
   useEffect(() => {
     loadJobs();
-    loadDynamicFilters();
   }, [filters, pagination.currentPage, pagination.itemsPerPage]);
 
   // LOAD INITIAL STATISTICS
@@ -59,7 +58,7 @@ function App() {
     loadStats();
   }, []);
 
-  // MAIN JOBS LOADING FUNCTION
+  // MAIN JOBS LOADING FUNCTION - RESULTS AND DYNAMIC FILTER OPTIONS IN ONE REQUEST
   const loadJobs = async () => {
     setLoading(true);
     setError('');
@@ -76,9 +75,14 @@ function App() {
         page_size: pagination.itemsPerPage
       };
       
-      const data = await jobsAPI.getJobs(params);
+      const data = await jobsAPI.searchJobs(params);
       
       setJobs(data.jobs || []);
+      setDynamicFilters(data.filter_options || {
+        job_types: [],
+        companies: [],
+        locations: []
+      });
       
       // UPDATE PAGINATION INFO FROM RESPONSE
       const totalItems = data.total_items || data.total || 0;
@@ -110,25 +114,6 @@ function App() {
     }
   };
 
-  // LOAD DYNAMIC FILTER OPTIONS
-  const loadDynamicFilters = async () => {
-    try {
-      const filterParams = Object.fromEntries(
-        Object.entries(filters).filter(([_, value]) => value !== '' && value !== null && value !== undefined)
-      );
-      
-      const data = await jobsAPI.getFilterOptions(filterParams);
-      setDynamicFilters(data);
-    } catch (err) {
-      console.error('Failed to load dynamic filter options:', err);
-      setDynamicFilters({
-        job_types: [],
-        companies: [],
-        locations: []
-      });
-    }
-  };
-
   // SHOW TOAST NOTIFICATION
   const showToast = (message, type = 'success') => {
     setToast({ show: true, message, type });
@@ -155,7 +140,6 @@ function App() {
       setPagination(prev => ({ ...prev, currentPage: 1 }));
       await loadJobs();
       await loadStats();
-      await loadDynamicFilters();
     } catch (err) {
       await Swal.fire({
         title: 'Error!',
@@ -183,7 +167,6 @@ function App() {
       
       setEditingJob(null);
       await loadJobs();
-      await loadDynamicFilters();
     } catch (err) {
       await Swal.fire({
         title: 'Error!',
@@ -233,7 +216,6 @@ function App() {
         await loadJobs();
       }
       await loadStats();
-      await loadDynamicFilters();
     } catch (err) {
       await Swal.fire({
         title: 'Error!',
@@ -296,7 +278,6 @@ function App() {
     try {
       await loadJobs();
       await loadStats();
-      await loadDynamicFilters();
       
       await Swal.fire({
         title: 'Refreshed!',
@@ -386,8 +367,8 @@ function App() {
               jobTypes={dynamicFilters?.job_types || stats?.job_types || []}
               companies={dynamicFilters?.companies || stats?.all_companies_with_counts || stats?.top_companies || []}
               locations={dynamicFilters?.locations || stats?.all_locations_with_counts || stats?.top_locations || []}
-              topLocations={stats?.top_locations || []}
-              topCompanies={stats?.top_companies || []}
+              topLocations={stats?.top_locations || stats?.all_locations_with_counts?.slice(0, 10) || []}
+              topCompanies={stats?.top_companies || stats?.all_companies_with_counts?.slice(0, 10) || []}
               isDynamic={true}
             />
           </div>
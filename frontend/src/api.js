@@ -12,10 +12,17 @@ const api = axios.create({
   },
 });
 
+// Change log position of our last write - echoed so reads see it even when served by a replica
+const READ_AFTER_SEQ_HEADER = 'X-Read-After-Seq';
+let readAfterSeq = 0;
+
 // Request interceptor for logging
 api.interceptors.request.use(
   (config) => {
     console.log(`API Request: ${config.method?.toUpperCase()} ${config.url}`);
+    if (readAfterSeq) {
+      config.headers[READ_AFTER_SEQ_HEADER] = String(readAfterSeq);
+    }
     return config;
   },
   (error) => {
@@ -28,6 +35,11 @@ api.interceptors.request.use(
 api.interceptors.response.use(
   (response) => {
     console.log(`API Response: ${response.status} ${response.config.url}`);
+    // The cookie the API also sets is not sent cross-origin, so keep the header value instead
+    const seq = Number(response.headers[READ_AFTER_SEQ_HEADER.toLowerCase()]);
+    if (seq > readAfterSeq) {
+      readAfterSeq = seq;
+    }
     return response;
   },
   (error) => {
@@ -50,7 +62,23 @@ export const jobsAPI = {
       
       console.log('🔍 Sending API params:', backendParams);
       
-      const response = await api.get('/jobs', { params: backendParams });
+      const response = await api.get('/jobs', { params: { ...backendParams, profile: 'compact' } });
+      return response.data;
+    } catch (error) {
+      throw new Error(error.response?.data?.error || 'Failed to fetch jobs');
+    }
+  },
+
+  // Get a page of jobs together with total and dynamic filter options
+  searchJobs: async (params = {}) => {
+    try {
+      const backendParams = { ...params };
+      if (backendParams.page_size) {
+        backendParams.per_page = backendParams.page_size;
+        delete backendParams.page_size;
+      }
+      
+      const response = await api.get('/jobs/search', { params: { ...backendParams, profile: 'compact' } });
       return response.data;
     } catch (error) {
       throw new Error(error.response?.data?.error || 'Failed to fetch jobs');
@@ -100,7 +128,8 @@ export const jobsAPI = {
   // Get job statistics
   getStats: async () => {
     try {
-      const response = await api.get('/jobs/stats');
+      // Compact stats leave out top_* and name-only lists, derived from the counted lists instead
+      const response = await api.get('/jobs/stats', { params: { profile: 'compact' } });
       return response.data;
     } catch (error) {
       throw new Error(error.response?.data?.error || 'Failed to fetch stats');
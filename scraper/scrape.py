@@ -1,5 +1,9 @@
 import os
 import time
+import atexit
+import argparse
+import threading
+import psutil
 import requests
 from datetime import datetime, timedelta
 from selenium import webdriver
@@ -8,47 +12,182 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 import logging
 import re
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# BROWSER PROFILE SETTINGS
+HEADLESS = os.environ.get('SCRAPER_HEADLESS', 'true').lower() == 'true'
+LEAN_BROWSER = os.environ.get('SCRAPER_LEAN', 'true').lower() == 'true'
+CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH')  # unset: Selenium Manager finds a matching driver
+
+# Requests the lean profile drops - job cards only need the document, scripts and styles
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.m4a', '*.ogg',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*connect.facebook.net*',
+    '*hotjar.com*', '*segment.io*', '*clarity.ms*', '*plausible.io*'
+]
+
+# CHROME OPTIONS FOR THE FULL OR LEAN PROFILE
+def build_chrome_options(lean=LEAN_BROWSER, headless=HEADLESS):
+    options = Options()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1366,900")
+    
+    if lean:
+        # Return from get() at DOMContentLoaded instead of waiting for every subresource
+        options.page_load_strategy = 'eager'
+        options.add_argument("--disable-extensions")
+        options.add_argument("--mute-audio")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    
+    return options
+
+def create_driver(lean=LEAN_BROWSER, headless=HEADLESS):
+    service = Service(CHROMEDRIVER_PATH) if CHROMEDRIVER_PATH else Service()
+    driver = webdriver.Chrome(service=service, options=build_chrome_options(lean, headless))
+    driver.implicitly_wait(10)
+    
+    if lean:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    
+    return driver
+
+# LONG-LIVED DRIVER POOL SHARED ACROSS SCRAPER RUNS
+class DriverPool:
+    def __init__(self, lean=LEAN_BROWSER, headless=HEADLESS, max_idle=2):
+        self.lean = lean
+        self.headless = headless
+        self.max_idle = max_idle
+        self.idle = []
+        self.lock = threading.Lock()
+        atexit.register(self.close_all)
+    
+    def is_alive(self, driver):
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+    
+    def acquire(self):
+        with self.lock:
+            while self.idle:
+                driver = self.idle.pop()
+                if self.is_alive(driver):
+                    logger.info("♻️ Reusing pooled WebDriver")
+                    return driver
+                self.quit(driver)
+        
+        driver = create_driver(self.lean, self.headless)
+        logger.info(f"✅ WebDriver setup successful ({'lean' if self.lean else 'full'} profile, {'headless' if self.headless else 'headed'})")
+        return driver
+    
+    def release(self, driver):
+        with self.lock:
+            if len(self.idle) < self.max_idle and self.is_alive(driver):
+                self.idle.append(driver)
+                logger.info("🔁 WebDriver returned to pool")
+            else:
+                self.quit(driver)
+    
+    def quit(self, driver):
+        try:
+            driver.quit()
+            logger.info("🔒 WebDriver closed")
+        except WebDriverException:
+            pass
+    
+    def close_all(self):
+        with self.lock:
+            while self.idle:
+                self.quit(self.idle.pop())
+
+driver_pools = {}
+
+def get_driver_pool(lean=LEAN_BROWSER, headless=HEADLESS):
+    key = (lean, headless)
+    if key not in driver_pools:
+        driver_pools[key] = DriverPool(lean, headless)
+    return driver_pools[key]
+
+# PAGE LOAD AND MEMORY METRICS
+NAVIGATION_TIMING_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+if (!nav) return null;
+return {
+    dom_content_loaded_ms: Math.round(nav.domContentLoadedEventEnd),
+    load_ms: Math.round(nav.loadEventEnd),
+    resources: resources.length,
+    transfer_kb: Math.round((nav.transferSize + resources.reduce((total, r) => total + (r.transferSize || 0), 0)) / 1024)
+};
+"""
+
+def navigation_timing(driver):
+    try:
+        return driver.execute_script(NAVIGATION_TIMING_SCRIPT)
+    except WebDriverException:
+        return None
+
+def browser_memory_mb(driver):
+    """Resident memory of chromedriver and every Chrome process it started, or None if it cannot be read"""
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+        return round(sum(process.memory_info().rss for process in processes) / (1024 * 1024), 1)
+    except (psutil.Error, AttributeError):
+        return None
+
 # MAIN SCRAPER CLASS FOR ACTUARYLIST WITH PAGINATION SUPPORT
 class ActuaryListPaginationScraper:
-    def __init__(self, api_base_url="http://localhost:5000/api"):
+    def __init__(self, api_base_url="http://localhost:5000/api", lean=LEAN_BROWSER, headless=HEADLESS):
         self.api_base_url = api_base_url
         self.driver = None
+        self.pool = get_driver_pool(lean, headless)
         self.scraped_jobs = []
         self.current_page = 1
+        self.page_load_ms = None
         
     # WEBDRIVER SETUP AND CONFIGURATION
     def setup_driver(self):
-        options = Options()
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        
         try:
-            self.driver = webdriver.Chrome(service=Service("/usr/bin/chromedriver"), options=options)
-            self.driver.implicitly_wait(10)
-            logger.info("✅ WebDriver setup successful")
+            self.driver = self.pool.acquire()
             return True
         except Exception as e:
             logger.error(f"❌ WebDriver setup failed: {e}")
             return False
     
+    # RETURN THE DRIVER TO THE POOL FOR THE NEXT RUN
+    def release_driver(self):
+        if self.driver:
+            self.pool.release(self.driver)
+            self.driver = None
+    
     # NAVIGATE TO ACTUARYLIST JOBS PAGE
     def navigate_to_jobs_page(self):
         try:
             url = "https://www.actuarylist.com/"
             logger.info(f"🌐 Navigating to {url}")
+            started = time.perf_counter()
             self.driver.get(url)
             
             WebDriverWait(self.driver, 15).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "article"))
             )
+            self.page_load_ms = round((time.perf_counter() - started) * 1000)
+            self.report_page_load()
             
             time.sleep(3)
             logger.info("✅ Page loaded successfully")
@@ -57,6 +196,17 @@ class ActuaryListPaginationScraper:
             logger.error(f"❌ Failed to load page: {e}")
             return False
     
+    # LOG PAGE LOAD TIME AND BROWSER MEMORY
+    def report_page_load(self):
+        timing = navigation_timing(self.driver) or {}
+        memory = browser_memory_mb(self.driver)
+        logger.info(
+            f"⏱️ Jobs visible after {self.page_load_ms} ms "
+            f"(DOMContentLoaded {timing.get('dom_content_loaded_ms')} ms, "
+            f"{timing.get('resources')} resources, {timing.get('transfer_kb')} KB)"
+            + (f", browser memory {memory} MB" if memory is not None else "")
+        )
+    
     # GET PAGINATION INFORMATION FROM PAGE
     def get_pagination_info(self):
         try:
@@ -276,6 +426,9 @@ class ActuaryListPaginationScraper:
         if not self.setup_driver():
             return False
         
+        # A pooled driver may come from an earlier run
+        self.current_page = 1
+        
         try:
             if not self.navigate_to_jobs_page():
                 return False
@@ -333,23 +486,83 @@ class ActuaryListPaginationScraper:
             logger.info(f"🎉 Scraping completed!")
             logger.info(f"📊 Results: {successful} successful, {failed} failed")
             logger.info(f"📄 Pages scraped: {pages_scraped}")
+            memory = browser_memory_mb(self.driver)
+            if memory is not None:
+                logger.info(f"🧠 Browser memory after run: {memory} MB")
             return successful > 0
             
         except Exception as e:
             logger.error(f"❌ Scraping failed: {e}")
             return False
         finally:
-            if self.driver:
-                self.driver.quit()
-                logger.info("🔒 WebDriver closed")
+            self.release_driver()
     
     # GET LIST OF SCRAPED JOBS
     def get_scraped_jobs(self):
         return self.scraped_jobs
 
+# COMPARE PAGE LOAD TIME AND MEMORY OF THE FULL AND LEAN PROFILES
+def benchmark_browser_profiles(loads=3, url="https://www.actuarylist.com/"):
+    results = {}
+    for name, lean in (('full', False), ('lean', True)):
+        driver = create_driver(lean=lean, headless=HEADLESS)
+        try:
+            samples = []
+            for _ in range(loads):
+                started = time.perf_counter()
+                driver.get(url)
+                WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.CSS_SELECTOR, "article")))
+                samples.append({
+                    'visible_ms': round((time.perf_counter() - started) * 1000),
+                    'memory_mb': browser_memory_mb(driver),
+                    **(navigation_timing(driver) or {})
+                })
+            results[name] = samples
+        finally:
+            driver.quit()
+    
+    print(f"{'profile':<8}{'jobs visible ms':>17}{'DOMContentLoaded ms':>21}{'resources':>11}{'transfer KB':>13}{'memory MB':>11}")
+    for name, samples in results.items():
+        average = lambda key: (
+            round(sum(sample[key] for sample in samples) / len(samples))
+            if all(sample.get(key) is not None for sample in samples) else None
+        )
+        print(f"{name:<8}{average('visible_ms')!s:>17}{average('dom_content_loaded_ms')!s:>21}"
+              f"{average('resources')!s:>11}{average('transfer_kb')!s:>13}{average('memory_mb')!s:>11}")
+    return results
+
+# DISPLAY RESULTS OF ONE RUN
+def print_results(scraper, success):
+    if success:
+        jobs = scraper.get_scraped_jobs()
+        print(f"\n🎉 SUCCESS! Scraped {len(jobs)} jobs")
+        
+        if jobs:
+            print(f"\n📋 Sample of scraped jobs:")
+            for i, job in enumerate(jobs[:5], 1):
+                print(f"  {i}. {job['title']}")
+                print(f"     Company: {job['company']}")
+                print(f"     Location: {job['location']}")
+                print(f"     Tags: {', '.join(job['tags'][:3])}...")
+                print()
+        
+        print(f"🔗 Check your frontend: http://localhost:3000")
+        print(f"🔗 API endpoint: http://localhost:5000/api/jobs")
+        
+    else:
+        print("\n❌ Scraping failed. Check logs above.")
+
 # MAIN EXECUTION FUNCTION
 def main():
-    scraper = ActuaryListPaginationScraper()
+    parser = argparse.ArgumentParser(description="ActuaryList job scraper")
+    parser.add_argument('--benchmark', action='store_true', help="compare page load and memory of the full and lean profiles")
+    parser.add_argument('--every', type=float, metavar='MINUTES',
+                        help="keep running and scrape again every MINUTES, reusing the pooled browser")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark_browser_profiles()
+        return True
     
     print("🤖 ActuaryList Job Scraper with Pagination")
     print("=" * 55)
@@ -370,31 +583,21 @@ def main():
     except ValueError:
         max_pages = 10
     
-    print(f"🎯 Scraping up to {target_jobs} jobs from max {max_pages} pages...")
-    
-    success = scraper.scrape_jobs_with_pagination(target_jobs=target_jobs, max_pages=max_pages)
-    
-    # DISPLAY RESULTS
-    if success:
-        jobs = scraper.get_scraped_jobs()
-        print(f"\n🎉 SUCCESS! Scraped {len(jobs)} jobs")
-        
-        if jobs:
-            print(f"\n📋 Sample of scraped jobs:")
-            for i, job in enumerate(jobs[:5], 1):
-                print(f"  {i}. {job['title']}")
-                print(f"     Company: {job['company']}")
-                print(f"     Location: {job['location']}")
-                print(f"     Tags: {', '.join(job['tags'][:3])}...")
-                print()
-        
-        print(f"🔗 Check your frontend: http://localhost:3000")
-        print(f"🔗 API endpoint: http://localhost:5000/api/jobs")
+    # REPEATED RUNS SHARE THE DRIVER POOL, SO CHROME STARTS ONCE PER PROCESS
+    while True:
+        print(f"🎯 Scraping up to {target_jobs} jobs from max {max_pages} pages...")
+        scraper = ActuaryListPaginationScraper()
+        success = scraper.scrape_jobs_with_pagination(target_jobs=target_jobs, max_pages=max_pages)
+        print_results(scraper, success)
         
-    else:
-        print("\n❌ Scraping failed. Check logs above.")
-    
-    return success
+        if not args.every:
+            return success
+        next_run = datetime.now() + timedelta(minutes=args.every)
+        print(f"⏰ Next run at {next_run:%H:%M:%S} (Ctrl+C to stop)")
+        try:
+            time.sleep(args.every * 60)
+        except KeyboardInterrupt:
+            return success
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()